@@ -0,0 +1,101 @@
+"""备忘录内存布局的基准测试：原来的字典布局、Memo（__slots__）和延迟加载内容的归档备忘录。
+
+用法: python benchmarks/bench_memos.py [条数]
+
+每种布局都从同一份 JSONL 文本逐行解析构建，解析得到的记录随后丢弃，用 tracemalloc 统计留下的内存，
+因此标题、内容和时间对象在各布局中都计算在内。
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.memos import TIME_FIELDS, memo_from_record, new_memo_id, parse_time
+from core.memo_archive import MemoArchive
+
+# Memo 每条备忘录的额外开销目标（不含标题、内容和时间对象本身）
+TARGET_OVERHEAD_BYTES = 120
+
+WORDS = "会议 报告 周末 买菜 复习 提交 预约 医生 体检 生日 礼物 电影 还书 续费 打扫 计划 review deploy call sync".split()
+
+def sample_records(count, seed=1):
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    records = []
+    for _ in range(count):
+        record = {
+            'id': new_memo_id(),
+            'title': "".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))),
+            'content': " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 40))),
+            'created_time': (now - timedelta(minutes=rng.randint(0, 500000))).isoformat(),
+        }
+        if rng.random() < 0.7:
+            record['reminder_time'] = (now + timedelta(minutes=rng.randint(-500000, 500000))).isoformat()
+            record['reminder_shown'] = rng.random() < 0.5
+            record['advance_shown'] = record['reminder_shown'] or rng.random() < 0.2
+        records.append(record)
+    return records
+
+def legacy_memo(record):
+    """本次改动之前的布局：每条备忘录一个字典，时间字段解析为 datetime"""
+    memo = dict(record)
+    for field in TIME_FIELDS:
+        if memo.get(field):
+            memo[field] = parse_time(memo[field])
+    return memo
+
+def measure(name, build, count, baseline=None):
+    """build 会被调用两次：一次计时，一次在 tracemalloc 下统计内存（tracemalloc 会明显拖慢构建）"""
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    memos = build()
+    used = tracemalloc.get_traced_memory()[0] - start_bytes
+    tracemalloc.stop()
+    # 排序和读取字段的耗时，对应列表按提醒时间排序和提醒检查
+    start = time.perf_counter()
+    sorted(memos, key=lambda memo: memo.get('reminder_time') or datetime.max)
+    pending = sum(1 for memo in memos if memo.get('reminder_time') and not memo.get('reminder_shown'))
+    access = time.perf_counter() - start
+    per_memo = used / count
+    ratio = f"  {per_memo / baseline:6.1%}" if baseline else ""
+    print(f"{name:<24} {per_memo:8.0f} B/条{ratio}   构建 {elapsed * 1000:7.0f} ms   排序+遍历 {access * 1000:6.0f} ms   待提醒 {pending}")
+    return per_memo, memos
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    lines = [json.dumps(record, ensure_ascii=False) for record in sample_records(count)]
+    print(f"{count} 条备忘录，平均每行 {sum(len(line.encode('utf-8')) for line in lines) / count:.0f} 字节")
+    legacy, _ = measure("字典 (原布局)", lambda: [legacy_memo(json.loads(line)) for line in lines], count)
+    slotted, memos = measure("Memo", lambda: [memo_from_record(json.loads(line)) for line in lines], count, legacy)
+
+    # 固定开销：去掉标题、内容和时间对象后每条备忘录容器本身的大小
+    fields = sum(sys.getsizeof(value) for memo in memos for value in (memo.id, memo.title, memo.content, memo.created_time, memo.reminder_time) if value is not None) / count
+    overhead = slotted - fields
+    print(f"Memo 容器开销 {overhead:.0f} B/条，目标 ≤ {TARGET_OVERHEAD_BYTES} B/条: {'达成' if overhead <= TARGET_OVERHEAD_BYTES else '未达成'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "memo_archive.jsonl")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(line + "\n" for line in lines)
+        def load_archive():
+            nonlocal archive
+            archive = MemoArchive(path)
+            return list(archive.load().values())
+        archive = None
+        measure("归档 Memo (延迟内容)", load_archive, count, legacy)
+        for query in (WORDS[0], "会议 报告", "review", "deploy sync", "不存在"):
+            start = time.perf_counter()
+            hits = archive.search(query)
+            print(f"归档搜索 {query!r:<16} {len(hits):6} 条命中 {(time.perf_counter() - start) * 1000:6.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""全文索引的基准测试：建索引、保存、加载、常见查询和列表筛选的耗时。
+
+用法: python benchmarks/bench_text_index.py [条数]
+
+备忘录由 bench_memos.sample_records 生成，词汇量很小，常用词几乎出现在每条备忘录中，是查询的最坏情况。
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_memos import sample_records
+from core.memos import memo_from_record
+from core.text_index import TextIndex
+
+# 每个查询的目标耗时
+TARGET_MS = 10
+
+QUERIES = [
+    ("会", None), ("会议", None), ("会议", "memo"), ("会议 报告", None), ("会议 报告 周末", "memo"),
+    ("review", None), ("re", None), ("review deploy", "memo"), ("体检 还", None), ("不存在", None),
+]
+
+def timed(func, repeat=5):
+    """取多次运行中最快的一次，返回 (毫秒, 结果)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    memos = [memo_from_record(record) for record in sample_records(count)]
+    index = TextIndex()
+    elapsed, _ = timed(lambda: [index.add_memo(memo) for memo in memos], repeat=1)
+    print(f"{count} 条备忘录，建索引 {elapsed:.0f} ms，{len(index.postings)} 个词")
+    index.sync_notes("\n".join(f"笔记 {memo['title']}" for memo in memos[:500]))
+    # 一部分备忘录被修改过，倒排表中留有失效编号
+    for memo in memos[:count // 20]:
+        index.add(memo['id'], memo['title'] + " 已修改", memo['content'])
+
+    slow = 0
+    for query, kind in QUERIES:
+        elapsed, results = timed(lambda: index.search(query, 20, kind))
+        slow += elapsed > TARGET_MS
+        print(f"{query!r:<22} kind={kind!s:<5} {elapsed:7.2f} ms  {len(results)} 条")
+    # 备忘录对话框筛选列表时只取匹配的 id，不排序
+    for query in ("会议", "review", "会议 报告", "deploy sync"):
+        elapsed, results = timed(lambda: index.matching(query, "memo"))
+        slow += elapsed > TARGET_MS
+        print(f"筛选 {query!r:<19} {elapsed:7.2f} ms  {len(results)} 条")
+    print(f"目标 < {TARGET_MS} ms: {'全部达成' if not slow else f'{slow} 个查询未达成'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "memo_index.cache")
+        elapsed, _ = timed(lambda: index.save(path), repeat=1)
+        print(f"保存 {elapsed:.0f} ms，{os.path.getsize(path) / 1024 / 1024:.1f} MB")
+        elapsed, loaded = timed(lambda: TextIndex.load(path), repeat=1)
+        print(f"加载 {elapsed:.0f} ms，{len(loaded)} 个文档")
+
+if __name__ == "__main__":
+    main()
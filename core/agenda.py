@@ -0,0 +1,70 @@
+import bisect
+from datetime import datetime, timedelta
+
+WEEKDAYS = "一二三四五六日"
+
+class ReminderIndex:
+    """按天分桶的提醒时间索引。
+
+    buckets 把日期序号（date.toordinal()）映射到按时间排序的 [(时间戳, 备忘录 id)]，
+    entries 记录每条备忘录所在的桶，更新和删除只改动一个桶。查询某段时间只访问其中每天的桶，
+    不需要遍历全部备忘录。
+    """
+    def __init__(self):
+        self.buckets = {}
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def build(self, memos):
+        self.buckets = {}
+        self.entries = {}
+        for memo in memos:
+            self.update(memo)
+
+    def update(self, memo):
+        """备忘录新增或修改后调用，没有提醒时间时从索引中移除"""
+        self.remove(memo['id'])
+        reminder_dt = memo.get('reminder_time')
+        if not reminder_dt:
+            return
+        day = reminder_dt.toordinal()
+        key = (reminder_dt.timestamp(), memo['id'])
+        bisect.insort(self.buckets.setdefault(day, []), key)
+        self.entries[memo['id']] = (day, key)
+
+    def remove(self, memo_id):
+        entry = self.entries.pop(memo_id, None)
+        if entry is None:
+            return
+        day, key = entry
+        bucket = self.buckets[day]
+        pos = bisect.bisect_left(bucket, key)
+        if pos < len(bucket) and bucket[pos] == key:
+            del bucket[pos]
+        if not bucket:
+            del self.buckets[day]
+
+    def between(self, start, end):
+        """[start, end) 内的提醒，按时间排序返回 [(时间戳, 备忘录 id)]"""
+        low, high = start.timestamp(), end.timestamp()
+        results = []
+        for day in range(start.toordinal(), end.toordinal() + 1):
+            bucket = self.buckets.get(day)
+            if not bucket:
+                continue
+            results.extend(bucket[bisect.bisect_left(bucket, (low,)):bisect.bisect_left(bucket, (high,))])
+        return results
+
+def day_start(now=None):
+    now = now or datetime.now()
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def next_midnight(now=None):
+    return day_start(now) + timedelta(days=1)
+
+def day_label(day, today):
+    offset = (day - today).days
+    prefix = {0: "今天", 1: "明天", 2: "后天"}.get(offset, f"{day.month}月{day.day}日")
+    return f"{prefix} 周{WEEKDAYS[day.weekday()]}"
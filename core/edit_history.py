@@ -0,0 +1,233 @@
+import os
+import json
+import time
+
+from core.memos import memo_from_record, memo_record
+
+MERGE_WINDOW = 2.0
+
+def common_prefix_length(a, b):
+    """二分查找最长公共前缀，切片比较在 C 中完成，长文本也只需要 O(log n) 次比较"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+def text_delta(old, new):
+    """两段文本的差异：(位置, 删除的文本, 插入的文本)，只保存变化的部分"""
+    prefix = common_prefix_length(old, new)
+    limit = min(len(old), len(new)) - prefix
+    suffix = common_prefix_length(old[::-1][:limit], new[::-1][:limit])
+    return prefix, old[prefix:len(old) - suffix], new[prefix:len(new) - suffix]
+
+def text_entry(old, new):
+    pos, removed, inserted = text_delta(old, new)
+    if not removed and not inserted:
+        return None
+    return {"kind": "notes", "pos": pos, "removed": removed, "inserted": inserted, "t": round(time.time(), 2)}
+
+def apply_text(text, entry, reverse=False):
+    """应用文本差异，reverse 为 True 时撤销；返回 (替换位置, 被替换的长度, 替换成的文本)，文本与记录对不上时返回 None"""
+    old, new = (entry["inserted"], entry["removed"]) if reverse else (entry["removed"], entry["inserted"])
+    pos = entry["pos"]
+    if text[pos:pos + len(old)] != old:
+        return None
+    return pos, len(old), new
+
+def merge_text_entries(last, entry):
+    """连续输入或连续退格在短时间内合并为一条记录，返回合并后的记录或 None"""
+    if last.get("kind") != "notes" or entry["t"] - last["t"] > MERGE_WINDOW:
+        return None
+    if not last["removed"] and not entry["removed"] and entry["pos"] == last["pos"] + len(last["inserted"]):
+        if "\n" in entry["inserted"]:
+            return None
+        return dict(last, inserted=last["inserted"] + entry["inserted"], t=entry["t"])
+    if not last["inserted"] and not entry["inserted"] and entry["pos"] + len(entry["removed"]) == last["pos"]:
+        return dict(last, pos=entry["pos"], removed=entry["removed"] + last["removed"], t=entry["t"])
+    return None
+
+def memo_entry(old, new):
+    """备忘录的差异：新增和删除保存整条备忘录，修改只保存变化的字段（值为 None 表示字段不存在）；时间按 ISO 字符串保存"""
+    old = None if old is None else memo_record(old)
+    new = None if new is None else memo_record(new)
+    if old is None or new is None:
+        memo_id = (new or old)['id']
+        return {"kind": "memo", "id": memo_id, "before": old, "after": new, "t": round(time.time(), 2)}
+    before, after = {}, {}
+    for field in set(old) | set(new):
+        if old.get(field) != new.get(field):
+            before[field] = old.get(field)
+            after[field] = new.get(field)
+    if not after:
+        return None
+    return {"kind": "memo", "id": new['id'], "before": before, "after": after, "partial": True, "t": round(time.time(), 2)}
+
+def apply_memo(current, entry, reverse=False):
+    """返回应用差异后的备忘录，结果为 None 表示该备忘录应被删除"""
+    state = entry["before"] if reverse else entry["after"]
+    if not entry.get("partial"):
+        return None if state is None else memo_from_record(state)
+    if current is None:
+        return None
+    record = memo_record(current)
+    for field, value in state.items():
+        if value is None:
+            record.pop(field, None)
+        else:
+            record[field] = value
+    return memo_from_record(record)
+
+class EditHistory:
+    """撤销/重做栈，每条记录只保存正向和反向的差异。
+
+    记录按 JSON 长度计入内存预算，超出时丢弃最旧的记录。修改先进入 pending，commit 时追加到日志文件
+    （每行一条记录或一个 undo/redo 标记），启动时重放日志恢复两个栈；日志行数过多时按当前栈重写，
+    只保留最近的 max_log_entries 条。checkpoint/rollback 用于可以取消的编辑会话。
+    """
+    def __init__(self, path, memory_budget=1024 * 1024, max_log_entries=500):
+        self.path = path
+        self.memory_budget = memory_budget
+        self.max_log_entries = max_log_entries
+        self.undo_stack = []
+        self.redo_stack = []
+        self.sizes = {}
+        self.memory_used = 0
+        self.pending = []
+        self.log_lines = 0
+        self.load()
+
+    def entry_size(self, entry):
+        return len(json.dumps(entry, ensure_ascii=False))
+
+    def track(self, entry):
+        size = self.sizes[id(entry)] = self.entry_size(entry)
+        self.memory_used += size
+        while self.memory_used > self.memory_budget and len(self.undo_stack) > 1:
+            self.untrack(self.undo_stack.pop(0))
+
+    def untrack(self, entry):
+        self.memory_used -= self.sizes.pop(id(entry), 0)
+
+    def replay(self, record):
+        op = record.get("op")
+        if op == "undo":
+            if self.undo_stack:
+                self.redo_stack.append(self.undo_stack.pop())
+        elif op == "redo":
+            if self.redo_stack:
+                self.undo_stack.append(self.redo_stack.pop())
+        elif op == "replace":
+            if self.undo_stack:
+                self.untrack(self.undo_stack.pop())
+            self.push_entry(record["entry"])
+        else:
+            self.push_entry(record)
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self.log_lines += 1
+                    try:
+                        self.replay(json.loads(line))
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        continue
+        except OSError:
+            pass
+
+    def push_entry(self, entry):
+        for dropped in self.redo_stack:
+            self.untrack(dropped)
+        self.redo_stack = []
+        self.undo_stack.append(entry)
+        self.track(entry)
+
+    def push(self, entry, merge=None):
+        """记录一次修改；merge(上一条, 本条) 返回合并结果时替换上一条而不是新增"""
+        if entry is None:
+            return
+        if merge and self.undo_stack and not self.redo_stack:
+            last = self.undo_stack[-1]
+            merged = merge(last, entry)
+            if merged is not None:
+                self.untrack(self.undo_stack.pop())
+                self.undo_stack.append(merged)
+                self.track(merged)
+                # 上一条还没写入日志时直接替换，否则写一条替换记录
+                if self.pending and self.pending[-1] is last:
+                    self.pending[-1] = merged
+                elif self.pending and self.pending[-1].get("op") == "replace" and self.pending[-1]["entry"] is last:
+                    self.pending[-1] = {"op": "replace", "entry": merged}
+                else:
+                    self.pending.append({"op": "replace", "entry": merged})
+                return
+        self.push_entry(entry)
+        self.pending.append(entry)
+
+    def undo(self):
+        """弹出最近一条记录并移入重做栈，由调用方按反向差异应用"""
+        if not self.undo_stack:
+            return None
+        entry = self.undo_stack.pop()
+        self.redo_stack.append(entry)
+        self.pending.append({"op": "undo"})
+        return entry
+
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        entry = self.redo_stack.pop()
+        self.undo_stack.append(entry)
+        self.pending.append({"op": "redo"})
+        return entry
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def checkpoint(self):
+        return list(self.undo_stack), list(self.redo_stack), len(self.pending)
+
+    def rollback(self, checkpoint):
+        """放弃 checkpoint 之后的所有修改和撤销操作"""
+        undo_stack, redo_stack, pending_count = checkpoint
+        for entry in self.undo_stack + self.redo_stack:
+            self.untrack(entry)
+        self.undo_stack, self.redo_stack = list(undo_stack), list(redo_stack)
+        for entry in self.undo_stack + self.redo_stack:
+            self.sizes[id(entry)] = self.entry_size(entry)
+            self.memory_used += self.sizes[id(entry)]
+        del self.pending[pending_count:]
+
+    def commit(self):
+        """把待写入的记录追加到日志，日志过长时按当前栈重写"""
+        if not self.pending:
+            return
+        try:
+            if self.log_lines + len(self.pending) > 2 * self.max_log_entries:
+                self.compact()
+            else:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n" for record in self.pending)
+                self.log_lines += len(self.pending)
+            self.pending = []
+        except OSError as e:
+            print(f"保存撤销记录失败: {e}")
+
+    def compact(self):
+        # 重做栈中的记录先按原顺序写回，再用 undo 标记移回重做栈
+        redo = list(reversed(self.redo_stack))
+        entries = (self.undo_stack + redo)[-self.max_log_entries:]
+        undo_count = min(len(redo), len(entries))
+        records = entries + [{"op": "undo"}] * undo_count
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n" for record in records)
+        os.replace(tmp_path, self.path)
+        self.log_lines = len(records)
@@ -0,0 +1,322 @@
+import os
+import re
+import heapq
+import fnmatch
+import pickle
+import threading
+from array import array
+from PyQt6.QtCore import QThread, pyqtSignal
+
+INDEX_VERSION = 2
+GLOB_CHARS = re.compile(r"[*?\[]")
+GLOB_CLASS = re.compile(r"\[[^\]]*\]")
+
+# 绝对路径只排除该目录本身，其余按目录名在任意深度排除
+DEFAULT_EXCLUDES = [".git", ".svn", "node_modules", "__pycache__", "$RECYCLE.BIN", "System Volume Information", "/proc", "/sys", "/dev"]
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def default_roots():
+    return [os.path.expanduser("~")]
+
+class FileIndex:
+    """文件名三元组索引。
+
+    每个目录和目录项都用整数 ID 表示，倒排表 postings 把小写文件名中的每个三元组映射到按 ID 递增的
+    array('I')，子串查询对各三元组的倒排表求交集后再逐个校验。删除只打标记，死条目过多时由索引器整体重建。
+    """
+    def __init__(self, roots=None, excludes=None):
+        self.lock = threading.RLock()
+        self.roots = list(roots or [])
+        self.excludes = set(excludes or [])
+        self.exclude_names = {name for name in self.excludes if not os.path.isabs(name)}
+        self.exclude_paths = {os.path.normcase(os.path.abspath(name)) for name in self.excludes if os.path.isabs(name)}
+        self.root_dirs = []
+        self.dir_paths = []
+        self.dir_mtimes = []
+        self.dir_entries = []
+        self.dir_subdirs = []
+        self.names = []
+        self.entry_dirs = array('I')
+        self.alive = bytearray()
+        self.postings = {}
+        self.dead_count = 0
+        self.saving_postings = None
+
+    def __len__(self):
+        return len(self.names) - self.dead_count
+
+    def needs_rebuild(self):
+        return self.dead_count > 1000 and self.dead_count * 3 > len(self.names)
+
+    def add_entry(self, dir_id, name):
+        entry_id = len(self.names)
+        self.names.append(name)
+        self.entry_dirs.append(dir_id)
+        self.alive.append(1)
+        saving = self.saving_postings
+        for gram in trigrams(name.lower()):
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array('I')
+            elif saving is not None and saving.get(gram) is posting:
+                # 正在保存的快照引用着这个倒排表
+                posting = self.postings[gram] = array('I', posting)
+            posting.append(entry_id)
+        self.dir_entries[dir_id].append(entry_id)
+        return entry_id
+
+    def remove_entry(self, entry_id):
+        if self.alive[entry_id]:
+            self.alive[entry_id] = 0
+            self.dead_count += 1
+
+    def new_dir(self, path):
+        dir_id = len(self.dir_paths)
+        self.dir_paths.append(path)
+        self.dir_mtimes.append(0)
+        self.dir_entries.append([])
+        self.dir_subdirs.append({})
+        return dir_id
+
+    def remove_dir(self, dir_id):
+        stack = [dir_id]
+        while stack:
+            current = stack.pop()
+            for entry_id in self.dir_entries[current]:
+                self.remove_entry(entry_id)
+            self.dir_entries[current] = []
+            stack.extend(self.dir_subdirs[current].values())
+            self.dir_subdirs[current] = {}
+            self.dir_paths[current] = None
+
+    def is_excluded(self, entry):
+        if entry.name in self.exclude_names:
+            return True
+        return bool(self.exclude_paths) and os.path.normcase(entry.path) in self.exclude_paths
+
+    def list_dir(self, path):
+        """返回 (mtime, [(名称, 是否为需要递归的目录)]) ，无法访问时返回 None"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            items = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    items.append((entry.name, is_dir and not self.is_excluded(entry)))
+            return mtime, items
+        except OSError:
+            return None
+
+    def scan_tree(self, path, dir_id=None, stop_event=None):
+        """完整扫描一棵目录树，调用方负责加锁"""
+        if dir_id is None:
+            dir_id = self.new_dir(path)
+        stack = [dir_id]
+        while stack:
+            if stop_event is not None and stop_event.is_set():
+                return dir_id
+            current = stack.pop()
+            listing = self.list_dir(self.dir_paths[current])
+            if listing is None:
+                continue
+            mtime, items = listing
+            self.dir_mtimes[current] = mtime
+            for name, recurse in items:
+                self.add_entry(current, name)
+                if recurse:
+                    child = self.new_dir(os.path.join(self.dir_paths[current], name))
+                    self.dir_subdirs[current][name] = child
+                    stack.append(child)
+        return dir_id
+
+    def build(self, stop_event=None):
+        with self.lock:
+            for root in self.roots:
+                if os.path.isdir(root):
+                    self.root_dirs.append(self.scan_tree(os.path.abspath(root), stop_event=stop_event))
+
+    def refresh(self, stop_event=None):
+        """按目录 mtime 增量更新：未变化的目录只 stat 不重新列举，返回是否有变化"""
+        changed = False
+        stack = list(self.root_dirs)
+        while stack:
+            if stop_event is not None and stop_event.is_set():
+                break
+            dir_id = stack.pop()
+            path = self.dir_paths[dir_id]
+            if path is None:
+                continue
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime is not None and mtime == self.dir_mtimes[dir_id]:
+                stack.extend(self.dir_subdirs[dir_id].values())
+                continue
+            listing = self.list_dir(path) if mtime is not None else None
+            with self.lock:
+                changed = True
+                if listing is None:
+                    for entry_id in self.dir_entries[dir_id]:
+                        self.remove_entry(entry_id)
+                    self.dir_entries[dir_id] = []
+                    for child in self.dir_subdirs[dir_id].values():
+                        self.remove_dir(child)
+                    self.dir_subdirs[dir_id] = {}
+                    continue
+                mtime, items = listing
+                self.dir_mtimes[dir_id] = mtime
+                current = {name: recurse for name, recurse in items}
+                kept = []
+                for entry_id in self.dir_entries[dir_id]:
+                    if not self.alive[entry_id]:
+                        continue
+                    if self.names[entry_id] in current:
+                        kept.append(entry_id)
+                    else:
+                        self.remove_entry(entry_id)
+                self.dir_entries[dir_id] = kept
+                existing = {self.names[entry_id] for entry_id in kept}
+                subdirs = self.dir_subdirs[dir_id]
+                for name in list(subdirs):
+                    if not current.get(name):
+                        self.remove_dir(subdirs.pop(name))
+                fresh = set()
+                for name, recurse in items:
+                    if name not in existing:
+                        self.add_entry(dir_id, name)
+                    if recurse and name not in subdirs:
+                        child = self.new_dir(os.path.join(path, name))
+                        subdirs[name] = child
+                        self.scan_tree(None, child, stop_event)
+                        fresh.add(child)
+                stack.extend(child for child in subdirs.values() if child not in fresh)
+        return changed
+
+    def _candidates(self, literal):
+        if len(literal) < 3:
+            return range(len(self.names))
+        lists = []
+        for gram in trigrams(literal):
+            posting = self.postings.get(gram)
+            if posting is None:
+                return []
+            lists.append(posting)
+        lists.sort(key=len)
+        if len(lists) == 1:
+            return lists[0]
+        # 求交集在 C 中完成，结果的顺序不影响排序（ID 只用来区分同分的结果）
+        return set(lists[0]).intersection(*lists[1:])
+
+    def full_path(self, entry_id):
+        return os.path.join(self.dir_paths[self.entry_dirs[entry_id]], self.names[entry_id])
+
+    def search(self, query, limit=50):
+        """子串或通配符（* ? [...]）查询文件名，返回完整路径列表，前缀匹配和短文件名优先"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        if GLOB_CHARS.search(query):
+            literal = max(GLOB_CHARS.split(GLOB_CLASS.sub("*", query)), key=len)
+            match = lambda name: fnmatch.fnmatchcase(name, query)
+        else:
+            literal = query
+            match = lambda name: literal in name
+        with self.lock:
+            names, alive = self.names, self.alive
+            found = ((not name.startswith(literal), len(name), entry_id)
+                     for entry_id, name in ((entry_id, names[entry_id].lower()) for entry_id in self._candidates(literal) if alive[entry_id])
+                     if match(name))
+            # 在全部匹配项中排序，不能先截断再排序，否则靠后的短文件名和前缀匹配会被漏掉
+            return [self.full_path(entry_id) for _, _, entry_id in heapq.nsmallest(limit, found)]
+
+    def save(self, path):
+        """在锁内复制一份状态，锁外写入文件，写入期间不阻塞查询和增量更新；倒排表写时复制（见 add_entry）"""
+        with self.lock:
+            self.saving_postings = self.postings.copy()
+            state = {"roots": list(self.roots), "excludes": set(self.excludes),
+                     "exclude_names": set(self.exclude_names), "exclude_paths": set(self.exclude_paths),
+                     "root_dirs": list(self.root_dirs), "dir_paths": list(self.dir_paths), "dir_mtimes": list(self.dir_mtimes),
+                     "dir_entries": list(map(list, self.dir_entries)), "dir_subdirs": list(map(dict, self.dir_subdirs)),
+                     "names": list(self.names), "entry_dirs": array('I', self.entry_dirs), "alive": bytearray(self.alive),
+                     "postings": self.saving_postings, "dead_count": self.dead_count, "version": INDEX_VERSION}
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        finally:
+            with self.lock:
+                self.saving_postings = None
+
+    @classmethod
+    def load(cls, path, roots, excludes):
+        """加载磁盘上的索引，版本或根目录配置不一致时返回 None"""
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if state.pop("version", None) != INDEX_VERSION:
+            return None
+        if state.get("roots") != list(roots) or state.get("excludes") != set(excludes):
+            return None
+        index = cls()
+        index.__dict__.update(state)
+        return index
+
+class FileIndexer(QThread):
+    """后台建立并维护文件名索引，先加载磁盘缓存以便热启动，之后按间隔做 mtime 增量扫描"""
+    index_ready = pyqtSignal(int)
+
+    def __init__(self, roots, excludes, cache_path, rescan_interval=600, parent=None):
+        super().__init__(parent)
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.excludes = excludes
+        self.cache_path = cache_path
+        self.rescan_interval = rescan_interval
+        self.index = FileIndex(self.roots, self.excludes)
+        self._stop_event = threading.Event()
+
+    def search(self, query, limit=50):
+        return self.index.search(query, limit)
+
+    def save(self):
+        try:
+            self.index.save(self.cache_path)
+        except Exception as e:
+            print(f"保存文件索引失败: {e}")
+
+    def rebuild(self):
+        index = FileIndex(self.roots, self.excludes)
+        index.build(self._stop_event)
+        if self._stop_event.is_set():
+            return
+        self.index = index
+        self.save()
+        self.index_ready.emit(len(index))
+
+    def run(self):
+        cached = FileIndex.load(self.cache_path, self.roots, self.excludes)
+        if cached is not None:
+            self.index = cached
+            self.index_ready.emit(len(cached))
+            if self.index.refresh(self._stop_event):
+                self.save()
+        else:
+            self.rebuild()
+        while not self._stop_event.wait(self.rescan_interval):
+            if self.index.needs_rebuild():
+                self.rebuild()
+            elif self.index.refresh(self._stop_event):
+                self.save()
+                self.index_ready.emit(len(self.index))
+
+    def stop(self):
+        self._stop_event.set()
+        self.wait(5000)
@@ -0,0 +1,232 @@
+import os
+import sys
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader
+
+from core.path_cache import PathCache
+
+THUMBNAIL_SIZES = (24, 48)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.ico', '.bmp', '.gif', '.svg', '.xpm')
+ICON_THEME_SIZES = ("48x48", "64x64", "scalable", "32x32", "128x128", "256x256", "24x24", "16x16")
+
+def xdg_data_dirs():
+    dirs = [os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")]
+    dirs.extend((os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":"))
+    return [d for d in dirs if d]
+
+def read_desktop_entry(path):
+    """读取 .desktop 文件 [Desktop Entry] 段中的键值"""
+    entry = {}
+    in_section = False
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    in_section = line == "[Desktop Entry]"
+                elif in_section and "=" in line and not line.startswith("#"):
+                    key, _, value = line.partition("=")
+                    entry.setdefault(key.strip(), value.strip())
+    except OSError:
+        pass
+    return entry
+
+def find_theme_icon(name, theme=None):
+    """按 freedesktop 图标主题规范查找图标文件，找不到时返回 None"""
+    if not name:
+        return None
+    if os.path.isabs(name):
+        return name if os.path.isfile(name) else None
+    themes = [t for t in (theme, "hicolor") if t]
+    for data_dir in xdg_data_dirs():
+        for theme_name in themes:
+            base = os.path.join(data_dir, "icons", theme_name)
+            if not os.path.isdir(base):
+                continue
+            for size in ICON_THEME_SIZES:
+                for ext in (".png", ".svg", ".xpm"):
+                    candidate = os.path.join(base, size, "apps", name + ext)
+                    if os.path.isfile(candidate):
+                        return candidate
+        for ext in (".png", ".svg", ".xpm"):
+            candidate = os.path.join(data_dir, "pixmaps", name + ext)
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+def find_desktop_file(program):
+    name = os.path.basename(program)
+    for data_dir in xdg_data_dirs():
+        candidate = os.path.join(data_dir, "applications", name + ".desktop")
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+def scaled_image(path, size):
+    """在工作线程中解码并缩放图片，保持宽高比，失败时返回 None"""
+    reader = QImageReader(path)
+    original = reader.size()
+    if original.isValid() and original.width() > 0 and original.height() > 0:
+        reader.setScaledSize(original.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return None
+    if image.width() > size or image.height() > size:
+        image = image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    return image
+
+class IconCache(QObject):
+    """工具图标缓存：内存中是按 (来源, 尺寸) 的 LRU QPixmap，磁盘上是按 (路径, mtime) 命名的预缩放 PNG 缩略图。
+
+    request 只查内存缓存，未命中时在工作线程中读磁盘缩略图或解码原图并写入 24/48 两种尺寸的缩略图，
+    完成后在 GUI 线程发出 icon_ready。可执行文件在 Linux 上通过 .desktop 和图标主题查找图标，
+    在 Windows 上由系统图标提供器提取（需要在 GUI 线程中进行，每个文件版本只提取一次）。
+    """
+    icon_ready = pyqtSignal(str, int)
+    _loaded = pyqtSignal(str, int, object)
+    _needs_provider = pyqtSignal(str, int, str, str)
+
+    def __init__(self, cache_dir, path_cache=None, capacity=128, theme=None, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.path_cache = path_cache if path_cache is not None else PathCache(parent=self)
+        self.capacity = capacity
+        self.theme = theme
+        self.memory = OrderedDict()
+        self.failed = set()
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="icon-cache")
+        self._loaded.connect(self.on_loaded)
+        self._needs_provider.connect(self.extract_with_provider)
+
+    def request(self, source, size=24):
+        """返回已缓存的 QPixmap；未缓存时安排后台加载并返回 None，加载成功后发出 icon_ready(source, size)"""
+        key = (source, size)
+        pixmap = self.memory.get(key)
+        if pixmap is not None:
+            self.memory.move_to_end(key)
+            return pixmap
+        if key in self.failed or not source:
+            return None
+        with self.lock:
+            if key in self.pending:
+                return None
+            self.pending.add(key)
+        try:
+            self.executor.submit(self._load, source, size)
+        except RuntimeError:
+            with self.lock:
+                self.pending.discard(key)
+        return None
+
+    def forget(self, source):
+        """源文件变化后丢弃内存中的条目，下次请求时按新的 mtime 重新加载"""
+        for key in [key for key in self.memory if key[0] == source]:
+            del self.memory[key]
+        self.failed = {key for key in self.failed if key[0] != source}
+
+    def thumbnail_path(self, path, mtime, size):
+        digest = hashlib.sha1(f"{path}|{mtime}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}_{size}.png")
+
+    def resolve_image(self, path):
+        """把来源路径解析为可直接解码的图片文件；Windows 可执行文件返回 None，交给系统图标提供器"""
+        lower = path.lower()
+        if lower.endswith(IMAGE_EXTENSIONS):
+            return path
+        if lower.endswith(".desktop"):
+            return find_theme_icon(read_desktop_entry(path).get("Icon"), self.theme)
+        if sys.platform == "win32":
+            return None
+        desktop_file = find_desktop_file(path)
+        if desktop_file:
+            icon = find_theme_icon(read_desktop_entry(desktop_file).get("Icon"), self.theme)
+            if icon:
+                return icon
+        return find_theme_icon(os.path.splitext(os.path.basename(path))[0], self.theme)
+
+    def _load(self, source, size):
+        image = None
+        try:
+            info = self.path_cache.lookup(source)
+            if info.exists:
+                thumbnail = self.thumbnail_path(info.path, info.mtime, size)
+                if os.path.isfile(thumbnail):
+                    image = QImage(thumbnail)
+                else:
+                    image_path = self.resolve_image(info.path)
+                    if image_path is None and sys.platform == "win32":
+                        self._needs_provider.emit(source, size, info.path, str(info.mtime))
+                        return
+                    if image_path:
+                        image = self.store_thumbnails(info.path, info.mtime, image_path, size)
+        except Exception as e:
+            print(f"加载图标失败 {source}: {e}")
+            image = None
+        self._loaded.emit(source, size, image)
+
+    def store_thumbnails(self, path, mtime, image_path, size):
+        """一次解码写出所有尺寸的缩略图，返回请求的尺寸"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        result = None
+        for thumb_size in sorted(set(THUMBNAIL_SIZES) | {size}):
+            image = scaled_image(image_path, thumb_size)
+            if image is None:
+                return None
+            image.save(self.thumbnail_path(path, mtime, thumb_size), "PNG")
+            if thumb_size == size:
+                result = image
+        return result
+
+    def extract_with_provider(self, source, size, path, mtime):
+        from PyQt6.QtCore import QFileInfo
+        from PyQt6.QtWidgets import QFileIconProvider
+        image = None
+        icon = QFileIconProvider().icon(QFileInfo(path))
+        if not icon.isNull():
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for thumb_size in sorted(set(THUMBNAIL_SIZES) | {size}):
+                thumb = icon.pixmap(QSize(thumb_size, thumb_size)).toImage()
+                thumb.save(self.thumbnail_path(path, mtime, thumb_size), "PNG")
+                if thumb_size == size:
+                    image = thumb
+        self.on_loaded(source, size, image)
+
+    def on_loaded(self, source, size, image):
+        from PyQt6.QtGui import QPixmap
+        key = (source, size)
+        with self.lock:
+            self.pending.discard(key)
+        if image is None or image.isNull():
+            self.failed.add(key)
+            return
+        self.memory[key] = QPixmap.fromImage(image)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+        self.icon_ready.emit(source, size)
+
+    def prune(self, max_files=1024):
+        """磁盘缩略图超过上限时删除最久未修改的文件，在工作线程中执行"""
+        self.executor.submit(self._prune, max_files)
+
+    def _prune(self, max_files):
+        try:
+            with os.scandir(self.cache_dir) as it:
+                files = [(entry.stat().st_mtime, entry.path) for entry in it if entry.name.endswith(".png")]
+        except OSError:
+            return
+        files.sort()
+        for _, path in files[:max(0, len(files) - max_files)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,146 @@
+import os
+import sys
+import time
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from core.path_cache import PathCache
+
+EXECUTABLE_EXTENSIONS = (".exe", ".bat", ".cmd", ".com")
+WINDOW_WAIT_SECONDS = 15
+WINDOW_POLL_SECONDS = 0.1
+
+def process_has_window(pid):
+    """进程是否已有可见的顶层窗口；只在 Windows 上可以检测，其他平台返回 None"""
+    if sys.platform != "win32":
+        return None
+    import ctypes
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    found = []
+    owner = wintypes.DWORD()
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def callback(hwnd, _):
+        if user32.IsWindowVisible(hwnd):
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+            if owner.value == pid:
+                found.append(hwnd)
+                return False
+        return True
+
+    user32.EnumWindows(callback, 0)
+    return bool(found)
+
+class ProcessLauncher(QObject):
+    """在工作线程中以参数列表启动外部程序（不经过 shell），跟踪子进程并报告启动耗时和失败"""
+    launched = pyqtSignal(str, float, int)
+    launch_failed = pyqtSignal(str, str)
+    first_window = pyqtSignal(str, float)
+
+    def __init__(self, path_cache=None, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="launcher")
+        self.window_watcher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="window-watcher")
+        self.path_cache = path_cache if path_cache is not None else PathCache(parent=self)
+        self.processes = {}
+        self.reap_timer = QTimer(self)
+        self.reap_timer.timeout.connect(self.reap)
+        self.launched.connect(self.on_launched)
+
+    def resolve(self, program):
+        """通过共享的路径缓存解析可执行文件路径，找不到时返回 None"""
+        return self.path_cache.resolve(program)
+
+    def is_executable(self, path):
+        if sys.platform == "win32":
+            return path.lower().endswith(EXECUTABLE_EXTENSIONS)
+        return os.access(path, os.X_OK) and not os.path.isdir(path)
+
+    def launch(self, argv, name=None, key=None):
+        """异步启动 argv[0]，立即返回；结果通过 launched / launch_failed 信号报告。
+        给出 key 时还会等待进程的首个窗口出现，并通过 first_window(key, 耗时) 报告"""
+        name = name or os.path.basename(argv[0])
+        self.executor.submit(self._spawn, list(argv), name, time.perf_counter(), key)
+
+    def open_path(self, path, name=None, key=None):
+        """用系统默认程序打开文件、目录或 URL；可执行文件则直接启动"""
+        resolved = self.resolve(path) if not path.startswith(("http://", "https://")) else None
+        if resolved and self.is_executable(resolved):
+            self.launch([resolved], name, key)
+        else:
+            self.executor.submit(self._open, path, name or os.path.basename(path) or path, time.perf_counter())
+
+    def _spawn(self, argv, name, requested_at, key=None):
+        raw = argv[0]
+        program = self.resolve(raw)
+        if program is None:
+            self.launch_failed.emit(name, f"找不到程序: {raw}")
+            return
+        argv[0] = program
+        try:
+            if hasattr(os, "posix_spawn"):
+                pid = os.posix_spawn(program, argv, os.environ)
+                process = None
+            else:
+                flags = 0
+                if sys.platform == "win32":
+                    flags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+                process = subprocess.Popen(argv, creationflags=flags, close_fds=True)
+                pid = process.pid
+        except OSError as e:
+            self.path_cache.invalidate(raw)
+            self.launch_failed.emit(name, str(e))
+            return
+        self.processes[pid] = (name, process)
+        self.launched.emit(name, (time.perf_counter() - requested_at) * 1000, pid)
+        if key is not None and sys.platform == "win32":
+            self.window_watcher.submit(self._watch_window, pid, key, requested_at)
+
+    def _watch_window(self, pid, key, requested_at):
+        deadline = requested_at + WINDOW_WAIT_SECONDS
+        while time.perf_counter() < deadline:
+            if process_has_window(pid):
+                self.first_window.emit(key, (time.perf_counter() - requested_at) * 1000)
+                return
+            time.sleep(WINDOW_POLL_SECONDS)
+
+    def _open(self, target, name, requested_at):
+        try:
+            if sys.platform == "win32":
+                os.startfile(target)
+            elif sys.platform == "darwin":
+                return self._spawn(["open", target], name, requested_at)
+            else:
+                return self._spawn(["xdg-open", target], name, requested_at)
+        except OSError as e:
+            self.launch_failed.emit(name, str(e))
+            return
+        self.launched.emit(name, (time.perf_counter() - requested_at) * 1000, 0)
+
+    def on_launched(self, name, latency_ms, pid):
+        print(f"已启动 {name} (pid {pid})，耗时 {latency_ms:.1f} ms")
+        if self.processes and not self.reap_timer.isActive():
+            self.reap_timer.start(5000)
+
+    def reap(self):
+        """回收已退出的子进程，避免 posix_spawn 启动的进程成为僵尸进程"""
+        for pid, (name, process) in list(self.processes.items()):
+            try:
+                if process is not None:
+                    finished = process.poll() is not None
+                else:
+                    finished = os.waitpid(pid, os.WNOHANG)[0] != 0
+            except ChildProcessError:
+                finished = True
+            if finished:
+                self.processes.pop(pid, None)
+        if not self.processes:
+            self.reap_timer.stop()
+
+    def running(self):
+        return {pid: name for pid, (name, _) in self.processes.items()}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+        self.window_watcher.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,155 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.text_index import NOTES_PREFIX
+
+def search_quick_tools(tools, query, limit):
+    results = []
+    for tool in tools:
+        if query in tool.get("name", "").lower() or query in os.path.basename(tool.get("path", "")).lower():
+            results.append((f"🔧 {tool['name']}", tool.get("path", ""), {"kind": "tool", "path": tool.get("path", ""), "tool": tool}))
+            if len(results) >= limit:
+                break
+    return results
+
+def memo_result(memo):
+    return (f"📝 {memo.get('title', '')}", memo.get('content', '')[:200], {"kind": "memo", "id": memo.get('id')})
+
+def search_memos(memos, query, limit):
+    results = []
+    for memo in memos:
+        if query in memo.get('title', '').lower() or query in memo.get('content', '').lower():
+            results.append(memo_result(memo))
+            if len(results) >= limit:
+                break
+    return results
+
+def search_indexed_memos(text_index, store, query, limit):
+    """从全文索引按相关度取备忘录，store 提供按 id 查找"""
+    results = []
+    for memo_id, _ in text_index.search(query, limit, kind="memo"):
+        memo = store.get(memo_id)
+        if memo is not None:
+            results.append(memo_result(memo))
+    return results
+
+def search_notes(notes, query, limit):
+    results = []
+    for line_no, line in enumerate(notes.splitlines()):
+        if query in line.lower():
+            results.append((f"🗒 {line.strip()[:60]}", line, {"kind": "notes", "line": line_no}))
+            if len(results) >= limit:
+                break
+    return results
+
+def search_indexed_notes(text_index, notes, query, limit):
+    lines = notes.splitlines()
+    results = []
+    for doc_id, _ in text_index.search(query, limit, kind="notes"):
+        line_no = int(doc_id[len(NOTES_PREFIX):])
+        if line_no < len(lines):
+            line = lines[line_no]
+            results.append((f"🗒 {line.strip()[:60]}", line, {"kind": "notes", "line": line_no}))
+    return results
+
+class LocalSearchService(QObject):
+    """边输入边搜索：在线程池中查询本地数据源，过期的查询被丢弃，最近查询的结果保存在 LRU 缓存中。
+    全文索引就绪后备忘录和快速笔记改为按相关度从索引查询，否则逐条匹配。
+    数据变化时 invalidate 清空缓存并推进 epoch，变化前提交、变化后才完成的查询结果既不缓存也不显示。
+    回车时的文件搜索 find_files 也在线程池中执行，结果通过 files_ready 返回。"""
+    results_ready = pyqtSignal(str, list)
+    files_ready = pyqtSignal(str, list)
+    _job_finished = pyqtSignal(int, int, str, list)
+    _files_finished = pyqtSignal(int, str, list)
+
+    def __init__(self, file_indexer=None, cache_size=64, limit=20, parent=None):
+        super().__init__(parent)
+        self.file_indexer = file_indexer
+        self.text_index = None
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.limit = limit
+        self.generation = 0
+        self.epoch = 0
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="local-search")
+        self._job_finished.connect(self.on_job_finished)
+        self._files_finished.connect(self.on_files_finished)
+
+    def invalidate(self):
+        self.epoch += 1
+        self.cache.clear()
+
+    def search(self, query, tools, memos, notes):
+        """tools、notes 为调用时的数据快照，memos 为备忘录存储，查询在工作线程中只读访问它们"""
+        self.generation += 1
+        key = query.strip().lower()
+        if not key:
+            self.results_ready.emit(query, [])
+            return
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.results_ready.emit(query, self.cache[key])
+            return
+        text_index = self.text_index if self.text_index is not None and self.text_index.is_ready() else None
+        # 使用索引时只按 id 查找备忘录，不需要复制整个列表
+        self.executor.submit(self.run_job, self.generation, self.epoch, query, key, list(tools),
+                             memos if text_index else list(memos), notes, text_index)
+
+    def run_job(self, generation, epoch, query, key, tools, memos, notes, text_index=None):
+        results = []
+        sources = [
+            lambda: search_quick_tools(tools, key, self.limit),
+            lambda: search_indexed_memos(text_index, memos, key, self.limit) if text_index else search_memos(memos, key, self.limit),
+            lambda: search_indexed_notes(text_index, notes, key, 5) if text_index else search_notes(notes, key, 5),
+            lambda: self.search_files(key),
+        ]
+        try:
+            for source in sources:
+                # 用户继续输入后，正在执行的旧查询在数据源之间尽早退出
+                if generation != self.generation:
+                    return
+                results.extend(source())
+        except Exception as e:
+            print(f"本地搜索失败: {e}")
+            return
+        self._job_finished.emit(generation, epoch, query, results)
+
+    def search_files(self, key):
+        if not self.file_indexer:
+            return []
+        return [(f"📄 {os.path.basename(path) or path}", path, {"kind": "file", "path": path})
+                for path in self.file_indexer.search(key, self.limit)]
+
+    def on_job_finished(self, generation, epoch, query, results):
+        if epoch != self.epoch:
+            return
+        key = query.strip().lower()
+        self.cache[key] = results
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        if generation == self.generation:
+            self.results_ready.emit(query, results)
+
+    def find_files(self, query, limit=50):
+        """只搜索文件名索引，返回完整路径；同时作废尚未完成的边输入边搜索"""
+        self.generation += 1
+        self.executor.submit(self.run_file_job, self.generation, query, limit)
+
+    def run_file_job(self, generation, query, limit):
+        try:
+            paths = self.file_indexer.search(query, limit) if self.file_indexer else []
+        except Exception as e:
+            print(f"文件搜索失败: {e}")
+            paths = []
+        self._files_finished.emit(generation, query, paths)
+
+    def on_files_finished(self, generation, query, paths):
+        if generation == self.generation:
+            self.files_ready.emit(query, paths)
+
+    def shutdown(self):
+        self.generation += 1
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,201 @@
+import os
+import json
+import threading
+from itertools import accumulate
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.memos import memo_from_record, memo_record
+from core.text_index import query_matcher
+
+def is_archivable(memo, cutoff):
+    """已经提醒过、且提醒时间早于 cutoff 的备忘录视为已完成，可以归档；从归档中恢复的除外"""
+    if not memo.get('reminder_shown') or not memo.get('reminder_time') or memo.get('keep_active'):
+        return False
+    return memo['reminder_time'] < cutoff
+
+def select_archivable(memos, after_days, now=None):
+    cutoff = (now or datetime.now()) - timedelta(days=after_days)
+    return [memo for memo in memos if is_archivable(memo, cutoff)]
+
+class MemoArchive:
+    """已完成备忘录的冷存储：只追加的 JSONL 文件，每行一条备忘录或一条删除记录。
+
+    归档时只追加写入，不读取文件；只有打开归档视图时才整体加载到内存，搜索也只在归档视图中进行。
+    加载后的备忘录不保存内容，只记住所在行的偏移，显示内容时再从文件读取；压缩逐行读取文件。
+    删除记录多于有效备忘录时重写文件。搜索在工作线程中进行（见 ArchiveSearch），读写文件和备忘录字典都在 lock 内。
+    """
+    def __init__(self, path):
+        self.path = path
+        self.memos = None
+        self.removed_count = 0
+        self.lock = threading.RLock()
+
+    def is_loaded(self):
+        return self.memos is not None
+
+    def append_lines(self, records):
+        """追加写入记录，返回每条记录所在行的偏移"""
+        offsets = []
+        with open(self.path, 'ab') as f:
+            for record in records:
+                offsets.append(f.tell())
+                f.write((json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8'))
+        return offsets
+
+    def add(self, memos):
+        with self.lock:
+            offsets = self.append_lines(memo_record(memo) for memo in memos)
+            if self.memos is not None:
+                for memo, offset in zip(memos, offsets):
+                    memo.set_lazy_content(self.path, offset)
+                    self.memos[memo['id']] = memo
+
+    def lines(self):
+        """逐行读取文件，产出 (行偏移, 行, 记录)，损坏的行被跳过"""
+        try:
+            f = open(self.path, 'rb')
+        except OSError:
+            return
+        with f:
+            offset = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if isinstance(record, dict) and record.get('id'):
+                    yield offset, line, record
+                offset += len(line)
+
+    def records(self):
+        for _, _, record in self.lines():
+            yield record
+
+    def current_lines(self):
+        """只产出每条仍在归档中的备忘录当前对应的那一行"""
+        memos = self.load()
+        for offset, line, record in self.lines():
+            memo = memos.get(record['id'])
+            if memo is not None and memo.content_offset() == offset:
+                yield offset, line, record
+
+    def load(self):
+        """加载全部归档，返回 id 到备忘录的字典；只在第一次调用时读取文件"""
+        with self.lock:
+            if self.memos is None:
+                memos = {}
+                removed = 0
+                for offset, _, record in self.lines():
+                    if record.get('removed'):
+                        memos.pop(record['id'], None)
+                        removed += 1
+                    else:
+                        memo = memo_from_record(record)
+                        memo.set_lazy_content(self.path, offset)
+                        memos[record['id']] = memo
+                self.memos = memos
+                self.removed_count = removed
+            return self.memos
+
+    def remove(self, memo_ids):
+        """从归档中删除（或恢复到活动列表），返回被删除的备忘录，内容已从文件中读出"""
+        with self.lock:
+            memos = self.load()
+            removed = [memos.pop(memo_id) for memo_id in memo_ids if memo_id in memos]
+            if not removed:
+                return []
+            for memo in removed:
+                memo.materialize()
+            self.removed_count += len(removed)
+            if self.removed_count > len(memos):
+                self.compact()
+            else:
+                self.append_lines({'id': memo['id'], 'removed': True} for memo in removed)
+            return removed
+
+    def compact(self):
+        """原样复制每条备忘录当前的那一行，写完后把延迟引用指向新文件中的偏移"""
+        with self.lock:
+            memos = self.load()
+            tmp_path = self.path + ".tmp"
+            new_offsets = []
+            with open(tmp_path, 'wb') as f:
+                for _, line, record in self.current_lines():
+                    new_offsets.append((record['id'], f.tell()))
+                    f.write(line)
+            os.replace(tmp_path, self.path)
+            for memo_id, offset in new_offsets:
+                memos[memo_id].set_lazy_content(self.path, offset)
+            self.removed_count = 0
+
+    def search(self, query):
+        """按与全文索引相同的规则搜索归档，返回匹配的 id。可以在工作线程中调用。
+
+        只在锁内取出标题、行偏移和文件内容，之后不再访问共享状态。文件整体转为小写后按行切分，
+        先用子串查找筛掉缺少某个查询词的行（都在 C 中完成），剩下的行先看标题，标题不足以确定时才解析 JSON 检查内容。
+        """
+        matcher = query_matcher(query)
+        if matcher is None:
+            return []
+        with self.lock:
+            entries = [(memo_id, memo.get('title', ''), memo.content_offset(), memo)
+                       for memo_id, memo in self.load().items()]
+            # 没有延迟引用的备忘录（不在文件中）直接取内存中的内容
+            loose = {memo_id: memo.get('content', '') for memo_id, _, offset, memo in entries if offset is None}
+            try:
+                with open(self.path, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                print(f"读取归档失败: {e}")
+                data = b""
+        raw_lines = data.split(b"\n")
+        # 转小写不会增减换行符，小写文本的第 n 行就是文件的第 n 行
+        lowered = data.decode('utf-8', errors='replace').lower().split("\n")
+        line_numbers = dict(zip(accumulate(map((1).__add__, map(len, raw_lines)), initial=0), range(len(raw_lines))))
+        hits = set()
+        candidates = []
+        for memo_id, title, offset, _ in entries:
+            if offset is None:
+                if matcher(title + "\n" + loose[memo_id]):
+                    hits.add(memo_id)
+            elif offset in line_numbers:
+                candidates.append((line_numbers[offset], memo_id, title))
+        for term in matcher.terms:
+            # 写入时不转义非 ASCII 字符，含 \\u 转义的行（手工编辑过）留到解析后再判断
+            candidates = [item for item in candidates if term in lowered[item[0]] or "\\u" in lowered[item[0]]]
+        for line_no, memo_id, title in candidates:
+            if matcher(title):
+                hits.add(memo_id)
+                continue
+            try:
+                record = json.loads(raw_lines[line_no])
+            except ValueError:
+                continue
+            if matcher(str(record.get('title') or "") + "\n" + str(record.get('content') or "")):
+                hits.add(memo_id)
+        return [memo_id for memo_id, _, _, _ in entries if memo_id in hits]
+
+class ArchiveSearch(QObject):
+    """在工作线程中搜索归档，搜索完成后发出 finished(查询, 匹配的 id)"""
+    finished = pyqtSignal(str, list)
+
+    def __init__(self, archive, parent=None):
+        super().__init__(parent)
+        self.archive = archive
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive-search")
+
+    def start(self, query):
+        self.executor.submit(self._search, query)
+
+    def _search(self, query):
+        try:
+            memo_ids = self.archive.search(query)
+        except Exception as e:
+            print(f"搜索归档失败: {e}")
+            memo_ids = []
+        self.finished.emit(query, memo_ids)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,311 @@
+import io
+import os
+import csv
+import json
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.memos import Memo, memo_from_record, memo_record
+
+FORMATS = ("jsonl", "csv", "ics")
+CSV_FIELDS = ("id", "title", "content", "created_time", "reminder_time", "reminder_shown", "advance_shown")
+ICS_PRODID = "-//eve desktop//memos//ZH"
+# 标准属性会丢失微秒和回车，原值另存到这些属性中，导入时优先使用
+ICS_EXACT = {"X-EVE-DESCRIPTION": 'content', "X-EVE-CREATED": 'created_time', "X-EVE-REMINDER-TIME": 'reminder_time'}
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    if ext in ("ics", "ical"):
+        return "ics"
+    if ext == "csv":
+        return "csv"
+    raise ValueError(f"不支持的文件格式: {path}")
+
+def dedupe_key(memo):
+    return (memo.get('title', ''), memo.get('reminder_time') or "")
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+def normalize_memo(raw):
+    """把导入的记录整理为备忘录，缺少标题时返回 None；无法解析的时间字段被丢弃"""
+    title = str(raw.get('title') or "").strip()
+    if not title:
+        return None
+    memo = {'title': title, 'content': str(raw.get('content') or "")}
+    if raw.get('id'):
+        memo['id'] = str(raw['id'])
+    parsed = memo_from_record({field: raw.get(field) for field in ('created_time', 'reminder_time')})
+    for field in ('created_time', 'reminder_time'):
+        if parsed.get(field):
+            memo[field] = parsed[field]
+    memo.setdefault('created_time', datetime.now())
+    for field in ('reminder_shown', 'advance_shown'):
+        if raw.get(field) not in (None, ""):
+            memo[field] = parse_bool(raw[field])
+    return Memo(memo)
+
+# ---- JSONL ----
+
+def jsonl_lines(memos):
+    for memo in memos:
+        yield json.dumps(memo_record(memo), ensure_ascii=False, separators=(',', ':')) + "\n"
+
+def read_jsonl(f):
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+        yield record if isinstance(record, dict) else None
+
+# ---- CSV ----
+
+def csv_lines(memos):
+    class LineBuffer:
+        def write(self, text):
+            return text
+    writer = csv.writer(LineBuffer())
+    yield writer.writerow(CSV_FIELDS)
+    for memo in map(memo_record, memos):
+        yield writer.writerow([
+            memo.get('id', ''), memo.get('title', ''), memo.get('content', ''),
+            memo.get('created_time', ''), memo.get('reminder_time', '') or '',
+            int(bool(memo.get('reminder_shown'))), int(bool(memo.get('advance_shown')))
+        ])
+
+def read_csv(f):
+    yield from csv.DictReader(f)
+
+# ---- iCalendar ----
+
+def ics_escape(text, exact=False):
+    """按 RFC 5545 转义，换行都写作 \\n；exact 为 True 时回车写作 \\r，只用于 X-EVE- 属性"""
+    text = text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+    if exact:
+        return text.replace("\r", "\\r").replace("\n", "\\n")
+    return text.replace("\r\n", "\\n").replace("\r", "\\n").replace("\n", "\\n")
+
+def ics_unescape(text):
+    result = []
+    chars = iter(text)
+    for char in chars:
+        if char == "\\":
+            escaped = next(chars, "")
+            result.append("\n" if escaped in ("n", "N") else "\r" if escaped == "r" else escaped)
+        else:
+            result.append(char)
+    return "".join(result)
+
+def ics_fold(line):
+    """按 RFC 5545 把超过 75 字节的内容行折叠为以空格开头的续行"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # 不在 UTF-8 多字节字符中间断开
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode('utf-8'))
+        start = end
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+def ics_time(value):
+    return value.strftime("%Y%m%dT%H%M%S")
+
+def parse_ics_time(value):
+    """支持本地时间、UTC（Z 结尾）和全天日期，统一转为本地时间的 ISO 字符串"""
+    value = value.strip()
+    if len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d").isoformat()
+    if value.endswith("Z"):
+        dt = datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+        return dt.astimezone().replace(tzinfo=None).isoformat()
+    return datetime.strptime(value, "%Y%m%dT%H%M%S").isoformat()
+
+def ics_lines(memos):
+    """有提醒时间的备忘录导出为 VEVENT，其余导出为 VTODO；标准属性无法原样表示的值另写一个 X-EVE- 属性"""
+    yield "BEGIN:VCALENDAR\r\n"
+    yield "VERSION:2.0\r\n"
+    yield f"PRODID:{ICS_PRODID}\r\n"
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    for memo in memos:
+        reminder_time = memo.get('reminder_time')
+        component = "VEVENT" if reminder_time else "VTODO"
+        lines = [f"BEGIN:{component}", f"UID:{memo.get('id', '')}@eve", f"DTSTAMP:{stamp}",
+                 f"SUMMARY:{ics_escape(memo.get('title', ''))}"]
+        if memo.get('content'):
+            lines.append(f"DESCRIPTION:{ics_escape(memo['content'])}")
+        if memo.get('created_time'):
+            lines.append(f"CREATED:{ics_time(memo['created_time'])}")
+        if reminder_time:
+            lines.append(f"DTSTART:{ics_time(reminder_time)}")
+        if "\r" in memo.get('content', ''):
+            lines.append(f"X-EVE-DESCRIPTION:{ics_escape(memo['content'], exact=True)}")
+        if memo.get('created_time') and memo['created_time'].microsecond:
+            lines.append(f"X-EVE-CREATED:{memo['created_time'].isoformat()}")
+        if reminder_time and reminder_time.microsecond:
+            lines.append(f"X-EVE-REMINDER-TIME:{reminder_time.isoformat()}")
+        if memo.get('reminder_shown'):
+            lines.append("X-EVE-REMINDER-SHOWN:TRUE")
+        if memo.get('advance_shown'):
+            lines.append("X-EVE-ADVANCE-SHOWN:TRUE")
+        lines.append(f"END:{component}")
+        for line in lines:
+            yield ics_fold(line)
+    yield "END:VCALENDAR\r\n"
+
+def unfold_ics(f):
+    """把折叠的续行拼回完整的内容行"""
+    current = None
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+def read_ics(f):
+    record = None
+    exact = {}
+    for line in unfold_ics(f):
+        name, _, value = line.partition(":")
+        name = name.split(";", 1)[0].upper()
+        if name == "BEGIN" and value.upper() in ("VEVENT", "VTODO"):
+            record = {}
+            exact = {}
+        elif name == "END" and value.upper() in ("VEVENT", "VTODO"):
+            if record is not None:
+                record.update(exact)
+                yield record
+            record = None
+        elif record is None:
+            continue
+        elif name in ICS_EXACT:
+            exact[ICS_EXACT[name]] = ics_unescape(value) if name == "X-EVE-DESCRIPTION" else value
+        elif name == "SUMMARY":
+            record['title'] = ics_unescape(value)
+        elif name == "DESCRIPTION":
+            record['content'] = ics_unescape(value)
+        elif name == "UID":
+            record['id'] = value[:-4] if value.endswith("@eve") else None
+        elif name in ("DTSTART", "DUE", "CREATED"):
+            try:
+                field = 'created_time' if name == "CREATED" else 'reminder_time'
+                if name != "DUE" or 'reminder_time' not in record:
+                    record[field] = parse_ics_time(value)
+            except ValueError:
+                continue
+        elif name == "STATUS" and value.upper() == "COMPLETED":
+            record['reminder_shown'] = True
+        elif name == "X-EVE-REMINDER-SHOWN":
+            record['reminder_shown'] = parse_bool(value)
+        elif name == "X-EVE-ADVANCE-SHOWN":
+            record['advance_shown'] = parse_bool(value)
+
+WRITERS = {"jsonl": jsonl_lines, "csv": csv_lines, "ics": ics_lines}
+READERS = {"jsonl": read_jsonl, "csv": read_csv, "ics": read_ics}
+
+def export_memos(memos, path, fmt=None):
+    """把备忘录逐条写入文件，先写临时文件再替换，返回导出的条数"""
+    fmt = fmt or detect_format(path)
+    count = 0
+    def counted():
+        nonlocal count
+        for memo in memos:
+            count += 1
+            yield memo
+    tmp_path = path + ".tmp"
+    # csv 模块要求以 newline='' 打开，换行符由写出的内容自己决定
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(WRITERS[fmt](counted()))
+    os.replace(tmp_path, path)
+    return count
+
+def iter_import(path, existing_keys, batch_size=1000, fmt=None):
+    """流式读取导入文件，按批产出 (备忘录列表, 已读取字节数, 文件大小, 跳过条数)。
+
+    existing_keys 是已有备忘录的 (标题, 提醒时间) 集合，导入过程中会加入新备忘录的键，重复记录被跳过。
+    """
+    fmt = fmt or detect_format(path)
+    total = os.path.getsize(path)
+    skipped = 0
+    batch = []
+    with open(path, 'rb') as raw:
+        # 进度按底层二进制文件的读取位置估算
+        with io.TextIOWrapper(raw, encoding='utf-8-sig', newline='') as f:
+            for record in READERS[fmt](f):
+                memo = normalize_memo(record) if record else None
+                if memo is None or dedupe_key(memo) in existing_keys:
+                    skipped += 1
+                    continue
+                existing_keys.add(dedupe_key(memo))
+                batch.append(memo)
+                if len(batch) >= batch_size:
+                    yield batch, raw.tell(), total, skipped
+                    batch = []
+    yield batch, total, total, skipped
+
+class MemoTransfer(QObject):
+    """在工作线程中导入或导出备忘录。导入按批发出 batch_ready，由界面线程一次提交一批"""
+    batch_ready = pyqtSignal(list)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(str, int, int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memo-transfer")
+        self.cancelled = False
+
+    def start_import(self, path, existing_keys, batch_size=1000):
+        self.cancelled = False
+        self.executor.submit(self._import, path, set(existing_keys), batch_size)
+
+    def _import(self, path, existing_keys, batch_size):
+        imported = skipped = 0
+        try:
+            for batch, done, total, skipped in iter_import(path, existing_keys, batch_size):
+                if self.cancelled:
+                    break
+                if batch:
+                    imported += len(batch)
+                    self.batch_ready.emit(batch)
+                self.progress.emit(done, total)
+        except Exception as e:
+            # 任何异常都要发出 finished，否则对话框的导入导出按钮会一直处于禁用状态
+            self.finished.emit("import", imported, skipped, str(e))
+            return
+        self.finished.emit("import", imported, skipped, "")
+
+    def start_export(self, memos, path):
+        self.executor.submit(self._export, list(memos), path)
+
+    def _export(self, memos, path):
+        try:
+            count = export_memos(memos, path)
+        except Exception as e:
+            self.finished.emit("export", 0, 0, str(e))
+            return
+        self.finished.emit("export", count, 0, "")
+
+    def shutdown(self):
+        self.cancelled = True
+        self.executor.shutdown(wait=True, cancel_futures=True)
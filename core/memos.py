@@ -1,14 +1,251 @@
-# 目前 MemoManager 主要逻辑已在 MemoDialog 中实现，如需后端存储/管理可在此扩展
-class MemoManager:
-    def __init__(self):
-        self.memos = []
-    def add_memo(self, memo):
-        self.memos.append(memo)
-    def get_memos(self):
-        return self.memos
-    def update_memo(self, index, memo):
-        if 0 <= index < len(self.memos):
-            self.memos[index] = memo
-    def delete_memo(self, index):
-        if 0 <= index < len(self.memos):
-            del self.memos[index] 
\ No newline at end of file
+import json
+import uuid
+from datetime import datetime
+
+TIME_FIELDS = ('created_time', 'reminder_time')
+TIME_FIELD_NAMES = {'created_time': "创建时间", 'reminder_time': "提醒时间"}
+FIELDS = ('id', 'title', 'content') + TIME_FIELDS
+FIELD_SET = frozenset(FIELDS)
+FLAGS = {'reminder_shown': 1, 'advance_shown': 2, 'keep_active': 4}
+
+def new_memo_id():
+    return uuid.uuid4().hex
+
+def parse_time(value):
+    """ISO 字符串转为本地时间的 datetime，带时区的时间转换为本地时间；无法解析时抛出 ValueError"""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str):
+        parsed = datetime.fromisoformat(value)
+    else:
+        raise ValueError(f"不是时间: {value!r}")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def read_content(path, offset):
+    """读取 JSONL 文件中 offset 处那一行记录的内容字段，文件丢失或损坏时返回空字符串"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return str(json.loads(f.readline()).get('content') or "")
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"读取备忘录内容失败: {e}")
+        return ""
+
+class Memo:
+    """内存中的一条备忘录，兼容原来字典的读写方式（get、[]、in、keys、items、update、pop）。
+
+    固定字段放在 __slots__ 中，不再为每条备忘录分配一个字典；三个提醒状态合并为一个整数位掩码，
+    值都是小整数，不占用额外对象；未设置的字段为 None，与字典中不存在该键等价。
+    其他字段（导入的自定义字段、<字段>_invalid）放在按需创建的 extra 字典中。
+    content 可以是 (文件路径, 行偏移) 形式的延迟引用，读取时才从归档文件中取出。
+    """
+    __slots__ = ('id', 'title', '_content', 'created_time', 'reminder_time', 'flags', 'extra')
+
+    def __init__(self, fields=(), **kwargs):
+        self.id = self.title = self._content = self.created_time = self.reminder_time = self.extra = None
+        self.flags = 0
+        self.update(fields, **kwargs)
+
+    @property
+    def content(self):
+        content = self._content
+        if content.__class__ is tuple:
+            return read_content(*content)
+        return content
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+
+    def set_lazy_content(self, path, offset):
+        self._content = (path, offset)
+
+    def content_offset(self):
+        """内容为延迟引用时返回所在行的偏移，否则返回 None"""
+        content = self._content
+        return content[1] if content.__class__ is tuple else None
+
+    def materialize(self):
+        self._content = self.content
+
+    def __getitem__(self, key):
+        if key in FIELD_SET:
+            value = getattr(self, key)
+        elif key in FLAGS:
+            value = True if self.flags & FLAGS[key] else None
+        else:
+            value = self.extra.get(key) if self.extra else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        if key in FIELD_SET:
+            setattr(self, key, value)
+        elif key in FLAGS:
+            self.flags = self.flags | FLAGS[key] if value else self.flags & ~FLAGS[key]
+        elif value is None:
+            self.pop(key, None)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def pop(self, key, *default):
+        try:
+            value = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        if key in FLAGS:
+            self[key] = False
+        elif key in FIELD_SET:
+            setattr(self, key, None)
+        else:
+            del self.extra[key]
+            if not self.extra:
+                self.extra = None
+        return value
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    def __contains__(self, key):
+        if key == 'content':
+            return self._content is not None
+        return self.get(key) is not None
+
+    def keys(self):
+        # 判断 content 是否存在时不读取延迟加载的内容
+        keys = [key for key in FIELDS if getattr(self, '_content' if key == 'content' else key) is not None]
+        keys.extend(key for key, bit in FLAGS.items() if self.flags & bit)
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def update(self, fields=(), **kwargs):
+        if hasattr(fields, 'keys'):
+            fields = [(key, fields[key]) for key in fields.keys()]
+        for key, value in fields:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def copy(self):
+        memo = Memo()
+        for key in self.__slots__:
+            setattr(memo, key, getattr(self, key))
+        if memo.extra:
+            memo.extra = dict(memo.extra)
+        return memo
+
+    def __repr__(self):
+        return f"Memo({dict(self.items())!r})"
+
+def as_memo(memo):
+    return memo if isinstance(memo, Memo) else Memo(memo)
+
+def memo_from_record(record, problems=None):
+    """把持久化的记录转为内存中的备忘录：时间字段解析为 datetime。
+
+    无法解析的时间不参与提醒和排序，原值移到 <字段>_invalid 中原样保存，problems 不为 None 时记录下来。
+    """
+    memo = Memo()
+    for key, value in record.items():
+        if key in TIME_FIELDS and value is not None and not isinstance(value, datetime):
+            if value == "":
+                continue
+            try:
+                value = parse_time(value)
+            except (TypeError, ValueError):
+                memo[f"{key}_invalid"] = value
+                if problems is not None:
+                    problems.append((record.get('title', '无标题'), key, value))
+                continue
+        memo[key] = value
+    return memo
+
+def memo_record(memo):
+    """持久化用的记录：时间字段转回 ISO 字符串，延迟加载的内容在这里读出"""
+    record = dict(memo)
+    for field in TIME_FIELDS:
+        value = record.get(field)
+        if isinstance(value, datetime):
+            record[field] = value.isoformat()
+    return record
+
+class MemoStore:
+    """备忘录存储：按 id 索引的有序字典，查找、更新和删除都是 O(1)。
+
+    每条备忘录在创建或从旧数据迁移时获得一个 uuid，对话框、提醒调度和持久化都通过 id 访问备忘录，
+    不再依赖列表下标。持久化格式仍是设置文件中的 memos 列表，每条多一个 id 字段。
+    内存中的创建时间和提醒时间是加载时解析一次的 datetime，只在 to_list 时转回 ISO 字符串；
+    无法解析的时间在加载时报告一次。备忘录以 Memo 对象保存，add 和 put 传入的字典会被转换。
+    """
+    def __init__(self, memos=None):
+        self.by_id = {}
+        self.migrated = False
+        problems = []
+        for record in memos or []:
+            memo = memo_from_record(record, problems)
+            if not memo.get('id') or memo['id'] in self.by_id:
+                memo['id'] = new_memo_id()
+                self.migrated = True
+            self.by_id[memo['id']] = memo
+        for title, field, value in problems:
+            print(f"备忘录「{title}」的{TIME_FIELD_NAMES[field]}无效，已忽略: {value!r}")
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __contains__(self, memo_id):
+        return memo_id in self.by_id
+
+    def get(self, memo_id):
+        return self.by_id.get(memo_id)
+
+    def add(self, memo):
+        memo = as_memo(memo)
+        if not memo.get('id') or memo['id'] in self.by_id:
+            memo['id'] = new_memo_id()
+        self.by_id[memo['id']] = memo
+        return memo['id']
+
+    def put(self, memo):
+        """新增或整体替换一条备忘录，已存在时保持原有顺序"""
+        memo = as_memo(memo)
+        self.by_id[memo['id']] = memo
+
+    def update(self, memo_id, **fields):
+        memo = self.by_id.get(memo_id)
+        if memo is None:
+            return None
+        memo.update(fields)
+        return memo
+
+    def delete(self, memo_id):
+        return self.by_id.pop(memo_id, None)
+
+    def to_list(self):
+        return [memo_record(memo) for memo in self.by_id.values()]
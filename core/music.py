@@ -1,5 +1,6 @@
 import numpy as np
 from PyQt6.QtCore import QTimer
+from core import startup
 
 try:
     import pyaudio
@@ -16,6 +17,7 @@ class AudioVisualizer:
         self.audio_data = []
         self.frequency_data = []
         self.max_frequencies = 64
+        self.spectrum_enabled = True
         self.CHUNK = 1024
         self.FORMAT = pyaudio.paFloat32 if AUDIO_AVAILABLE else None
         self.CHANNELS = 2
@@ -24,7 +26,8 @@ class AudioVisualizer:
         self.visual_timer.timeout.connect(self.update_visualization)
         self.visual_timer.start(33)
         if AUDIO_AVAILABLE:
-            self.init_audio()
+            with startup.phase("AudioVisualizer.init_audio"):
+                self.init_audio()
 
     def init_audio(self):
         try:
@@ -66,9 +69,21 @@ class AudioVisualizer:
             print(f"音频捕获初始化失败: {e}")
             self.is_running = False
 
+    def apply_profile(self, fps, band_count, spectrum_enabled):
+        self.max_frequencies = band_count
+        self.spectrum_enabled = spectrum_enabled
+        self.frequency_data = np.zeros(band_count)
+        if spectrum_enabled:
+            self.visual_timer.start(max(1, int(1000 / fps)))
+        else:
+            self.visual_timer.stop()
+            self.update_visualization()
+
     def audio_callback(self, in_data, frame_count, time_info, status):
         if self.is_running:
             try:
+                if not self.spectrum_enabled:
+                    return (in_data, pyaudio.paContinue)
                 audio_array = np.frombuffer(in_data, dtype=np.float32)
                 if len(audio_array) > 0:
                     self.update_frequency_data(audio_array)
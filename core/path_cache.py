@@ -0,0 +1,135 @@
+import os
+import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QFileSystemWatcher, pyqtSignal
+
+class PathInfo:
+    """一个原始路径的解析结果：绝对路径（找不到时为 None）、是否存在、mtime 和检查时间"""
+    __slots__ = ("raw", "path", "exists", "mtime", "checked_at")
+
+    def __init__(self, raw, path, exists, mtime, checked_at):
+        self.raw = raw
+        self.path = path
+        self.exists = exists
+        self.mtime = mtime
+        self.checked_at = checked_at
+
+    def same_as(self, other):
+        return other is not None and (self.path, self.exists, self.mtime) == (other.path, other.exists, other.mtime)
+
+def resolve_path(raw):
+    """把设置中的原始路径解析为绝对路径；不含目录的程序名按 PATH 查找"""
+    now = time.monotonic()
+    path = None
+    if raw:
+        expanded = os.path.expandvars(os.path.expanduser(raw))
+        if os.path.exists(expanded):
+            path = os.path.abspath(expanded)
+        elif not os.path.dirname(expanded):
+            path = shutil.which(expanded)
+    if path is None:
+        return PathInfo(raw, None, False, None, now)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return PathInfo(raw, None, False, None, now)
+    return PathInfo(raw, path, True, mtime, now)
+
+class PathCache(QObject):
+    """按原始路径缓存解析结果，供启动器、快速工具栏和设置对话框共享。
+
+    查询只读缓存；条目超过 ttl 秒或被 QFileSystemWatcher 报告变化后，在后台线程重新检查，
+    结果变化时发出 changed 信号。可以在任意线程调用 lookup。
+    """
+    changed = pyqtSignal(str)
+    _checked = pyqtSignal(object, bool)
+
+    def __init__(self, ttl=30, parent=None):
+        super().__init__(parent)
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.pending = set()
+        self.watched = {}
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="path-cache")
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_watched_changed)
+        self.watcher.directoryChanged.connect(self.on_watched_changed)
+        self._checked.connect(self.on_checked)
+
+    def lookup(self, raw):
+        """返回 PathInfo；首次查询同步解析，过期条目先返回旧结果并安排后台重新检查"""
+        with self.lock:
+            info = self.entries.get(raw)
+        if info is None:
+            info = resolve_path(raw)
+            with self.lock:
+                self.entries[raw] = info
+            self._checked.emit(info, False)
+        elif time.monotonic() - info.checked_at > self.ttl:
+            self.revalidate(raw)
+        return info
+
+    def exists(self, raw):
+        return self.lookup(raw).exists
+
+    def resolve(self, raw):
+        return self.lookup(raw).path
+
+    def invalidate(self, raw=None):
+        """丢弃缓存，下次查询时重新解析"""
+        with self.lock:
+            if raw is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(raw, None)
+
+    def revalidate(self, raw):
+        with self.lock:
+            if raw in self.pending:
+                return
+            self.pending.add(raw)
+        try:
+            self.executor.submit(self._revalidate, raw)
+        except RuntimeError:
+            with self.lock:
+                self.pending.discard(raw)
+
+    def _revalidate(self, raw):
+        info = resolve_path(raw)
+        with self.lock:
+            self.pending.discard(raw)
+            old = self.entries.get(raw)
+            self.entries[raw] = info
+        self._checked.emit(info, not info.same_as(old))
+
+    def watch_target(self, info):
+        """存在的文件直接监视；不存在时监视其所在目录，以便文件出现时得到通知"""
+        if info.exists:
+            return info.path
+        if not info.raw:
+            return None
+        parent = os.path.dirname(os.path.abspath(os.path.expanduser(info.raw)))
+        return parent if os.path.isdir(parent) else None
+
+    def on_checked(self, info, changed):
+        target = self.watch_target(info)
+        previous = self.watched.get(info.raw)
+        if target != previous:
+            self.watched[info.raw] = target
+            if previous and previous not in self.watched.values():
+                self.watcher.removePath(previous)
+            if target and target not in self.watcher.files() + self.watcher.directories():
+                self.watcher.addPath(target)
+        if changed:
+            self.changed.emit(info.raw)
+
+    def on_watched_changed(self, path):
+        for raw, target in list(self.watched.items()):
+            if target == path:
+                self.revalidate(raw)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
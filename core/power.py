@@ -0,0 +1,25 @@
+from core.settings import DEFAULT_SETTINGS
+
+FULL_PROFILE = "full"
+LOW_POWER_PROFILE = "low_power"
+
+PROFILE_NAMES = {
+    FULL_PROFILE: "完整性能",
+    LOW_POWER_PROFILE: "低功耗",
+}
+
+def get_profile(settings, name):
+    """返回合并了默认值的性能配置，用户设置中缺失的字段使用默认值"""
+    profile = dict(DEFAULT_SETTINGS["power_profiles"].get(name, DEFAULT_SETTINGS["power_profiles"][FULL_PROFILE]))
+    profile.update(settings.get("power_profiles", {}).get(name, {}))
+    return profile
+
+def select_profile(settings, battery_state):
+    """根据设置中的模式和电池状态选择性能配置名"""
+    mode = settings.get("power_profile_mode", "auto")
+    if mode in PROFILE_NAMES:
+        return mode
+    if battery_state is None:
+        return FULL_PROFILE
+    _, plugged = battery_state
+    return LOW_POWER_PROFILE if plugged is False else FULL_PROFILE
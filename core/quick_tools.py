@@ -0,0 +1,100 @@
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+
+TOOL_FIELDS = ("name", "icon", "path", "args")
+
+def new_tool_id():
+    return uuid.uuid4().hex[:12]
+
+def ensure_tool_ids(tools):
+    """给没有 id 或 id 重复的工具分配新 id，返回是否有修改"""
+    seen = set()
+    changed = False
+    for tool in tools:
+        if not tool.get("id") or tool["id"] in seen:
+            tool["id"] = new_tool_id()
+            changed = True
+        seen.add(tool["id"])
+    return changed
+
+def diff_tools(old_tools, new_tools):
+    """比较两份工具列表，返回 (新增, 删除, 内容变化) 的 id 列表；顺序变化由调用方按新列表逐位比较"""
+    old_by_id = {tool["id"]: tool for tool in old_tools}
+    new_ids = {tool["id"] for tool in new_tools}
+    added = [tool["id"] for tool in new_tools if tool["id"] not in old_by_id]
+    removed = [tool_id for tool_id in old_by_id if tool_id not in new_ids]
+    changed = [tool["id"] for tool in new_tools
+               if tool["id"] in old_by_id
+               and any(tool.get(field) != old_by_id[tool["id"]].get(field) for field in TOOL_FIELDS)]
+    return added, removed, changed
+
+IMAGE_ICON_EXTENSIONS = ('.ico', '.png', '.jpg', '.jpeg', '.svg')
+DESKTOP_FIELD_CODES = ("%f", "%F", "%u", "%U", "%i", "%c", "%k", "%d", "%D", "%n", "%N", "%v", "%m")
+
+def split_desktop_exec(command):
+    """拆分 .desktop 文件的 Exec 命令并去掉 %f、%U 等占位符"""
+    import shlex
+    try:
+        parts = shlex.split(command)
+    except ValueError:
+        parts = command.split()
+    return [part for part in parts if part not in DESKTOP_FIELD_CODES]
+
+def describe_target(target, path_cache):
+    """把拖放的文件、目录、.desktop 文件或网址解析为工具定义，无法使用时返回 None；在工作线程中调用"""
+    from urllib.parse import urlparse
+    if target.startswith(("http://", "https://")):
+        host = urlparse(target).netloc
+        return {"id": new_tool_id(), "name": host or target, "icon": "🌐", "path": target}
+    info = path_cache.lookup(target)
+    if not info.exists:
+        return None
+    path = info.path
+    base = os.path.basename(path.rstrip("/\\")) or path
+    if os.path.isdir(path):
+        return {"id": new_tool_id(), "name": base, "icon": "📁", "path": path}
+    if path.lower().endswith(".desktop"):
+        from core.icon_cache import find_theme_icon, read_desktop_entry
+        entry = read_desktop_entry(path)
+        argv = split_desktop_exec(entry.get("Exec", ""))
+        program = path_cache.resolve(argv[0]) if argv else None
+        if program is None:
+            return None
+        tool = {"id": new_tool_id(), "name": entry.get("Name") or base, "icon": find_theme_icon(entry.get("Icon")) or "🔧", "path": program}
+        if argv[1:]:
+            tool["args"] = argv[1:]
+        return tool
+    name, ext = os.path.splitext(base)
+    if ext.lower() in (".exe", ".lnk", ".bat", ".cmd", ".appimage") or os.access(path, os.X_OK):
+        return {"id": new_tool_id(), "name": name or base, "icon": "🔧", "path": path}
+    icon = path if ext.lower() in IMAGE_ICON_EXTENSIONS else "📄"
+    return {"id": new_tool_id(), "name": base, "icon": icon, "path": path}
+
+class DropResolver(QObject):
+    """在工作线程中把一次拖放的所有目标解析为工具定义，完成后一次性发出 resolved(list)"""
+    resolved = pyqtSignal(list)
+
+    def __init__(self, path_cache, parent=None):
+        super().__init__(parent)
+        self.path_cache = path_cache
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="drop-resolver")
+
+    def resolve(self, targets):
+        self.executor.submit(self._resolve, list(targets))
+
+    def _resolve(self, targets):
+        tools = []
+        for target in targets:
+            try:
+                tool = describe_target(target, self.path_cache)
+            except Exception as e:
+                print(f"解析拖放目标失败 {target}: {e}")
+                tool = None
+            if tool is not None:
+                tools.append(tool)
+        self.resolved.emit(tools)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
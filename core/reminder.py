@@ -1,7 +1,5 @@
 from PyQt6.QtCore import QTimer, QObject
 from datetime import datetime, timedelta
-from ui.dialogs import ReminderDialog
-from core.settings import load_settings, save_settings
 
 class ReminderManager(QObject):
     def __init__(self, parent=None):
@@ -12,43 +10,40 @@ class ReminderManager(QObject):
         self.reminder_timer.start(30000)
         print("提醒管理器已初始化，每30秒检查一次提醒")
     def check_reminders(self):
-        if not hasattr(self.parent, 'settings'):
-            print("警告：父窗口没有settings属性")
+        """提醒时间在加载时已解析为 datetime，每次检查只做比较，不再解析字符串或逐条打印"""
+        if not hasattr(self.parent, 'memo_store'):
+            print("警告：父窗口没有memo_store属性")
             return
-        self.parent.settings = load_settings()
         settings = self.parent.settings
-        memos = settings.get('memos', [])
+        memos = self.parent.memo_store
         reminder_settings = settings.get('reminder_settings', {})
         advance_minutes = reminder_settings.get('advance_minutes', 5)
         current_time = datetime.now()
         advance_time = current_time + timedelta(minutes=advance_minutes)
-        print(f"检查提醒 - 当前时间: {current_time.strftime('%H:%M:%S')}, 备忘录数量: {len(memos)}")
+        changed_ids = []
         settings_changed = False
-        for i, memo in enumerate(memos):
-            reminder_time = memo.get('reminder_time')
-            if not reminder_time:
+        # 弹窗在嵌套事件循环中运行，期间备忘录可能被修改，遍历快照
+        for memo in list(memos):
+            reminder_dt = memo.get('reminder_time')
+            if not reminder_dt:
                 continue
-            try:
-                reminder_dt = datetime.fromisoformat(reminder_time)
-                print(f"备忘录 {i+1}: {memo.get('title', '无标题')} - 提醒时间: {reminder_dt.strftime('%H:%M:%S')}")
-                print(f"时间比较: 当前={current_time}, 提醒={reminder_dt}, 提前={advance_time}")
-                print(f"是否到了提醒时间: {current_time >= reminder_dt}")
-                print(f"是否需要提前提醒: {advance_time >= reminder_dt and not memo.get('advance_shown')}")
-                print(f"是否已经提醒过: {memo.get('reminder_shown', False)}")
-                if current_time >= reminder_dt and not memo.get('reminder_shown', False):
-                    print(f"触发正式提醒: {memo.get('title', '无标题')}")
-                    self.show_reminder(memo)
-                    memo['reminder_shown'] = True
-                    settings_changed = True
-                elif advance_time >= reminder_dt and not memo.get('advance_shown'):
-                    print(f"触发提前提醒: {memo.get('title', '无标题')}")
-                    self.show_advance_reminder(memo, advance_minutes)
-                    memo['advance_shown'] = True
-                    settings_changed = True
-            except Exception as e:
-                print(f"处理提醒时间失败: {e}")
+            if current_time >= reminder_dt and not memo.get('reminder_shown', False):
+                print(f"触发正式提醒: {memo.get('title', '无标题')}")
+                self.show_reminder(memo)
+                if memo.get('reminder_time') != reminder_dt:
+                    # 稍后提醒：提醒时间已推迟，等到新时间再正式提醒
+                    memos.update(memo['id'], reminder_shown=False, advance_shown=True)
+                    changed_ids.append(memo['id'])
+                else:
+                    memos.update(memo['id'], reminder_shown=True)
+                settings_changed = True
+            elif advance_time >= reminder_dt and not memo.get('advance_shown'):
+                print(f"触发提前提醒: {memo.get('title', '无标题')}")
+                self.show_advance_reminder(memo, advance_minutes)
+                memos.update(memo['id'], advance_shown=True)
+                settings_changed = True
         if settings_changed:
-            save_settings(settings)
+            self.parent.save_memos(changed_ids)
     def show_reminder(self, memo):
         if not hasattr(self.parent, 'settings'):
             return
@@ -56,6 +51,7 @@ class ReminderManager(QObject):
         reminder_settings = settings.get('reminder_settings', {})
         print(f"显示提醒对话框: {memo.get('title', '无标题')}")
         if reminder_settings.get('enable_popup', True):
+            from ui.dialogs import ReminderDialog
             dialog = ReminderDialog(memo, self.parent)
             dialog.exec()
         if reminder_settings.get('enable_sound', True):
@@ -0,0 +1,79 @@
+from urllib.parse import quote_plus
+
+QUERY_PLACEHOLDER = "{query}"
+
+# kind 为 "url" 的引擎按模板打开浏览器，"everything" 使用 Everything 或内置文件索引
+DEFAULT_SEARCH_ENGINES = [
+    {"key": "everything", "name": "Everything", "icon": "🔍", "kind": "everything", "bangs": ["e", "ev", "f"]},
+    {"key": "bing", "name": "Bing", "icon": "🌐", "url": "https://www.bing.com/search?q={query}", "bangs": ["b", "bing"]},
+    {"key": "chatgpt", "name": "ChatGPT", "icon": "🤖", "url": "https://chat.openai.com/?q={query}", "bangs": ["gpt", "ai"]},
+    {"key": "bilibili", "name": "Bilibili", "icon": "📺", "url": "https://search.bilibili.com/all?keyword={query}", "bangs": ["bili", "bl"]},
+    {"key": "github", "name": "GitHub", "icon": "🐙", "url": "https://github.com/search?q={query}", "bangs": ["gh"]},
+]
+
+class SearchEngine:
+    """一个搜索引擎定义，URL 模板在构造时预先拆分，生成链接时只做一次编码和拼接"""
+    __slots__ = ("key", "name", "icon", "kind", "bangs", "url_prefix", "url_suffix")
+
+    def __init__(self, key, name, icon="🔎", url=None, kind=None, bangs=None):
+        self.key = key
+        self.name = name
+        self.icon = icon
+        self.kind = kind or "url"
+        self.bangs = list(bangs or [])
+        self.url_prefix = self.url_suffix = ""
+        if self.kind == "url":
+            if not url or QUERY_PLACEHOLDER not in url:
+                raise ValueError(f"搜索引擎 {key} 的 URL 模板缺少 {QUERY_PLACEHOLDER}")
+            self.url_prefix, self.url_suffix = url.split(QUERY_PLACEHOLDER, 1)
+
+    def url(self, query):
+        return f"{self.url_prefix}{quote_plus(query)}{self.url_suffix}"
+
+class SearchEngineRegistry:
+    """从设置加载的搜索引擎表，以及 !前缀 到引擎的映射"""
+    def __init__(self, definitions):
+        self.engines = {}
+        self.bang_map = {}
+        for definition in definitions:
+            try:
+                engine = SearchEngine(
+                    definition["key"],
+                    definition.get("name", definition["key"]),
+                    definition.get("icon", "🔎"),
+                    definition.get("url"),
+                    definition.get("kind"),
+                    definition.get("bangs"),
+                )
+            except (KeyError, ValueError) as e:
+                print(f"忽略无效的搜索引擎配置: {e}")
+                continue
+            self.engines[engine.key] = engine
+            for bang in engine.bangs:
+                self.bang_map.setdefault(bang.lower(), engine.key)
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings.get("search_engines") or DEFAULT_SEARCH_ENGINES)
+
+    def __contains__(self, key):
+        return key in self.engines
+
+    def __getitem__(self, key):
+        return self.engines[key]
+
+    def keys(self):
+        return self.engines.keys()
+
+    def items(self):
+        return self.engines.items()
+
+    def resolve(self, text):
+        """解析 "!b 查询" 形式的前缀，返回 (引擎 key 或 None, 去掉前缀后的查询)"""
+        if not text.startswith("!"):
+            return None, text
+        bang, _, rest = text[1:].partition(" ")
+        engine_key = self.bang_map.get(bang.lower())
+        if engine_key is None:
+            return None, text
+        return engine_key, rest.strip()
@@ -0,0 +1,99 @@
+import math
+import time
+
+HALF_LIFE_SECONDS = 7 * 24 * 3600
+DECAY_RATE = math.log(2) / HALF_LIFE_SECONDS
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+class SearchHistory:
+    """按 frecency（使用次数随时间指数衰减）排序的搜索历史。
+
+    每条记录保存 key = ln(衰减后的分数) + 时间 * 衰减率，这样不同时间记录的分数可以直接比较，无需随时间重算。
+    前缀树的每个节点缓存该前缀下得分最高的若干条查询，补全只需沿前缀走一遍，复杂度为 O(前缀长度)。
+    """
+    def __init__(self, max_entries=500, top_per_node=8):
+        self.max_entries = max_entries
+        self.top_per_node = top_per_node
+        self.entries = {}
+        self.root = _TrieNode()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record(self, query, engine, now=None):
+        query = query.strip()
+        if not query:
+            return
+        now = time.time() if now is None else now
+        key = query.lower()
+        entry = self.entries.get(key)
+        offset = now * DECAY_RATE
+        if entry is None:
+            entry = self.entries[key] = {"query": query, "engine": engine, "score": offset, "count": 0}
+        else:
+            entry["score"] = offset + math.log(math.exp(entry["score"] - offset) + 1)
+        entry.update(query=query, engine=engine, count=entry["count"] + 1, last_used=now)
+        if len(self.entries) > self.max_entries:
+            self.evict()
+        else:
+            self._update_path(key, entry["score"])
+
+    def _update_path(self, key, score):
+        node = self.root
+        self._update_top(node, key, score)
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            self._update_top(node, key, score)
+
+    def _update_top(self, node, key, score):
+        top = [item for item in node.top if item[1] != key]
+        top.append((score, key))
+        top.sort(reverse=True)
+        node.top = top[:self.top_per_node]
+
+    def evict(self):
+        """超出容量时丢弃得分最低的记录，保留 90% 后重建前缀树"""
+        keep = sorted(self.entries.values(), key=lambda e: e["score"], reverse=True)[:int(self.max_entries * 0.9)]
+        self.entries = {entry["query"].lower(): entry for entry in keep}
+        self.rebuild()
+
+    def rebuild(self):
+        self.root = _TrieNode()
+        for key, entry in self.entries.items():
+            self._update_path(key, entry["score"])
+
+    def complete(self, prefix, limit=5):
+        node = self.root
+        for char in prefix.lower():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self.entries[key]["query"] for _, key in node.top[:limit]]
+
+    def engine_for(self, query):
+        entry = self.entries.get(query.strip().lower())
+        return entry["engine"] if entry else None
+
+    def to_list(self):
+        return [[e["query"], e["engine"], round(e["score"], 6), e["count"]] for e in self.entries.values()]
+
+    @classmethod
+    def from_list(cls, items, max_entries=500):
+        history = cls(max_entries=max_entries)
+        for item in items:
+            try:
+                query, engine, score, count = item
+            except (TypeError, ValueError):
+                continue
+            history.entries[query.lower()] = {"query": query, "engine": engine, "score": float(score), "count": int(count)}
+        if len(history.entries) > max_entries:
+            history.evict()
+        else:
+            history.rebuild()
+        return history
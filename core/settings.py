@@ -1,5 +1,7 @@
 import json
 import os
+from PyQt6.QtCore import QObject, QTimer
+from core.search_engines import DEFAULT_SEARCH_ENGINES
 
 SETTINGS_FILE = "./wallpaper_settings.json"
 
@@ -15,15 +17,26 @@ DEFAULT_SETTINGS = {
     },
     "autostart": False,
     "default_search_engine": "everything",
+    "search_engines": DEFAULT_SEARCH_ENGINES,
     "quick_tools": [
         {"name": "VS Code", "path": "C:\\Program Files\\Microsoft VS Code\\Code.exe", "icon": "./icon.ico"},
         {"name": "Terminal", "path": "C:\\Windows\\System32\\cmd.exe", "icon": "./icon.ico"},
         {"name": "计算器", "path": "C:\\Windows\\System32\\calc.exe", "icon": "./icon.ico"},
         {"name": "记事本", "path": "C:\\Windows\\System32\\notepad.exe", "icon": "./icon.ico"}
     ],
+    "quick_tools_sort": "manual",
     "notes": "",
     "initial_position": {"x": None, "y": None},
     "memos": [],
+    "undo": {
+        "memory_kb": 1024,
+        "log_entries": 500
+    },
+    "agenda_days": 7,
+    "memo_archive": {
+        "enable": True,
+        "after_days": 30
+    },
     "reminder_settings": {
         "advance_minutes": 5,
         "enable_sound": True,
@@ -34,6 +47,38 @@ DEFAULT_SETTINGS = {
         "waveform_color": {"r": 0, "g": 191, "b": 255, "a": 180},
         "waveform_speed": 0.8,
         "waveform_sensitivity": 1.0
+    },
+    "system_monitor": {
+        "enable": True,
+        "interval": 1.0,
+        "history_length": 60
+    },
+    "file_index": {
+        "enable": True,
+        "roots": [],
+        "excludes": [".git", ".svn", "node_modules", "__pycache__", "$RECYCLE.BIN", "System Volume Information"],
+        "rescan_minutes": 10
+    },
+    "power_profile_mode": "auto",
+    "power_profiles": {
+        "full": {
+            "visualizer_fps": 30,
+            "band_count": 64,
+            "spectrum_enabled": True,
+            "clock_seconds": True,
+            "monitor_interval": None,
+            "battery_interval": 1.0,
+            "settings_write_delay_ms": 0
+        },
+        "low_power": {
+            "visualizer_fps": 10,
+            "band_count": 24,
+            "spectrum_enabled": False,
+            "clock_seconds": True,
+            "monitor_interval": 5.0,
+            "battery_interval": 10.0,
+            "settings_write_delay_ms": 10000
+        }
     }
 }
 
@@ -56,4 +101,31 @@ def load_settings():
         return DEFAULT_SETTINGS
     except Exception as e:
         print(f"加载设置失败: {e}")
-        return DEFAULT_SETTINGS 
\ No newline at end of file
+        return DEFAULT_SETTINGS
+
+class SettingsWriter(QObject):
+    """合并非紧急的设置写入，在延迟到期后只写一次磁盘"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.delay_ms = 0
+        self.pending = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    def set_delay(self, delay_ms):
+        self.delay_ms = delay_ms
+        if self.pending is not None:
+            self.timer.start(self.delay_ms)
+
+    def request_save(self, settings):
+        self.pending = settings
+        if not self.timer.isActive():
+            self.timer.start(self.delay_ms)
+
+    def flush(self):
+        self.timer.stop()
+        if self.pending is not None:
+            settings = self.pending
+            self.pending = None
+            save_settings(settings)
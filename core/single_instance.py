@@ -0,0 +1,80 @@
+import getpass
+import json
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+def server_name():
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "default"
+    return f"eve_desktop_{user}"
+
+def instance_alive(name, timeout_ms=100):
+    socket = QLocalSocket()
+    socket.connectToServer(name)
+    alive = socket.waitForConnected(timeout_ms)
+    socket.abort()
+    return alive
+
+def forward_to_running_instance(command, timeout_ms=200):
+    """尝试把命令发给已运行的实例，成功返回 True；没有实例在运行时返回 False"""
+    socket = QLocalSocket()
+    socket.connectToServer(server_name())
+    if not socket.waitForConnected(timeout_ms):
+        return False
+    socket.write(json.dumps(command, ensure_ascii=False).encode('utf-8') + b"\n")
+    socket.flush()
+    socket.waitForBytesWritten(timeout_ms)
+    socket.disconnectFromServer()
+    return True
+
+class InstanceServer(QObject):
+    """监听后续启动的实例转发过来的命令"""
+    command_received = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self.accept_connections)
+        self.buffers = {}
+
+    def listen(self):
+        name = server_name()
+        if not self.server.listen(name):
+            if instance_alive(name):
+                print("已有实例在运行，单实例服务未启动")
+                return False
+            # 上次异常退出可能留下了失效的套接字文件
+            QLocalServer.removeServer(name)
+            if not self.server.listen(name):
+                print(f"单实例服务启动失败: {self.server.errorString()}")
+                return False
+        return True
+
+    def accept_connections(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self.read_socket(s))
+            socket.disconnected.connect(lambda s=socket: self.close_socket(s))
+
+    def read_socket(self, socket):
+        self.buffers[socket] = self.buffers.get(socket, b"") + bytes(socket.readAll())
+        while b"\n" in self.buffers[socket]:
+            line, self.buffers[socket] = self.buffers[socket].split(b"\n", 1)
+            try:
+                command = json.loads(line.decode('utf-8'))
+            except ValueError as e:
+                print(f"无法解析转发的命令: {e}")
+                continue
+            if isinstance(command, dict):
+                self.command_received.emit(command)
+
+    def close_socket(self, socket):
+        self.read_socket(socket)
+        self.buffers.pop(socket, None)
+        socket.deleteLater()
+
+    def close(self):
+        self.server.close()
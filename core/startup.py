@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# 尽可能早地被 main.py 导入，作为进程启动时间的近似
+PROCESS_START = time.perf_counter()
+
+ENABLED = any(flag in sys.argv for flag in ("--startup-profile", "--profile")) or bool(os.environ.get("EVE_STARTUP_PROFILE"))
+
+# (阶段名, 距进程启动的开始时间 ms, 耗时 ms)，耗时为 None 的是时间点标记
+PHASES = []
+
+def elapsed_ms():
+    return (time.perf_counter() - PROCESS_START) * 1000
+
+def mark(name):
+    """启动分析开启时记录并打印从进程启动到当前阶段的耗时"""
+    if ENABLED:
+        PHASES.append((name, elapsed_ms(), None))
+        print(f"[startup] {name}: {elapsed_ms():.1f} ms")
+
+@contextmanager
+def phase(name):
+    """记录一个阶段的开始时间和耗时"""
+    if not ENABLED:
+        yield
+        return
+    start = elapsed_ms()
+    try:
+        yield
+    finally:
+        duration = elapsed_ms() - start
+        PHASES.append((name, start, duration))
+        print(f"[startup] {name}: {duration:.1f} ms (at {start + duration:.1f} ms)")
+
+def format_phases():
+    lines = [f"{'phase':<32}{'start(ms)':>12}{'duration(ms)':>14}"]
+    for name, start, duration in PHASES:
+        duration_str = f"{duration:.1f}" if duration is not None else "-"
+        lines.append(f"{name:<32}{start:>12.1f}{duration_str:>14}")
+    return "\n".join(lines)
+
+class ProfileSession:
+    """--profile 模式：可选地运行 cProfile 或 tracemalloc，结束后把报告写到设置文件所在目录"""
+    def __init__(self, mode, seconds, output_dir):
+        self.mode = mode
+        self.seconds = seconds
+        self.output_dir = output_dir
+        self.profiler = None
+        self.started_at = None
+
+    def start(self):
+        self.started_at = elapsed_ms()
+        if self.mode == "cprofile":
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif self.mode == "tracemalloc":
+            import tracemalloc
+            tracemalloc.start(25)
+
+    def finish(self):
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(self.output_dir, f"eve_profile_{stamp}")
+        sections = [
+            f"eve desktop profile - {datetime.now().isoformat(timespec='seconds')}",
+            f"mode: {self.mode}, window: {self.seconds}s",
+            "",
+            format_phases(),
+        ]
+        if self.mode == "cprofile" and self.profiler:
+            import io
+            import pstats
+            self.profiler.disable()
+            self.profiler.dump_stats(base + ".prof")
+            stream = io.StringIO()
+            pstats.Stats(self.profiler, stream=stream).sort_stats("cumulative").print_stats(40)
+            sections += ["", "cProfile (main thread, top 40 by cumulative time):", stream.getvalue()]
+        elif self.mode == "tracemalloc":
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            sections += ["", f"tracemalloc: current={current / 1024:.1f} KiB, peak={peak / 1024:.1f} KiB", "top 30 by line:"]
+            sections += [str(stat) for stat in snapshot.statistics("lineno")[:30]]
+        try:
+            with open(base + ".txt", 'w', encoding='utf-8') as f:
+                f.write("\n".join(sections) + "\n")
+            print(f"性能分析报告已写入: {base}.txt")
+        except Exception as e:
+            print(f"写入性能分析报告失败: {e}")
@@ -0,0 +1,182 @@
+import os
+import sys
+import threading
+import time
+import psutil
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+
+POWER_SUPPLY_DIR = "/sys/class/power_supply"
+
+def _read_sysfs(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def read_battery_sysfs():
+    """直接读取 Linux 的 /sys/class/power_supply，返回 (电量, 是否接通电源) 或 None"""
+    try:
+        entries = os.listdir(POWER_SUPPLY_DIR)
+    except OSError:
+        return None
+    percent = None
+    plugged = None
+    for name in sorted(entries):
+        base = os.path.join(POWER_SUPPLY_DIR, name)
+        supply_type = _read_sysfs(os.path.join(base, "type"))
+        if supply_type == "Battery" and percent is None:
+            capacity = _read_sysfs(os.path.join(base, "capacity"))
+            if capacity is None or not capacity.isdigit():
+                continue
+            percent = int(capacity)
+            status = _read_sysfs(os.path.join(base, "status"))
+            if status in ("Charging", "Full", "Not charging"):
+                plugged = True
+        elif supply_type == "Mains":
+            online = _read_sysfs(os.path.join(base, "online"))
+            if online == "1":
+                plugged = True
+            elif online == "0" and plugged is None:
+                plugged = False
+    if percent is None:
+        return None
+    return (percent, bool(plugged))
+
+def read_battery():
+    """读取电池状态，返回 (电量, 是否接通电源) 或 None"""
+    if sys.platform.startswith("linux"):
+        state = read_battery_sysfs()
+        if state is not None:
+            return state
+    try:
+        battery = psutil.sensors_battery()
+    except Exception as e:
+        print(f"读取电池状态失败: {e}")
+        return None
+    if battery is None:
+        return None
+    return (battery.percent, battery.power_plugged)
+
+class BatterySampler(QThread):
+    """后台采样电池状态，只在数值变化时发出信号；状态稳定时逐步拉长采样间隔"""
+    battery_changed = pyqtSignal(object)
+
+    def __init__(self, min_interval=1.0, max_interval=30.0, parent=None):
+        super().__init__(parent)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+    def set_interval(self, min_interval, max_interval=None):
+        self.min_interval = min_interval
+        if max_interval is not None:
+            self.max_interval = max_interval
+        self._wake_event.set()
+
+    def run(self):
+        last_state = object()
+        interval = self.min_interval
+        while not self._stop_event.is_set():
+            state = read_battery()
+            if state != last_state:
+                last_state = state
+                self.battery_changed.emit(state)
+                interval = self.min_interval
+            else:
+                interval = min(interval * 2, self.max_interval)
+            if self._wake_event.wait(interval):
+                self._wake_event.clear()
+                interval = self.min_interval
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        self.wait(2000)
+
+class RingBuffer:
+    """定长 NumPy 环形缓冲区，写入在采样线程，读取在 UI 线程"""
+    def __init__(self, capacity, width=None):
+        self.capacity = capacity
+        shape = (capacity,) if width is None else (capacity, width)
+        self.data = np.zeros(shape, dtype=np.float32)
+        self.index = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def append(self, value):
+        with self.lock:
+            self.data[self.index] = value
+            self.index = (self.index + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def latest(self):
+        with self.lock:
+            if self.count == 0:
+                return None
+            return self.data[(self.index - 1) % self.capacity].copy()
+
+    def values(self):
+        """按时间顺序返回已写入的数据副本"""
+        with self.lock:
+            if self.count < self.capacity:
+                return self.data[:self.count].copy()
+            return np.concatenate((self.data[self.index:], self.data[:self.index]))
+
+    def max(self):
+        with self.lock:
+            if self.count == 0:
+                return 0.0
+            return float(self.data[:self.count].max())
+
+class ResourceMonitor(QThread):
+    """后台采样 CPU、各核心负载、内存、磁盘和网络吞吐，写入环形缓冲区后发出 sampled 信号"""
+    sampled = pyqtSignal()
+
+    def __init__(self, interval=1.0, history_length=60, parent=None):
+        super().__init__(parent)
+        self.interval = interval
+        self.history_length = history_length
+        self.core_count = psutil.cpu_count() or 1
+        self.cpu = RingBuffer(history_length)
+        self.per_core = RingBuffer(history_length, self.core_count)
+        self.memory = RingBuffer(history_length)
+        self.disk = RingBuffer(history_length)
+        self.network = RingBuffer(history_length)
+        self._stop_event = threading.Event()
+
+    def set_interval(self, interval):
+        self.interval = interval
+
+    def _io_totals(self):
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        disk_total = (disk.read_bytes + disk.write_bytes) if disk else 0
+        net_total = (net.bytes_recv + net.bytes_sent) if net else 0
+        return disk_total, net_total
+
+    def run(self):
+        psutil.cpu_percent(percpu=True)
+        last_disk, last_net = self._io_totals()
+        last_time = time.monotonic()
+        while not self._stop_event.wait(self.interval):
+            try:
+                per_core = psutil.cpu_percent(percpu=True)
+                disk_total, net_total = self._io_totals()
+                now = time.monotonic()
+                elapsed = max(now - last_time, 1e-3)
+                self.per_core.append(per_core[:self.core_count])
+                self.cpu.append(sum(per_core) / len(per_core))
+                self.memory.append(psutil.virtual_memory().percent)
+                self.disk.append(max(disk_total - last_disk, 0) / elapsed)
+                self.network.append(max(net_total - last_net, 0) / elapsed)
+                last_disk, last_net, last_time = disk_total, net_total, now
+                self.sampled.emit()
+            except Exception as e:
+                print(f"系统资源采样失败: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+        self.wait(2000)
@@ -0,0 +1,463 @@
+import os
+import re
+import math
+import heapq
+import pickle
+import bisect
+import threading
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+INDEX_VERSION = 1
+TITLE_WEIGHT = 3
+NOTES_PREFIX = "notes:"
+MAX_PREFIX_EXPANSION = 200
+# 最短一组倒排表不超过这个长度时直接为其中每个文档计算得分，否则按权重从高到低取匹配的文档，多个查询词时按词数分摊
+MAX_SCORED = 1000
+
+CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+TOKEN_PATTERN = re.compile(rf"([{CJK}]+)|([^\W{CJK}]+)")
+CJK_CHAR = re.compile(rf"[{CJK}]")
+
+def cjk_terms(run):
+    """中日韩文字同时按单字和相邻两字切分，单字查询也能命中"""
+    return list(run) + [run[i:i + 2] for i in range(len(run) - 1)]
+
+def tokenize(text):
+    """中日韩文字按单字和相邻两字切分，其他文字按单词切分，全部转为小写"""
+    tokens = []
+    for cjk, word in TOKEN_PATTERN.findall(text.lower()):
+        if word:
+            tokens.append(word)
+        else:
+            tokens.extend(cjk_terms(cjk))
+    return tokens
+
+def query_terms(text):
+    """查询词列表 [(词, 是否前缀匹配)]；中日韩文字按相邻两字查询，最后一个未输入完的单词按前缀匹配"""
+    matches = TOKEN_PATTERN.findall(text.lower())
+    terms = []
+    for position, (cjk, word) in enumerate(matches):
+        if word:
+            typing = position == len(matches) - 1 and not text[-1:].isspace()
+            terms.append((word, typing))
+        elif len(cjk) == 1:
+            terms.append((cjk, False))
+        else:
+            terms.extend((cjk[i:i + 2], False) for i in range(len(cjk) - 1))
+    return terms
+
+def query_matcher(query):
+    """返回判断一段文本是否包含全部查询词的函数，规则与索引查询相同；没有查询词时返回 None。
+
+    不需要对文本分词：中日韩单字和两字词只要在文本中出现就一定是一个词，
+    单词则要求前后不是同类字符（前缀匹配时只要求前面），用一个正则表达式检查。
+    """
+    terms = query_terms(query)
+    if not terms:
+        return None
+    substrings = [term for term, _ in terms if CJK_CHAR.match(term)]
+    patterns = [rf"(?<![^\W{CJK}]){re.escape(term)}" + ("" if prefix else rf"(?![^\W{CJK}])")
+                for term, prefix in terms if not CJK_CHAR.match(term)]
+    words = [re.compile(pattern) for pattern in patterns]
+    def matches(text):
+        text = text.lower()
+        return all(term in text for term in substrings) and all(word.search(text) for word in words)
+    matches.terms = [term for term, _ in terms]
+    return matches
+
+def memo_matches(memo, query):
+    """与索引查询相同的匹配规则，用于尚未进入索引的备忘录"""
+    matcher = query_matcher(query)
+    return matcher is not None and matcher(memo.get('title', '') + "\n" + memo.get('content', ''))
+
+def fingerprint(*parts):
+    return zlib.crc32("\x00".join(parts).encode('utf-8'))
+
+def posting_docs(postings):
+    if len(postings) == 1:
+        return set(postings[0][0])
+    return set().union(*(nums for nums, _ in postings))
+
+def posting_weight(postings, num):
+    best = 0
+    for nums, weights in postings:
+        pos = bisect.bisect_left(nums, num)
+        if pos < len(nums) and nums[pos] == num and weights[pos] > best:
+            best = weights[pos]
+    return best
+
+def ranked_docs(postings):
+    """按权重从高到低产出 (权重, 文档编号)。
+
+    每个权重只用 array.index 在 C 中扫描一遍倒排表，高权重的文档很少，取前几十个通常只需扫描几遍；
+    多个倒排表时同一文档可能出现多次，第一次出现时的权重最高。
+    """
+    levels = set()
+    for _, weights in postings:
+        levels.update(weights)
+    for weight in sorted(levels, reverse=True):
+        for nums, weights in postings:
+            pos = -1
+            while True:
+                try:
+                    pos = weights.index(weight, pos + 1)
+                except ValueError:
+                    break
+                yield weight, nums[pos]
+
+class TextIndex:
+    """备忘录标题、内容和快速笔记的倒排索引。
+
+    每个文档分配一个递增的整数编号，倒排表 postings 把每个词映射到 (编号 array('I'), 权重 array('H'))，
+    编号按添加顺序递增，其余各组用二分查找确认文档是否出现。最短一组较短时直接为其中每个文档计算得分；
+    常用词则按权重从高到低取文档，能确定前 limit 名时立即停止，最多计算 MAX_SCORED / 查询词数 个匹配文档的得分，
+    因此查询耗时与倒排表长度基本无关；单个查询词时结果精确，多个常用词时只在权重最高的一部分文档中排序。
+    文档修改或删除时只把旧编号标记为失效（alive 和 dead），失效编号过多时整体压缩。notes_nums 是快速笔记的编号，
+    只查快速笔记时直接为这些文档计算得分。fingerprints 保存每个文档内容的 crc32，加载磁盘缓存后只重新索引内容变化的文档。
+    保存时在锁内复制一份状态，倒排表在保存期间被修改时先复制再修改，序列化和写文件不持有锁。
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.postings = {}
+        self.doc_ids = []
+        self.alive = bytearray()
+        self.doc_nums = {}
+        self.fingerprints = {}
+        self.dead_count = 0
+        self.vocabulary = None
+        self.dead = set()
+        self.notes_nums = set()
+        self.saving_postings = None
+
+    def __len__(self):
+        return len(self.doc_nums)
+
+    def remove(self, doc_id):
+        with self.lock:
+            num = self.doc_nums.pop(doc_id, None)
+            self.fingerprints.pop(doc_id, None)
+            if num is not None:
+                self.alive[num] = 0
+                self.dead.add(num)
+                self.dead_count += 1
+
+    def add(self, doc_id, title, content=""):
+        """索引一个文档，内容没有变化时直接返回 False"""
+        digest = fingerprint(title, content)
+        with self.lock:
+            if self.fingerprints.get(doc_id) == digest:
+                return False
+            self.remove(doc_id)
+            weights = {}
+            for term in tokenize(title):
+                weights[term] = weights.get(term, 0) + TITLE_WEIGHT
+            for term in tokenize(content):
+                weights[term] = weights.get(term, 0) + 1
+            num = len(self.doc_ids)
+            self.doc_ids.append(doc_id)
+            self.alive.append(1)
+            self.doc_nums[doc_id] = num
+            self.fingerprints[doc_id] = digest
+            if doc_id.startswith(NOTES_PREFIX):
+                self.notes_nums.add(num)
+            saving = self.saving_postings
+            for term, weight in weights.items():
+                posting = self.postings.get(term)
+                if posting is None:
+                    posting = self.postings[term] = (array('I'), array('H'))
+                    self.vocabulary = None
+                elif saving is not None and saving.get(term) is posting:
+                    # 正在保存的快照引用着这个倒排表
+                    posting = self.postings[term] = (array('I', posting[0]), array('H', posting[1]))
+                posting[0].append(num)
+                posting[1].append(min(weight, 0xFFFF))
+            return True
+
+    def add_memo(self, memo):
+        return self.add(memo['id'], memo.get('title', ''), memo.get('content', ''))
+
+    def needs_compact(self):
+        return self.dead_count > 1000 and self.dead_count * 3 > len(self.doc_ids)
+
+    def compact(self):
+        """去掉失效编号并重新编号，倒排表中只保留仍然有效的文档"""
+        with self.lock:
+            remap = array('I', bytes(4 * len(self.doc_ids)))
+            doc_ids = []
+            for num, doc_id in enumerate(self.doc_ids):
+                if self.alive[num]:
+                    remap[num] = len(doc_ids)
+                    doc_ids.append(doc_id)
+            postings = {}
+            for term, (nums, weights) in self.postings.items():
+                new_nums, new_weights = array('I'), array('H')
+                for num, weight in zip(nums, weights):
+                    if self.alive[num]:
+                        new_nums.append(remap[num])
+                        new_weights.append(weight)
+                if new_nums:
+                    postings[term] = (new_nums, new_weights)
+            self.postings = postings
+            self.doc_ids = doc_ids
+            self.alive = bytearray(b"\x01") * len(doc_ids)
+            self.doc_nums = {doc_id: num for num, doc_id in enumerate(doc_ids)}
+            self.dead_count = 0
+            self.vocabulary = None
+            self.derive_sets()
+
+    def derive_sets(self):
+        self.dead = {num for num, flag in enumerate(self.alive) if not flag}
+        self.notes_nums = {num for num, doc_id in enumerate(self.doc_ids) if doc_id.startswith(NOTES_PREFIX)}
+
+    def sync_memos(self, memos):
+        """与当前备忘录列表对齐：新增或变化的重新索引，已删除的移除，返回变化的文档数"""
+        changed = 0
+        current = set()
+        for memo in memos:
+            current.add(memo['id'])
+            changed += self.add_memo(memo)
+        with self.lock:
+            stale = [doc_id for doc_id in self.doc_nums if doc_id not in current and not doc_id.startswith(NOTES_PREFIX)]
+        for doc_id in stale:
+            self.remove(doc_id)
+        return changed + len(stale)
+
+    def sync_notes(self, notes):
+        """快速笔记按行索引，文档 id 为 notes:行号"""
+        lines = notes.splitlines()
+        changed = 0
+        for line_no, line in enumerate(lines):
+            changed += self.add(f"{NOTES_PREFIX}{line_no}", line)
+        with self.lock:
+            stale = [doc_id for doc_id in self.doc_nums
+                     if doc_id.startswith(NOTES_PREFIX) and int(doc_id[len(NOTES_PREFIX):]) >= len(lines)]
+        for doc_id in stale:
+            self.remove(doc_id)
+        return changed + len(stale)
+
+    def expand(self, term, prefix):
+        if not prefix:
+            posting = self.postings.get(term)
+            return [posting] if posting else []
+        if self.vocabulary is None:
+            self.vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self.vocabulary, term)
+        postings = []
+        for word in self.vocabulary[start:start + MAX_PREFIX_EXPANSION]:
+            if not word.startswith(term):
+                break
+            postings.append(self.postings[word])
+        return postings
+
+    def score_docs(self, nums, groups, kind=None):
+        scores = {}
+        for num in sorted(nums):
+            if num in self.dead or (kind == "memo" and num in self.notes_nums):
+                continue
+            score = 0
+            for _, idf, postings in groups:
+                weight = posting_weight(postings, num)
+                if not weight:
+                    break
+                score += weight * idf
+            else:
+                scores[num] = score
+        return scores
+
+    def score_ranked(self, groups, limit, kind=None):
+        """按最短一组的权重从高到低计算得分，剩余文档不可能进入前 limit 名时停止"""
+        _, first_idf, first_postings = groups[0]
+        others = groups[1:]
+        rest_max = None
+        # 每个文档都要在其余各组中二分查找，按组数分摊，总的查找次数基本不变
+        budget = max(MAX_SCORED // len(groups), limit)
+        scores = {}
+        seen = set() if len(first_postings) > 1 else None
+        level = None
+        for weight, num in ranked_docs(first_postings):
+            if weight != level:
+                level = weight
+                if len(scores) >= limit:
+                    if rest_max is None:
+                        rest_max = sum(idf * max(max(weights) for _, weights in postings) for _, idf, postings in others)
+                    if heapq.nlargest(limit, scores.values())[-1] >= weight * first_idf + rest_max:
+                        break
+            if seen is not None:
+                if num in seen:
+                    continue
+                seen.add(num)
+            if num in self.dead or (kind == "memo" and num in self.notes_nums):
+                continue
+            score = weight * first_idf
+            for _, idf, postings in others:
+                other = posting_weight(postings, num)
+                if not other:
+                    break
+                score += other * idf
+            else:
+                scores[num] = score
+                if len(scores) >= budget or (not others and len(scores) >= limit):
+                    break
+        return scores
+
+    def search(self, query, limit=20, kind=None):
+        """返回按相关度排序的 [(文档 id, 得分)]，所有查询词都必须出现；kind 为 "memo" 或 "notes" 时只返回该类文档"""
+        terms = query_terms(query)
+        if not terms:
+            return []
+        with self.lock:
+            total = max(len(self.doc_nums), 1)
+            groups = []
+            for term, prefix in terms:
+                postings = self.expand(term, prefix)
+                if not postings:
+                    return []
+                size = sum(len(nums) for nums, _ in postings)
+                groups.append((size, math.log(1 + total / size), postings))
+            groups.sort(key=lambda group: group[0])
+            if kind == "notes":
+                scores = self.score_docs(self.notes_nums, groups)
+            elif groups[0][0] <= MAX_SCORED:
+                scores = self.score_docs(posting_docs(groups[0][2]), groups, kind)
+            else:
+                # 沿前缀展开出的倒排表最多的一组取文档，其余各组逐个二分查找的次数最少
+                groups.sort(key=lambda group: (-len(group[2]), group[0]))
+                scores = self.score_ranked(groups, limit, kind)
+            doc_ids = self.doc_ids
+            return [(doc_ids[num], score) for num, score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1])]
+
+    def matching(self, query, kind=None):
+        """返回包含全部查询词的文档 id 集合，不计算得分，用于筛选列表；kind 的含义与 search 相同"""
+        terms = query_terms(query)
+        if not terms:
+            return set()
+        with self.lock:
+            groups = []
+            for term, prefix in terms:
+                postings = self.expand(term, prefix)
+                if not postings:
+                    return set()
+                groups.append(postings)
+            # 从最短的一组开始求交集，集合运算都在 C 中完成
+            groups.sort(key=lambda postings: sum(len(nums) for nums, _ in postings))
+            nums = posting_docs(groups[0])
+            for postings in groups[1:]:
+                if len(postings) == 1:
+                    nums.intersection_update(postings[0][0])
+                else:
+                    nums &= posting_docs(postings)
+            nums -= self.dead
+            if kind == "memo":
+                nums -= self.notes_nums
+            elif kind == "notes":
+                nums &= self.notes_nums
+            doc_ids = self.doc_ids
+            return {doc_ids[num] for num in nums}
+
+    def save(self, path):
+        with self.lock:
+            self.saving_postings = self.postings.copy()
+            state = {"postings": self.saving_postings, "doc_ids": list(self.doc_ids), "alive": bytearray(self.alive),
+                     "fingerprints": dict(self.fingerprints), "dead_count": self.dead_count, "version": INDEX_VERSION}
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        finally:
+            with self.lock:
+                self.saving_postings = None
+
+    @classmethod
+    def load(cls, path):
+        """加载磁盘上的索引，文件不存在、损坏或版本不一致时返回空索引"""
+        index = cls()
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return index
+        if state.pop("version", None) != INDEX_VERSION:
+            return index
+        for key, value in state.items():
+            setattr(index, key, value)
+        index.doc_nums = {doc_id: num for num, doc_id in enumerate(index.doc_ids) if index.alive[num]}
+        index.derive_sets()
+        return index
+
+class MemoSearchIndex(QObject):
+    """在后台线程中加载、更新并保存全文索引；查询在调用线程中直接执行"""
+    ready = pyqtSignal(int)
+
+    def __init__(self, cache_path, save_delay_ms=5000, parent=None):
+        super().__init__(parent)
+        self.cache_path = cache_path
+        self.index = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="text-index")
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(save_delay_ms)
+        self.save_timer.timeout.connect(self.save)
+
+    def is_ready(self):
+        return self.index is not None
+
+    def start(self, memos, notes):
+        self.executor.submit(self._load, list(memos), notes)
+
+    def _load(self, memos, notes):
+        index = TextIndex.load(self.cache_path)
+        changed = index.sync_memos(memos) + index.sync_notes(notes)
+        self.index = index
+        if changed:
+            self._save()
+        self.ready.emit(len(index))
+
+    def update_memos(self, memos):
+        """增量索引新增或修改的备忘录"""
+        self.submit(lambda index: [index.add_memo(memo) for memo in memos])
+
+    def remove_memos(self, memo_ids):
+        self.submit(lambda index: [index.remove(memo_id) for memo_id in memo_ids])
+
+    def update_notes(self, notes):
+        self.submit(lambda index: index.sync_notes(notes))
+
+    def submit(self, job):
+        def run():
+            if self.index is not None:
+                job(self.index)
+                if self.index.needs_compact():
+                    self.index.compact()
+        self.executor.submit(run)
+        self.save_timer.start()
+
+    def search(self, query, limit=20, kind=None):
+        if self.index is None:
+            return None
+        return self.index.search(query, limit, kind)
+
+    def matching(self, query, kind=None):
+        if self.index is None:
+            return None
+        return self.index.matching(query, kind)
+
+    def save(self):
+        self.executor.submit(self._save)
+
+    def _save(self):
+        if self.index is None:
+            return
+        try:
+            self.index.save(self.cache_path)
+        except Exception as e:
+            print(f"保存全文索引失败: {e}")
+
+    def shutdown(self):
+        if self.save_timer.isActive():
+            self.save_timer.stop()
+            self.save()
+        self.executor.shutdown(wait=True, cancel_futures=False)
@@ -0,0 +1,169 @@
+import os
+import json
+import math
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from core.search_history import DECAY_RATE
+
+COMPACT_THRESHOLD = 2000
+
+class ToolStats:
+    __slots__ = ("count", "score", "last_used", "latency_count", "latency_total", "latency_max")
+
+    def __init__(self):
+        self.count = 0
+        self.score = float("-inf")
+        self.last_used = 0.0
+        self.latency_count = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def add_launch(self, timestamp, weight=1):
+        # 与搜索历史相同的对数 frecency：score = ln(衰减后的次数) + 时间 * 衰减率
+        offset = timestamp * DECAY_RATE
+        if self.score == float("-inf"):
+            self.score = offset + math.log(weight)
+        else:
+            self.score = offset + math.log(math.exp(self.score - offset) + weight)
+        self.count += weight
+        self.last_used = max(self.last_used, timestamp)
+
+    def add_latency(self, latency_ms):
+        self.latency_count += 1
+        self.latency_total += latency_ms
+        self.latency_max = max(self.latency_max, latency_ms)
+
+    def mean_latency(self):
+        return self.latency_total / self.latency_count if self.latency_count else None
+
+class ToolUsage(QObject):
+    """常用工具的启动次数、时间和首个窗口出现耗时。
+
+    统计在内存中聚合，新事件按批追加到 JSONL 文件（每行一个事件，删除工具时写一条 forget 记录），不写设置文件；
+    行数过多时把文件压缩为每个工具一行的汇总记录。
+    """
+    flushed = pyqtSignal()
+
+    def __init__(self, path, flush_interval_ms=60000, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.stats = {}
+        self.pending = []
+        self.line_count = 0
+        self.load()
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(flush_interval_ms)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def get(self, tool_id):
+        stats = self.stats.get(tool_id)
+        if stats is None:
+            stats = self.stats[tool_id] = ToolStats()
+        return stats
+
+    def apply(self, event):
+        if event.get("forget"):
+            # 删除记录：之前的事件都不再计入
+            self.stats.pop(event["id"], None)
+            return
+        stats = self.get(event["id"])
+        if "n" in event:
+            # 压缩后的汇总记录
+            stats.count = event["n"]
+            stats.score = event["s"]
+            stats.last_used = event["t"]
+            stats.latency_count, stats.latency_total, stats.latency_max = event.get("l", (0, 0.0, 0.0))
+        elif "ms" in event:
+            stats.add_latency(event["ms"])
+        else:
+            stats.add_launch(event["t"])
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self.line_count += 1
+                    try:
+                        self.apply(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            pass
+
+    def record_launch(self, tool_id):
+        event = {"id": tool_id, "t": round(time.time(), 1)}
+        self.apply(event)
+        self.queue(event)
+
+    def record_latency(self, tool_id, latency_ms):
+        event = {"id": tool_id, "ms": round(latency_ms, 1)}
+        self.apply(event)
+        self.queue(event)
+
+    def queue(self, event):
+        self.pending.append(event)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def score(self, tool_id, now=None):
+        """当前时刻的衰减使用频率，未使用过的工具为 0"""
+        stats = self.stats.get(tool_id)
+        if stats is None or stats.count == 0:
+            return 0.0
+        now = time.time() if now is None else now
+        return math.exp(stats.score - now * DECAY_RATE)
+
+    def ranked(self, tools):
+        """按衰减使用频率排序，频率相同时保持原有的手动顺序"""
+        now = time.time()
+        return sorted(tools, key=lambda tool: -self.score(tool["id"], now))
+
+    def describe(self, tool_id):
+        stats = self.stats.get(tool_id)
+        if stats is None or stats.count == 0:
+            return ""
+        text = f"已启动 {stats.count} 次"
+        mean = stats.mean_latency()
+        if mean is not None:
+            text += f"，窗口平均 {mean:.0f} ms 出现（最慢 {stats.latency_max:.0f} ms）"
+        return text
+
+    def flush(self):
+        self.flush_timer.stop()
+        if not self.pending:
+            return
+        try:
+            if self.line_count + len(self.pending) > COMPACT_THRESHOLD:
+                self.compact()
+            else:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(event, separators=(',', ':')) + "\n" for event in self.pending)
+                self.line_count += len(self.pending)
+            self.pending = []
+        except OSError as e:
+            print(f"保存工具使用统计失败: {e}")
+        self.flushed.emit()
+
+    def compact(self):
+        lines = []
+        for tool_id, stats in self.stats.items():
+            if stats.count == 0 and stats.latency_count == 0:
+                continue
+            record = {"id": tool_id, "n": stats.count, "s": round(stats.score, 6), "t": stats.last_used,
+                      "l": [stats.latency_count, round(stats.latency_total, 1), round(stats.latency_max, 1)]}
+            lines.append(json.dumps(record, separators=(',', ':')) + "\n")
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.path)
+        self.line_count = len(lines)
+
+    def forget(self, tool_ids):
+        """删除已不存在的工具的统计并写入删除记录，重新加载时不会恢复；下次压缩时从文件中移除"""
+        for tool_id in tool_ids:
+            if tool_id in self.stats:
+                event = {"id": tool_id, "forget": True}
+                self.apply(event)
+                self.queue(event)
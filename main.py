@@ -1,11 +1,68 @@
+from core import startup
+import os
 import sys
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon
-from ui.main_widget import AcrylicWidget
+import argparse
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="eve desktop")
+    parser.add_argument("--startup-profile", action="store_true", help="打印各启动阶段的耗时")
+    parser.add_argument("--profile", action="store_true", help="记录启动阶段耗时并在结束后写出分析报告")
+    parser.add_argument("--profile-mode", choices=["timings", "cprofile", "tracemalloc"], default="timings")
+    parser.add_argument("--profile-seconds", type=float, default=30.0, help="分析持续的秒数")
+    parser.add_argument("--search", metavar="QUERY", help="用当前搜索引擎搜索")
+    parser.add_argument("--show", action="store_true", help="显示并激活窗口")
+    parser.add_argument("--add-memo", metavar="TITLE", help="添加一条备忘录")
+    parser.add_argument("--memo-content", default="", help="配合 --add-memo 使用的备忘录内容")
+    parser.add_argument("--import-memos", metavar="FILE", help="从 JSONL、CSV 或 iCalendar 文件导入备忘录")
+    parser.add_argument("--export-memos", metavar="FILE", help="按扩展名导出备忘录为 JSONL、CSV 或 iCalendar 文件")
+    parser.add_argument("--new-instance", action="store_true", help="不转发给已运行的实例，强制启动新进程")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+def build_command(args):
+    command = {}
+    if args.search:
+        command["search"] = args.search
+    if args.show:
+        command["show"] = True
+    if args.add_memo:
+        command["add_memo"] = {"title": args.add_memo, "content": args.memo_content}
+    # 命令可能转发给工作目录不同的已运行实例，文件路径先转为绝对路径
+    if args.import_memos:
+        command["import_memos"] = os.path.abspath(args.import_memos)
+    if args.export_memos:
+        command["export_memos"] = os.path.abspath(args.export_memos)
+    return command
 
 if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    command = build_command(args)
+    if not args.new_instance and not args.profile:
+        from core.single_instance import forward_to_running_instance
+        # 已有实例在运行时只转发命令，默认让它显示窗口
+        if forward_to_running_instance(command or {"show": True}):
+            sys.exit(0)
+    session = None
+    if args.profile:
+        from core.settings import SETTINGS_FILE
+        session = startup.ProfileSession(args.profile_mode, args.profile_seconds, os.path.dirname(os.path.abspath(SETTINGS_FILE)))
+        session.start()
+    with startup.phase("imports"):
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtGui import QIcon
+        from PyQt6.QtCore import QTimer
+        from ui.main_widget import AcrylicWidget
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon("./icon.ico"))
     widget = AcrylicWidget()
+    if not args.new_instance:
+        from core.single_instance import InstanceServer
+        instance_server = InstanceServer(app)
+        instance_server.command_received.connect(widget.handle_command)
+        instance_server.listen()
     widget.show()
-    sys.exit(app.exec()) 
\ No newline at end of file
+    if command:
+        QTimer.singleShot(0, lambda: widget.handle_command(command))
+    if session:
+        QTimer.singleShot(int(args.profile_seconds * 1000), session.finish)
+    sys.exit(app.exec())
@@ -1,6 +1,6 @@
-from PyQt6.QtWidgets import QLineEdit, QPushButton, QWidget
-from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect, QRectF
-from PyQt6.QtGui import QFont, QPen, QColor, QPainter, QPainterPath
+from PyQt6.QtWidgets import QLineEdit, QPushButton, QWidget, QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect, QRectF, QPoint, QEvent, pyqtSignal
+from PyQt6.QtGui import QFont, QPen, QColor, QPainter, QPainterPath, QTransform
 from datetime import datetime, timedelta
 
 class CustomLineEdit(QLineEdit):
@@ -12,6 +12,29 @@ class CustomLineEdit(QLineEdit):
         self.focus_animation.setDuration(300)
         self.focus_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
         self.original_geometry = None
+        self.completion = ""
+    def set_completion(self, completion):
+        """设置以灰色显示在光标后的补全建议，Tab 或右方向键接受"""
+        text = self.text()
+        if not completion or not text or len(completion) <= len(text) or not completion.lower().startswith(text.lower()):
+            completion = ""
+        if completion != self.completion:
+            self.completion = completion
+            self.update()
+    def accept_completion(self):
+        if self.completion and self.cursorPosition() == len(self.text()):
+            self.setText(self.text() + self.completion[len(self.text()):])
+            self.completion = ""
+            return True
+        return False
+    def event(self, event):
+        if event.type() == QEvent.Type.KeyPress and event.key() == Qt.Key.Key_Tab and self.accept_completion():
+            return True
+        return super().event(event)
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Right and self.accept_completion():
+            return
+        super().keyPressEvent(event)
     def focusInEvent(self, event):
         self.has_focus = True
         if not self.original_geometry:
@@ -46,6 +69,13 @@ class CustomLineEdit(QLineEdit):
         else:
             painter.fillPath(path, QColor(255, 255, 255, 100))
         super().paintEvent(event)
+        if self.completion and self.has_focus:
+            suffix = self.completion[len(self.text()):]
+            cursor = self.cursorRect()
+            painter.setFont(self.font())
+            painter.setPen(QColor(255, 255, 255, 110))
+            text_rect = QRect(cursor.center().x() + 1, 0, self.width() - cursor.center().x(), self.height())
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, suffix)
 
 class MediaControlButton(QPushButton):
     def __init__(self, text, tooltip, parent=None):
@@ -208,4 +238,387 @@ class CustomDateTimeEdit(QWidget):
                 for j in range(item.count()):
                     child_item = item.itemAt(j)
                     if child_item.widget():
-                        child_item.widget().setEnabled(enabled) 
\ No newline at end of file
+                        child_item.widget().setEnabled(enabled)
+
+def format_rate(value):
+    for unit in ("B", "K", "M", "G"):
+        if value < 1024 or unit == "G":
+            return f"{value:.0f}{unit}/s" if unit == "B" else f"{value:.1f}{unit}/s"
+        value /= 1024
+
+class SparklineWidget(QWidget):
+    """迷你折线图。路径按样本序号缓存，每次采样只追加一个点，绘制时用变换完成滚动和缩放"""
+    def __init__(self, label, buffer, color, max_value=None, formatter=None, parent=None):
+        super().__init__(parent)
+        self.label = label
+        self.buffer = buffer
+        self.color = color
+        self.max_value = max_value
+        self.formatter = formatter or (lambda v: f"{v:.0f}%")
+        self.path = QPainterPath()
+        self.sample_count = 0
+        self.path_start = 0
+        self.latest_value = 0.0
+        self.stale = False
+        self.setFixedHeight(28)
+        self.setFont(QFont("Consolas", 8))
+
+    def append_sample(self):
+        value = self.buffer.latest()
+        if value is None:
+            return
+        self.latest_value = float(value)
+        if self.stale:
+            self.stale = False
+            self.sample_count += 1
+            self.rebuild_path()
+        elif self.path.elementCount() == 0:
+            self.path_start = self.sample_count
+            self.path.moveTo(self.sample_count, self.latest_value)
+            self.sample_count += 1
+        else:
+            self.path.lineTo(self.sample_count, self.latest_value)
+            self.sample_count += 1
+        if self.sample_count - self.path_start > 2 * self.buffer.capacity:
+            self.rebuild_path()
+        self.update()
+
+    def skip_sample(self):
+        self.sample_count += 1
+        self.stale = True
+
+    def rebuild_path(self):
+        values = self.buffer.values()
+        self.path = QPainterPath()
+        self.path_start = self.sample_count - len(values)
+        for i, value in enumerate(values):
+            if i == 0:
+                self.path.moveTo(self.path_start, float(value))
+            else:
+                self.path.lineTo(self.path_start + i, float(value))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), QColor(40, 40, 50, 150))
+        w, h = self.width(), self.height()
+        if self.path.elementCount() > 1:
+            top = self.max_value if self.max_value else max(self.buffer.max(), 1.0)
+            capacity = self.buffer.capacity
+            sx = w / max(capacity - 1, 1)
+            sy = (h - 4) / top
+            first = self.sample_count - capacity
+            transform = QTransform(sx, 0, 0, -sy, -first * sx, h - 2)
+            pen = QPen(self.color, 1.2)
+            pen.setCosmetic(True)
+            painter.setClipRect(self.rect())
+            painter.setPen(pen)
+            painter.setTransform(transform)
+            painter.drawPath(self.path)
+            painter.resetTransform()
+        painter.setPen(QColor(220, 220, 220, 200))
+        painter.drawText(self.rect().adjusted(4, 0, -4, 0), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, self.label)
+        painter.drawText(self.rect().adjusted(4, 0, -4, 0), Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, self.formatter(self.latest_value))
+
+class CoreLoadWidget(QWidget):
+    """以一排竖条显示各核心的最新负载"""
+    def __init__(self, buffer, color, parent=None):
+        super().__init__(parent)
+        self.buffer = buffer
+        self.color = color
+        self.loads = None
+        self.setFixedHeight(28)
+
+    def append_sample(self):
+        self.loads = self.buffer.latest()
+        self.update()
+
+    def skip_sample(self):
+        pass
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(40, 40, 50, 150))
+        if self.loads is None or len(self.loads) == 0:
+            return
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.color)
+        bar_width = self.width() / len(self.loads)
+        height = self.height() - 4
+        for i, load in enumerate(self.loads):
+            bar_h = height * min(float(load), 100.0) / 100.0
+            painter.drawRect(QRectF(i * bar_width + 1, self.height() - 2 - bar_h, max(bar_width - 2, 1), bar_h))
+
+class ResourceMonitorPanel(QWidget):
+    """系统资源面板，订阅 ResourceMonitor 的采样信号"""
+    def __init__(self, monitor, parent=None):
+        super().__init__(parent)
+        from PyQt6.QtWidgets import QGridLayout
+        self.monitor = monitor
+        layout = QGridLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+        self.charts = [
+            SparklineWidget("CPU", monitor.cpu, QColor(0, 191, 255), max_value=100),
+            CoreLoadWidget(monitor.per_core, QColor(0, 191, 255, 160)),
+            SparklineWidget("MEM", monitor.memory, QColor(255, 160, 255), max_value=100),
+            SparklineWidget("DISK", monitor.disk, QColor(255, 200, 100), formatter=format_rate),
+            SparklineWidget("NET", monitor.network, QColor(120, 230, 160), formatter=format_rate),
+        ]
+        layout.addWidget(self.charts[0], 0, 0)
+        layout.addWidget(self.charts[1], 0, 1)
+        layout.addWidget(self.charts[2], 1, 0)
+        layout.addWidget(self.charts[3], 1, 1)
+        layout.addWidget(self.charts[4], 2, 0, 1, 2)
+        monitor.sampled.connect(self.on_sampled)
+
+    def on_sampled(self):
+        # 面板收起或窗口隐藏时只记账，重新可见后由环形缓冲区重建路径
+        if self.visibleRegion().isEmpty():
+            for chart in self.charts:
+                chart.skip_sample()
+            return
+        for chart in self.charts:
+            chart.append_sample()
+
+class SearchResultsPopup(QListWidget):
+    """显示在输入框下方的结果下拉列表，不抢占输入焦点，方向键和回车由输入框转发"""
+    result_activated = pyqtSignal(object)
+
+    def __init__(self, anchor, max_rows=8):
+        super().__init__()
+        self.anchor = anchor
+        self.max_rows = max_rows
+        self.setWindowFlags(Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setFont(QFont("Consolas", 9))
+        self.setStyleSheet("""
+            QListWidget {
+                background-color: rgba(40, 40, 40, 235);
+                color: rgba(230, 230, 230, 230);
+                border: 1px solid rgba(100, 100, 100, 150);
+                border-radius: 5px;
+            }
+            QListWidget::item {
+                padding: 3px 6px;
+            }
+            QListWidget::item:selected {
+                background-color: rgba(0, 191, 255, 150);
+            }
+        """)
+        self.itemClicked.connect(self.activate_item)
+        anchor.installEventFilter(self)
+
+    def show_results(self, results):
+        """results 为 (显示文本, 提示, 负载) 列表，为空时隐藏"""
+        self.clear()
+        if not results:
+            self.hide()
+            return
+        for text, tooltip, payload in results:
+            item = QListWidgetItem(text)
+            item.setToolTip(tooltip)
+            item.setData(Qt.ItemDataRole.UserRole, payload)
+            self.addItem(item)
+        row_height = self.sizeHintForRow(0) if self.count() else 20
+        rows = min(self.count(), self.max_rows)
+        self.setFixedSize(max(self.anchor.width() + 80, 320), rows * row_height + 6)
+        self.move(self.anchor.mapToGlobal(QPoint(0, self.anchor.height() + 4)))
+        self.setCurrentRow(-1)
+        self.show()
+
+    def activate_item(self, item):
+        payload = item.data(Qt.ItemDataRole.UserRole)
+        self.hide()
+        self.result_activated.emit(payload)
+
+    def eventFilter(self, obj, event):
+        if obj is self.anchor and self.isVisible():
+            if event.type() == QEvent.Type.KeyPress:
+                key = event.key()
+                if key == Qt.Key.Key_Down:
+                    self.setCurrentRow(min(self.currentRow() + 1, self.count() - 1))
+                    return True
+                if key == Qt.Key.Key_Up:
+                    self.setCurrentRow(max(self.currentRow() - 1, 0))
+                    return True
+                if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and self.currentItem() is not None and self.currentRow() >= 0:
+                    self.activate_item(self.currentItem())
+                    return True
+                if key == Qt.Key.Key_Escape:
+                    self.hide()
+                    return True
+            elif event.type() == QEvent.Type.FocusOut and not self.underMouse():
+                self.hide()
+        return super().eventFilter(obj, event)
+
+class QuickToolBar(QWidget):
+    """常用工具栏：按工具 id 保存按钮，set_tools 只增删、移动或更新有变化的按钮，未变化的按钮原样复用"""
+    tool_activated = pyqtSignal(object)
+    edit_requested = pyqtSignal()
+    STYLE = """
+        QPushButton#quickToolButton {
+            color: rgba(220, 220, 220, 220);
+            background-color: rgba(50, 50, 60, 150);
+            border-radius: 5px;
+            font-size: 16px;
+        }
+        QPushButton#quickToolButton:hover {
+            background-color: rgba(70, 70, 80, 180);
+        }
+        QPushButton#quickToolButton:pressed {
+            background-color: rgba(40, 40, 50, 150);
+        }
+        QPushButton#quickToolEditButton {
+            color: rgba(180, 180, 180, 200);
+            background-color: rgba(60, 60, 70, 150);
+            border-radius: 5px;
+            font-size: 16px;
+        }
+        QPushButton#quickToolEditButton:hover {
+            background-color: rgba(80, 80, 90, 180);
+        }
+    """
+
+    def __init__(self, apply_icon, parent=None):
+        super().__init__(parent)
+        from PyQt6.QtWidgets import QHBoxLayout
+        self.apply_icon = apply_icon
+        self.tools = []
+        self.buttons = {}
+        self.setStyleSheet(self.STYLE)
+        self.tools_layout = QHBoxLayout(self)
+        self.tools_layout.setContentsMargins(0, 0, 0, 0)
+        self.tools_layout.setSpacing(10)
+        self.edit_button = QPushButton("⚙️", self)
+        self.edit_button.setObjectName("quickToolEditButton")
+        self.edit_button.setToolTip("编辑常用工具")
+        self.edit_button.setFixedSize(40, 40)
+        self.edit_button.clicked.connect(self.edit_requested)
+        self.tools_layout.addWidget(self.edit_button)
+        self.tools_layout.addStretch()
+
+    def create_button(self, tool):
+        button = QPushButton(self)
+        button.setObjectName("quickToolButton")
+        button.setFixedSize(40, 40)
+        button.setProperty("tool_id", tool["id"])
+        button.clicked.connect(lambda: self.tool_activated.emit(self.tool_by_id(button.property("tool_id"))))
+        self.update_button(button, tool)
+        return button
+
+    def update_button(self, button, tool):
+        button.setToolTip(tool["name"])
+        button.setProperty("tool_path", tool["path"])
+        self.apply_icon(button, tool.get("icon", ""), tool["path"])
+
+    def tool_by_id(self, tool_id):
+        return next((tool for tool in self.tools if tool["id"] == tool_id), None)
+
+    def tool_buttons(self):
+        return [self.buttons[tool["id"]] for tool in self.tools]
+
+    def set_tools(self, tools):
+        from core.quick_tools import diff_tools
+        added, removed, changed = diff_tools(self.tools, tools)
+        for tool_id in removed:
+            button = self.buttons.pop(tool_id)
+            self.tools_layout.removeWidget(button)
+            button.deleteLater()
+        new_by_id = {tool["id"]: tool for tool in tools}
+        for tool_id in changed:
+            self.update_button(self.buttons[tool_id], new_by_id[tool_id])
+        for tool_id in added:
+            self.buttons[tool_id] = self.create_button(new_by_id[tool_id])
+        # 工具按钮位于布局开头，只移动位置不对的按钮
+        for position, tool in enumerate(tools):
+            button = self.buttons[tool["id"]]
+            item = self.tools_layout.itemAt(position)
+            if item is None or item.widget() is not button:
+                self.tools_layout.removeWidget(button)
+                self.tools_layout.insertWidget(position, button)
+        self.tools = [dict(tool) for tool in tools]
+
+class AgendaPanel(QWidget):
+    """日程面板：按天分组列出一段时间内的提醒，数据由调用方从提醒索引中按时间范围取出"""
+    memo_activated = pyqtSignal(str)
+    range_changed = pyqtSignal(int)
+    RANGES = [("今天", 1), ("未来 7 天", 7)]
+
+    def __init__(self, days=7, parent=None):
+        super().__init__(parent)
+        from PyQt6.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel, QComboBox
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+        header = QHBoxLayout()
+        title = QLabel("日程", self)
+        title.setFont(QFont("Caveat", 14, QFont.Weight.Bold))
+        title.setStyleSheet("color: rgba(200, 220, 255, 220);")
+        header.addWidget(title)
+        header.addStretch()
+        self.range_combo = QComboBox(self)
+        self.range_combo.addItems([name for name, _ in self.RANGES])
+        self.range_combo.setCurrentIndex(0 if days == 1 else 1)
+        self.range_combo.setStyleSheet("""
+            QComboBox {
+                color: rgba(220, 220, 220, 220);
+                background-color: rgba(50, 50, 60, 150);
+                border-radius: 5px;
+                padding: 2px 6px;
+            }
+        """)
+        self.range_combo.currentIndexChanged.connect(lambda index: self.range_changed.emit(self.RANGES[index][1]))
+        header.addWidget(self.range_combo)
+        layout.addLayout(header)
+        self.list = QListWidget(self)
+        self.list.setFont(QFont("Consolas", 9))
+        self.list.setFixedHeight(110)
+        self.list.setStyleSheet("""
+            QListWidget {
+                background-color: rgba(40, 40, 50, 150);
+                color: rgba(220, 220, 220, 220);
+                border: 1px solid rgba(100, 100, 120, 100);
+                border-radius: 5px;
+            }
+            QListWidget::item:selected {
+                background-color: rgba(0, 191, 255, 120);
+            }
+        """)
+        self.list.itemDoubleClicked.connect(self.activate_item)
+        layout.addWidget(self.list)
+
+    def days(self):
+        return self.RANGES[self.range_combo.currentIndex()][1]
+
+    def set_entries(self, entries, lookup, today):
+        """entries 为按时间排序的 [(时间戳, 备忘录 id)]，lookup 按 id 返回备忘录"""
+        from core.agenda import day_label
+        self.list.clear()
+        current_day = None
+        for timestamp, memo_id in entries:
+            memo = lookup(memo_id)
+            if memo is None:
+                continue
+            reminder_dt = datetime.fromtimestamp(timestamp)
+            if reminder_dt.date() != current_day:
+                current_day = reminder_dt.date()
+                header = QListWidgetItem(day_label(current_day, today.date()))
+                header.setFlags(Qt.ItemFlag.NoItemFlags)
+                header.setForeground(QColor(120, 200, 255))
+                self.list.addItem(header)
+            mark = "✓" if memo.get('reminder_shown') else "•"
+            item = QListWidgetItem(f"  {mark} {reminder_dt.strftime('%H:%M')}  {memo.get('title', '无标题')}")
+            item.setData(Qt.ItemDataRole.UserRole, memo_id)
+            item.setToolTip(memo.get('content', '')[:200])
+            self.list.addItem(item)
+        if self.list.count() == 0:
+            empty = QListWidgetItem("没有提醒")
+            empty.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.list.addItem(empty)
+
+    def activate_item(self, item):
+        memo_id = item.data(Qt.ItemDataRole.UserRole)
+        if memo_id:
+            self.memo_activated.emit(memo_id)
@@ -1,8 +1,12 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QListWidget, QTextEdit, QCheckBox, QColorDialog, QFileDialog, QSlider, QComboBox, QFrame
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QListWidget, QListView, QTextEdit, QCheckBox, QColorDialog, QFileDialog, QSlider, QComboBox, QFrame
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect, QTimer
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QFont, QKeySequence, QShortcut
 from datetime import datetime, timedelta
 from ui.custom_widgets import CustomDateTimeEdit
+from ui.memo_model import MemoListModel, reminder_key
+from core.memos import Memo, new_memo_id
+from core.text_index import memo_matches
+from core.quick_tools import new_tool_id
 
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
@@ -193,7 +197,7 @@ class SettingsDialog(QDialog):
             # save_settings(self.settings) 
 
 class QuickToolsDialog(QDialog):
-    def __init__(self, tools, parent=None):
+    def __init__(self, tools, parent=None, auto_sort=False):
         super().__init__(parent)
         self.setWindowTitle("编辑常用工具")
         self.setFixedSize(500, 400)
@@ -286,6 +290,10 @@ class QuickToolsDialog(QDialog):
         self.down_button.setEnabled(False)
         buttons_layout.addWidget(self.down_button)
         layout.addLayout(buttons_layout)
+        self.auto_sort_checkbox = QCheckBox("按使用频率自动排序")
+        self.auto_sort_checkbox.setChecked(auto_sort)
+        self.auto_sort_checkbox.toggled.connect(self.selection_changed)
+        layout.addWidget(self.auto_sort_checkbox)
         dialog_buttons = QHBoxLayout()
         self.ok_button = QPushButton("确定")
         self.ok_button.clicked.connect(self.accept)
@@ -305,8 +313,9 @@ class QuickToolsDialog(QDialog):
         has_selection = len(self.tools_list.selectedItems()) > 0
         self.update_button.setEnabled(has_selection)
         self.delete_button.setEnabled(has_selection)
-        self.up_button.setEnabled(has_selection and self.tools_list.currentRow() > 0)
-        self.down_button.setEnabled(has_selection and self.tools_list.currentRow() < self.tools_list.count() - 1)
+        manual_order = not self.auto_sort_checkbox.isChecked()
+        self.up_button.setEnabled(manual_order and has_selection and self.tools_list.currentRow() > 0)
+        self.down_button.setEnabled(manual_order and has_selection and self.tools_list.currentRow() < self.tools_list.count() - 1)
         if has_selection:
             index = self.tools_list.currentRow()
             tool = self.tools[index]
@@ -335,7 +344,7 @@ class QuickToolsDialog(QDialog):
             return
         if not icon:
             icon = "🔧"
-        self.tools.append({"name": name, "icon": icon, "path": path})
+        self.tools.append({"id": new_tool_id(), "name": name, "icon": icon, "path": path})
         self.update_tools_list()
         self.name_edit.clear()
         self.icon_edit.clear()
@@ -351,7 +360,7 @@ class QuickToolsDialog(QDialog):
             return
         if not icon:
             icon = "🔧"
-        self.tools[index] = {"name": name, "icon": icon, "path": path}
+        self.tools[index] = dict(self.tools[index], name=name, icon=icon, path=path)
         self.update_tools_list()
     def delete_tool(self):
         if not self.tools_list.selectedItems():
@@ -382,11 +391,13 @@ class QuickToolsDialog(QDialog):
         self.tools_list.setCurrentRow(index+1) 
 
 class MemoDialog(QDialog):
-    def __init__(self, memos, parent=None):
+    """备忘录管理对话框。在 id 到备忘录的浅拷贝上编辑，changed_ids 记录改动过的 id，确定后由调用方逐条写回存储"""
+    def __init__(self, store, parent=None, select_id=None):
         super().__init__(parent)
         self.setWindowTitle("备忘录管理")
         self.setFixedSize(600, 500)
-        self.memos = memos.copy()
+        self.memos = dict(store.by_id)
+        self.changed_ids = set()
         self.setStyleSheet("""
             QDialog {
                 background-color: #2c2c2c;
@@ -412,13 +423,13 @@ class MemoDialog(QDialog):
                 border-radius: 3px;
                 padding: 3px;
             }
-            QListWidget {
+            QListView, QComboBox {
                 background-color: #3a3a3a;
                 color: white;
                 border: 1px solid #555555;
                 border-radius: 3px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #5f9ea0;
             }
             QCheckBox {
@@ -442,8 +453,30 @@ class MemoDialog(QDialog):
         tip_label.setStyleSheet("color: #5f9ea0; font-size: 10px; padding: 5px;")
         tip_label.setWordWrap(True)
         layout.addWidget(tip_label)
-        self.memos_list = QListWidget()
-        self.update_memos_list()
+        sort_layout = QHBoxLayout()
+        sort_layout.addWidget(QLabel("排序:"))
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems([name for name, _ in MemoListModel.SORT_MODES])
+        self.sort_combo.currentIndexChanged.connect(self.sort_mode_changed)
+        sort_layout.addWidget(self.sort_combo)
+        sort_layout.addWidget(QLabel("筛选:"))
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("按标题或内容筛选...")
+        self.filter_edit.setClearButtonEnabled(True)
+        sort_layout.addWidget(self.filter_edit)
+        layout.addLayout(sort_layout)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
+        self.memo_model = MemoListModel(self.memos, self)
+        # 分批布局：大量备忘录时每个事件循环周期只布局一批行，界面不会卡住
+        self.memos_list = QListView()
+        self.memos_list.setUniformItemSizes(True)
+        self.memos_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.memos_list.setBatchSize(2000)
+        self.memos_list.setModel(self.memo_model)
         layout.addWidget(self.memos_list)
         edit_layout = QVBoxLayout()
         title_layout = QHBoxLayout()
@@ -485,7 +518,33 @@ class MemoDialog(QDialog):
         self.reset_reminder_button.setEnabled(False)
         self.reset_reminder_button.setToolTip("重置已提醒状态，允许再次提醒")
         buttons_layout.addWidget(self.reset_reminder_button)
+        self.undo_button = QPushButton("撤销")
+        self.undo_button.setToolTip("撤销上一次添加、更新或删除 (Ctrl+Z)")
+        self.undo_button.clicked.connect(self.undo_edit)
+        buttons_layout.addWidget(self.undo_button)
+        self.redo_button = QPushButton("重做")
+        self.redo_button.setToolTip("重做 (Ctrl+Y)")
+        self.redo_button.clicked.connect(self.redo_edit)
+        buttons_layout.addWidget(self.redo_button)
         layout.addLayout(buttons_layout)
+        transfer_layout = QHBoxLayout()
+        self.import_button = QPushButton("导入...")
+        self.import_button.setToolTip("从 JSONL、CSV 或 iCalendar 文件导入，跳过标题和提醒时间都相同的备忘录")
+        self.import_button.clicked.connect(self.import_memos)
+        transfer_layout.addWidget(self.import_button)
+        self.export_button = QPushButton("导出...")
+        self.export_button.setToolTip("按当前的排序和筛选导出列表中显示的备忘录")
+        self.export_button.clicked.connect(self.export_memos)
+        transfer_layout.addWidget(self.export_button)
+        self.archive_button = QPushButton("归档...")
+        self.archive_button.setToolTip("查看、搜索和恢复已自动归档的已完成备忘录")
+        self.archive_button.clicked.connect(self.open_archive)
+        transfer_layout.addWidget(self.archive_button)
+        self.transfer_label = QLabel("")
+        transfer_layout.addWidget(self.transfer_label, 1)
+        layout.addLayout(transfer_layout)
+        self.transfer = None
+        self.transfer_running = False
         dialog_buttons = QHBoxLayout()
         self.ok_button = QPushButton("确定")
         self.ok_button.clicked.connect(self.accept)
@@ -495,123 +554,312 @@ class MemoDialog(QDialog):
         dialog_buttons.addWidget(self.cancel_button)
         layout.addLayout(dialog_buttons)
         self.setLayout(layout)
-        self.memos_list.itemSelectionChanged.connect(self.selection_changed)
-        self.memos_list.itemDoubleClicked.connect(self.item_double_clicked)
-    def update_memos_list(self):
-        self.memos_list.clear()
-        for memo in self.memos:
-            title = memo.get('title', '无标题')
-            reminder_time = memo.get('reminder_time')
-            reminder_shown = memo.get('reminder_shown', False)
-            if reminder_time:
-                if reminder_shown:
-                    reminder_str = f" (提醒: {reminder_time} - 已提醒)"
-                else:
-                    reminder_str = f" (提醒: {reminder_time} - 待提醒)"
-            else:
-                reminder_str = ""
-            self.memos_list.addItem(f"📝 {title}{reminder_str}")
+        self.memos_list.selectionModel().selectionChanged.connect(self.selection_changed)
+        self.memos_list.doubleClicked.connect(self.item_double_clicked)
+        # 编辑历史跨重启保留；取消对话框时回到打开时的状态，确定后才写入日志
+        self.history = parent.get_edit_history("memos") if hasattr(parent, 'get_edit_history') else None
+        self.history_checkpoint = self.history.checkpoint() if self.history else None
+        # 标题和内容输入框获得焦点时 Ctrl+Z 仍由输入框自己处理
+        QShortcut(QKeySequence("Ctrl+Z"), self, self.undo_edit)
+        QShortcut(QKeySequence("Ctrl+Y"), self, self.redo_edit)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self, self.redo_edit)
+        self.update_history_buttons()
+        if select_id in self.memos:
+            self.memos_list.setCurrentIndex(self.memo_model.index(self.memo_model.row_of(select_id)))
+    def sort_mode_changed(self, index):
+        self.memo_model.set_sort_key(MemoListModel.SORT_MODES[index][1])
+    def apply_filter(self):
+        query = self.filter_edit.text().strip()
+        if not query:
+            self.memo_model.set_filter(None)
+            return
+        memo_index = getattr(self.parent(), 'memo_index', None)
+        # 只需要匹配的 id，不按相关度排序
+        hits = memo_index.matching(query, kind="memo") if memo_index else None
+        if hits is None:
+            # 全文索引尚未就绪时逐条匹配
+            self.memo_model.set_filter(memo_id for memo_id, memo in self.memos.items() if memo_matches(memo, query))
+            return
+        # 索引只包含已保存的备忘录，本次对话框中改动过的逐条匹配
+        matched = {memo_id for memo_id in hits if memo_id in self.memos and memo_id not in self.changed_ids}
+        matched.update(memo_id for memo_id in self.changed_ids
+                       if memo_id in self.memos and memo_matches(self.memos[memo_id], query))
+        self.memo_model.set_filter(matched)
+    def current_id(self):
+        """当前选中备忘录的 id，没有选中时返回 None"""
+        indexes = self.memos_list.selectionModel().selectedIndexes()
+        if not indexes:
+            return None
+        return self.memo_model.memo_id(indexes[0].row())
     def selection_changed(self):
-        has_selection = len(self.memos_list.selectedItems()) > 0
+        memo_id = self.current_id()
+        has_selection = memo_id is not None
         self.update_button.setEnabled(has_selection)
         self.delete_button.setEnabled(has_selection)
         if has_selection:
-            index = self.memos_list.currentRow()
-            memo = self.memos[index]
+            memo = self.memos[memo_id]
             has_reminder = bool(memo.get('reminder_time'))
             reminder_shown = memo.get('reminder_shown', False)
             self.reset_reminder_button.setEnabled(has_reminder and reminder_shown)
         else:
             self.reset_reminder_button.setEnabled(False)
         if has_selection:
-            index = self.memos_list.currentRow()
-            memo = self.memos[index]
             self.title_edit.setText(memo.get('title', ''))
             self.content_edit.setText(memo.get('content', ''))
-            reminder_time = memo.get('reminder_time')
-            if reminder_time:
-                try:
-                    dt = datetime.fromisoformat(reminder_time)
-                    self.datetime_edit.setDateTime(dt)
-                    self.reminder_checkbox.setChecked(True)
-                except:
-                    self.reminder_checkbox.setChecked(False)
-            else:
-                self.reminder_checkbox.setChecked(False)
-    def item_double_clicked(self, item):
-        index = self.memos_list.row(item)
-        memo = self.memos[index]
+            self.show_reminder_time(memo)
+    def item_double_clicked(self, model_index):
+        memo = self.memos[self.memo_model.memo_id(model_index.row())]
         self.title_edit.setText(memo.get('title', ''))
         self.content_edit.setText(memo.get('content', ''))
+        self.show_reminder_time(memo)
+    def show_reminder_time(self, memo):
         reminder_time = memo.get('reminder_time')
         if reminder_time:
-            try:
-                dt = datetime.fromisoformat(reminder_time)
-                self.datetime_edit.setDateTime(dt)
-                self.reminder_checkbox.setChecked(True)
-            except:
-                self.reminder_checkbox.setChecked(False)
-        else:
-            self.reminder_checkbox.setChecked(False)
+            self.datetime_edit.setDateTime(reminder_time)
+        self.reminder_checkbox.setChecked(bool(reminder_time))
     def add_memo(self):
         title = self.title_edit.text().strip()
         content = self.content_edit.toPlainText().strip()
         if not title:
             return
-        memo = {
-            'title': title,
-            'content': content,
-            'created_time': datetime.now().isoformat()
-        }
+        memo = Memo(id=new_memo_id(), title=title, content=content, created_time=datetime.now())
         if self.reminder_checkbox.isChecked():
-            memo['reminder_time'] = self.datetime_edit.dateTime().isoformat()
-        self.memos.append(memo)
-        self.update_memos_list()
+            memo['reminder_time'] = self.datetime_edit.dateTime()
+        self.memo_model.append_memo(memo)
+        self.changed_ids.add(memo['id'])
+        self.record_edit(None, memo)
         self.title_edit.clear()
         self.content_edit.clear()
         self.reminder_checkbox.setChecked(False)
     def update_memo(self):
-        if not self.memos_list.selectedItems():
+        memo_id = self.current_id()
+        if memo_id is None:
             return
-        index = self.memos_list.currentRow()
         title = self.title_edit.text().strip()
         content = self.content_edit.toPlainText().strip()
         if not title:
             return
-        memo = {
-            'title': title,
-            'content': content,
-            'created_time': self.memos[index].get('created_time', datetime.now().isoformat())
-        }
+        memo = Memo(id=memo_id, title=title, content=content,
+                    created_time=self.memos[memo_id].get('created_time') or datetime.now())
         if self.reminder_checkbox.isChecked():
-            memo['reminder_time'] = self.datetime_edit.dateTime().isoformat()
-        self.memos[index] = memo
-        self.update_memos_list()
+            memo['reminder_time'] = self.datetime_edit.dateTime()
+        self.record_edit(self.memos[memo_id], memo)
+        self.memo_model.replace_memo(memo)
+        self.changed_ids.add(memo_id)
     def delete_memo(self):
-        if not self.memos_list.selectedItems():
+        memo_id = self.current_id()
+        if memo_id is None:
             return
-        index = self.memos_list.currentRow()
-        del self.memos[index]
-        self.update_memos_list()
+        self.record_edit(self.memos[memo_id], None)
+        self.memo_model.remove_memo(memo_id)
+        self.changed_ids.add(memo_id)
         self.title_edit.clear()
         self.content_edit.clear()
         self.reminder_checkbox.setChecked(False)
     def reset_reminder(self):
-        if not self.memos_list.selectedItems():
+        memo_id = self.current_id()
+        if memo_id is None:
             return
-        index = self.memos_list.currentRow()
-        memo = self.memos[index]
+        memo = self.memos[memo_id]
         memo['reminder_shown'] = False
         memo['advance_shown'] = False
-        self.update_memos_list()
+        self.memo_model.memo_changed(memo_id)
+        self.selection_changed()
+        # 重置提醒立即生效，不等对话框确定
+        parent = self.parent()
+        if hasattr(parent, 'memo_store') and parent.memo_store.update(memo_id, reminder_shown=False, advance_shown=False):
+            parent.save_memos()
+    def record_edit(self, old, new):
+        if self.history is None:
+            return
+        from core.edit_history import memo_entry
+        self.history.push(memo_entry(old, new))
+        self.update_history_buttons()
+    def update_history_buttons(self):
+        self.undo_button.setEnabled(bool(self.history and self.history.can_undo()))
+        self.redo_button.setEnabled(bool(self.history and self.history.can_redo()))
+    def undo_edit(self):
+        if self.history:
+            self.apply_history_entry(self.history.undo(), reverse=True)
+    def redo_edit(self):
+        if self.history:
+            self.apply_history_entry(self.history.redo(), reverse=False)
+    def apply_history_entry(self, entry, reverse):
+        """把一条编辑记录应用到对话框中的备忘录，作为本次对话框的改动"""
+        self.update_history_buttons()
+        if entry is None:
+            return
+        from core.edit_history import apply_memo
+        memo_id = entry['id']
+        current = self.memos.get(memo_id)
+        memo = apply_memo(current, entry, reverse)
+        if memo is None:
+            if current is None:
+                return
+            self.memo_model.remove_memo(memo_id)
+        elif current is None:
+            self.memo_model.append_memo(memo)
+        else:
+            self.memo_model.replace_memo(memo)
+        self.changed_ids.add(memo_id)
         self.selection_changed()
-        if hasattr(self.parent(), 'settings'):
-            parent_settings = self.parent().settings
-            parent_memos = parent_settings.get('memos', [])
-            if index < len(parent_memos):
-                parent_memos[index] = memo
-                from core.settings import save_settings
-                save_settings(parent_settings) 
+    def get_transfer(self):
+        if self.transfer is None:
+            from core.memo_io import MemoTransfer
+            self.transfer = MemoTransfer(self)
+            self.transfer.batch_ready.connect(self.add_imported_batch)
+            self.transfer.progress.connect(self.show_transfer_progress)
+            self.transfer.finished.connect(self.transfer_finished)
+        return self.transfer
+    def set_transfer_running(self, running):
+        # 导入时已发出的批次还在事件队列中，结束前关闭对话框会丢失这些备忘录
+        self.transfer_running = running
+        self.import_button.setEnabled(not running)
+        self.export_button.setEnabled(not running)
+        self.ok_button.setEnabled(not running)
+        self.cancel_button.setEnabled(not running)
+    def import_memos(self):
+        path, _ = QFileDialog.getOpenFileName(self, "导入备忘录", "", "备忘录文件 (*.jsonl *.csv *.ics);;所有文件 (*)")
+        if not path:
+            return
+        from core.memo_io import dedupe_key
+        self.set_transfer_running(True)
+        self.transfer_label.setText("正在导入...")
+        # 导入的备忘录作为本次对话框的改动，点击确定后才写入存储
+        self.get_transfer().start_import(path, {dedupe_key(memo) for memo in self.memos.values()}, batch_size=5000)
+    def add_imported_batch(self, memos):
+        for memo in memos:
+            if not memo.get('id') or memo['id'] in self.memos:
+                memo['id'] = new_memo_id()
+        self.memo_model.append_memos(memos)
+        self.changed_ids.update(memo['id'] for memo in memos)
+    def show_transfer_progress(self, done, total):
+        self.transfer_label.setText(f"正在导入... {done * 100 // max(total, 1)}%")
+    def export_memos(self):
+        path, selected = QFileDialog.getSaveFileName(self, "导出备忘录", "memos.jsonl", "JSON Lines (*.jsonl);;CSV (*.csv);;iCalendar (*.ics)")
+        if not path:
+            return
+        import os
+        if not os.path.splitext(path)[1]:
+            path += "." + selected.split("*.")[-1].rstrip(")")
+        self.set_transfer_running(True)
+        self.transfer_label.setText("正在导出...")
+        self.get_transfer().start_export([self.memos[memo_id] for memo_id in self.memo_model.order], path)
+    def transfer_finished(self, action, count, skipped, error):
+        self.set_transfer_running(False)
+        if error:
+            self.transfer_label.setText(f"{'导入' if action == 'import' else '导出'}失败: {error}")
+        elif action == "import":
+            self.transfer_label.setText(f"已导入 {count} 条，跳过 {skipped} 条重复或无效记录")
+        else:
+            self.transfer_label.setText(f"已导出 {count} 条备忘录")
+    def open_archive(self):
+        parent = self.parent()
+        if not hasattr(parent, 'get_memo_archive'):
+            return
+        dialog = MemoArchiveDialog(parent.get_memo_archive(), self)
+        dialog.exec()
+        if dialog.restored:
+            # 恢复立即写入存储，与重置提醒一样不等对话框确定
+            parent.restore_archived_memos(dialog.restored)
+            self.memo_model.append_memos(dialog.restored)
+    def done(self, result):
+        if self.transfer_running and result == QDialog.DialogCode.Accepted:
+            return
+        if self.transfer is not None:
+            self.transfer.shutdown()
+        if self.history is not None:
+            if result == QDialog.DialogCode.Accepted:
+                self.history.commit()
+            else:
+                self.history.rollback(self.history_checkpoint)
+        super().done(result)
+
+class MemoArchiveDialog(QDialog):
+    """归档视图：打开时才加载归档文件，恢复或删除立即写回归档"""
+    def __init__(self, archive, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("备忘录归档")
+        self.setFixedSize(560, 420)
+        if parent is not None:
+            self.setStyleSheet(parent.styleSheet())
+        self.archive = archive
+        self.restored = []
+        self.searcher = None
+        layout = QVBoxLayout()
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("搜索:"))
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("按标题或内容搜索归档...")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.returnPressed.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(lambda text: text or self.apply_filter())
+        filter_layout.addWidget(self.filter_edit)
+        layout.addLayout(filter_layout)
+        # 模型会修改传入的字典，使用归档的浅拷贝
+        self.memo_model = MemoListModel(dict(archive.load()), self)
+        self.memo_model.set_sort_key(reminder_key)
+        self.memos_list = QListView()
+        self.memos_list.setUniformItemSizes(True)
+        self.memos_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.memos_list.setBatchSize(2000)
+        self.memos_list.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.memos_list.setModel(self.memo_model)
+        layout.addWidget(self.memos_list)
+        buttons_layout = QHBoxLayout()
+        self.count_label = QLabel("")
+        buttons_layout.addWidget(self.count_label, 1)
+        restore_button = QPushButton("恢复")
+        restore_button.setToolTip("把选中的备忘录移回活动列表")
+        restore_button.clicked.connect(self.restore_selected)
+        buttons_layout.addWidget(restore_button)
+        delete_button = QPushButton("删除")
+        delete_button.clicked.connect(self.delete_selected)
+        buttons_layout.addWidget(delete_button)
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.accept)
+        buttons_layout.addWidget(close_button)
+        layout.addLayout(buttons_layout)
+        self.setLayout(layout)
+        self.update_count()
+    def update_count(self):
+        self.count_label.setText(f"显示 {self.memo_model.rowCount()} 条，共 {len(self.memo_model.memos)} 条归档")
+    def apply_filter(self):
+        query = self.filter_edit.text().strip()
+        if not query:
+            self.memo_model.set_filter(None)
+            self.update_count()
+            return
+        # 归档搜索要读取整个文件，放到工作线程中，结果回来时再筛选
+        if self.searcher is None:
+            from core.memo_archive import ArchiveSearch
+            self.searcher = ArchiveSearch(self.archive, self)
+            self.searcher.finished.connect(self.show_search_results)
+        self.count_label.setText("正在搜索...")
+        self.searcher.start(query)
+    def show_search_results(self, query, memo_ids):
+        # 搜索期间查询已经改变时丢弃结果
+        if query != self.filter_edit.text().strip():
+            return
+        self.memo_model.set_filter(memo_ids)
+        self.update_count()
+    def selected_ids(self):
+        return [self.memo_model.memo_id(index.row()) for index in self.memos_list.selectionModel().selectedRows()]
+    def take_selected(self):
+        memo_ids = self.selected_ids()
+        for memo_id in memo_ids:
+            self.memo_model.remove_memo(memo_id)
+        removed = self.archive.remove(memo_ids)
+        self.update_count()
+        return removed
+    def restore_selected(self):
+        self.restored.extend(self.take_selected())
+    def delete_selected(self):
+        self.take_selected()
+    def done(self, result):
+        if self.searcher is not None:
+            self.searcher.shutdown()
+        super().done(result)
 
 class ReminderDialog(QDialog):
     def __init__(self, memo, parent=None):
@@ -671,5 +919,5 @@ class ReminderDialog(QDialog):
         self.memo = memo
     def snooze_reminder(self, minutes):
         new_time = datetime.now() + timedelta(minutes=minutes)
-        self.memo['reminder_time'] = new_time.isoformat()
+        self.memo['reminder_time'] = new_time.replace(microsecond=0)
         self.accept() 
\ No newline at end of file
@@ -1,18 +1,17 @@
 import sys
 import os
-import subprocess
-import psutil
-import numpy as np
 from datetime import datetime, timedelta
-from PyQt6.QtCore import Qt, QTimer, QPoint, QEvent, QObject, QRect, QRectF, QSize, QPropertyAnimation, QEasingCurve, QPointF, QSequentialAnimationGroup
-from PyQt6.QtGui import QFont, QColor, QPainter, QGuiApplication, QPainterPath, QIcon, QAction
+from PyQt6.QtCore import Qt, QTimer, QPoint, QEvent, QObject, QRect, QRectF, QSize, QPropertyAnimation, QEasingCurve, QPointF, QSequentialAnimationGroup, pyqtSignal
+from PyQt6.QtGui import QFont, QColor, QPainter, QGuiApplication, QPainterPath, QIcon, QAction, QKeySequence
 from PyQt6.QtWidgets import QWidget, QLabel, QPushButton, QMenu, QVBoxLayout, QHBoxLayout, QTextEdit, QFrame, QDialog, QSystemTrayIcon, QComboBox, QListWidget, QLineEdit, QCheckBox, QColorDialog, QFileDialog, QSlider, QToolButton, QScrollArea, QDateTimeEdit, QSpinBox
 
-from core.settings import load_settings, save_settings
-from core.music import AudioVisualizer
-from core.reminder import ReminderManager
-from ui.dialogs import SettingsDialog, QuickToolsDialog, MemoDialog, ReminderDialog
-from ui.custom_widgets import CustomLineEdit, MediaControlButton, MusicButton
+from core import startup
+from core.settings import load_settings, save_settings, SettingsWriter
+from core.power import PROFILE_NAMES, get_profile, select_profile
+from core.search_engines import SearchEngineRegistry
+from core.memos import Memo, MemoStore
+from core.quick_tools import ensure_tool_ids
+from ui.custom_widgets import CustomLineEdit, MediaControlButton, MusicButton, QuickToolBar, SearchResultsPopup
 
 import ctypes
 user32 = ctypes.windll.user32
@@ -20,12 +19,6 @@ VK_MEDIA_PLAY_PAUSE = 0xB3
 VK_MEDIA_NEXT_TRACK = 0xB0
 VK_MEDIA_PREV_TRACK = 0xB1
 
-AUDIO_AVAILABLE = True
-try:
-    import pyaudio
-except ImportError:
-    AUDIO_AVAILABLE = False
-
 class EventFilter(QObject):
     def eventFilter(self, obj, event):
         if event.type() == QEvent.Type.WindowStateChange:
@@ -34,13 +27,31 @@ class EventFilter(QObject):
                 return True
         return super().eventFilter(obj, event)
 
+class HistoryKeyFilter(QObject):
+    """拦截文本框的撤销/重做按键（Ctrl+Z、Ctrl+Y、Ctrl+Shift+Z），改由持久化的编辑历史处理"""
+    undo_requested = pyqtSignal()
+    redo_requested = pyqtSignal()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Type.KeyPress, QEvent.Type.ShortcutOverride):
+            redo = event.matches(QKeySequence.StandardKey.Redo) or (
+                event.key() == Qt.Key.Key_Y and event.modifiers() == Qt.KeyboardModifier.ControlModifier)
+            if event.matches(QKeySequence.StandardKey.Undo) or redo:
+                # ShortcutOverride 只需接受，真正的处理在随后的 KeyPress 中
+                event.accept()
+                if event.type() == QEvent.Type.KeyPress:
+                    (self.redo_requested if redo else self.undo_requested).emit()
+                return True
+        return super().eventFilter(obj, event)
+
 class AcrylicWidget(QWidget):
     """主窗口类，负责主 UI 和主要逻辑。"""
     def __init__(self):
         super().__init__()
         self.is_playing = False
         self.setAcceptDrops(True)
-        self.settings = load_settings()
+        with startup.phase("load_settings"):
+            self.settings = load_settings()
         initial_pos = self.settings.get("initial_position", {"x": None, "y": None})
         if initial_pos["x"] is not None and initial_pos["y"] is not None:
             self.move(initial_pos["x"], initial_pos["y"])
@@ -54,25 +65,57 @@ class AcrylicWidget(QWidget):
             color_settings["b"],
             color_settings["a"]
         )
-        self.search_engines = {
-            "everything": {"name": "Everything", "icon": "🔍", "action": self.search_everything},
-            "bing": {"name": "Bing", "icon": "🌐", "action": self.search_bing},
-            "chatgpt": {"name": "ChatGPT", "icon": "🤖", "action": self.search_chatgpt},
-            "bilibili": {"name": "Bilibili", "icon": "📺", "action": self.search_bilibili},
-        }
+        self.memo_store = MemoStore(self.settings.get("memos", []))
+        self.search_engines = SearchEngineRegistry.from_settings(self.settings)
         self.current_search_engine = self.settings.get("default_search_engine", "everything")
+        if self.current_search_engine not in self.search_engines:
+            self.current_search_engine = next(iter(self.search_engines.keys()))
+        self.default_search_engine = self.current_search_engine
+        self.search_history = None
+        self.launcher = None
+        self.path_cache = None
+        self.icon_cache = None
+        self.drop_resolver = None
+        self.tool_usage = None
         self.sidebar_expanded = False
-        self.init_ui()
-        self.init_tray_icon()
+        self.settings_writer = SettingsWriter(self)
+        if self.memo_store.migrated:
+            self.settings["memos"] = self.memo_store.to_list()
+            self.settings_writer.request_save(self.settings)
+        self.power_profile = None
+        self.profile = get_profile(self.settings, select_profile(self.settings, None))
+        self.clock_seconds = True
+        self.spectrum_enabled = True
+        self.tray_icon = None
+        self.reminder_manager = None
+        self.audio_visualizer = None
+        self.frequency_data = []
+        self.battery_sampler = None
+        self.resource_monitor = None
+        self.file_indexer = None
+        self.memo_index = None
+        self.memo_transfer = None
+        self.memo_archive = None
+        self.edit_histories = {}
+        self.imported_memo_ids = []
+        self.extension_panel_built = False
+        self.first_frame_shown = False
+        with startup.phase("init_ui"):
+            self.init_ui()
         self.event_filter = EventFilter()
         self.installEventFilter(self.event_filter)
-        self.reminder_manager = ReminderManager(self)
-        if AUDIO_AVAILABLE:
-            self.audio_visualizer = AudioVisualizer(self)
-            self.frequency_data = []
-        else:
-            self.audio_visualizer = None
-            self.frequency_data = np.zeros(64)
+        self.apply_power_profile(select_profile(self.settings, None))
+        # 首帧之后再逐个启动的子系统，每个事件循环周期启动一个
+        self.startup_steps = [
+            self.init_tray_icon,
+            self.start_reminder_manager,
+            self.init_extension_panel,
+            self.start_system_samplers,
+            self.start_audio_visualizer,
+            self.start_file_indexer,
+            self.archive_old_memos,
+            self.start_memo_index,
+        ]
 
     def init_ui(self):
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool | Qt.WindowType.MSWindowsFixedSizeDialogHint)
@@ -99,7 +142,7 @@ class AcrylicWidget(QWidget):
         self.battery_label.move(20, 100)
 
         current_engine = self.search_engines[self.current_search_engine]
-        self.search_icon_button = QPushButton(current_engine["icon"], self)
+        self.search_icon_button = QPushButton(current_engine.icon, self)
         self.search_icon_button.setFont(QFont("Segoe UI", 14))
         self.search_icon_button.setStyleSheet("""
             QPushButton {
@@ -117,7 +160,7 @@ class AcrylicWidget(QWidget):
         self.search_icon_button.setFixedSize(30, 30)
         self.search_icon_button.move(20, 160)
         self.search_icon_button.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.search_icon_button.setToolTip(f"当前搜索引擎: {current_engine['name']}")
+        self.search_icon_button.setToolTip(f"当前搜索引擎: {current_engine.name}")
 
         self.search_engine_menu = QMenu(self)
         self.search_engine_menu.setStyleSheet("""
@@ -135,7 +178,8 @@ class AcrylicWidget(QWidget):
             }
         """)
         for key, engine in self.search_engines.items():
-            action = QAction(f"{engine['icon']} {engine['name']}", self)
+            bangs = " ".join(f"!{bang}" for bang in engine.bangs)
+            action = QAction(f"{engine.icon} {engine.name}" + (f"    {bangs}" if bangs else ""), self)
             action.setData(key)
             self.search_engine_menu.addAction(action)
         self.search_engine_menu.triggered.connect(self.change_search_engine_from_menu)
@@ -150,10 +194,18 @@ class AcrylicWidget(QWidget):
             padding: 4px 10px;
             selection-background-color: rgba(0, 191, 255, 150);
         """)
-        self.search_input.setPlaceholderText(f"Search with {current_engine['name']}...")
+        self.search_input.setPlaceholderText(f"Search with {current_engine.name}...")
         self.search_input.setFixedSize(200, 28)
         self.search_input.move(60, 160)
         self.search_input.returnPressed.connect(self.perform_search)
+        self.search_popup = SearchResultsPopup(self.search_input)
+        self.search_popup.result_activated.connect(self.open_search_result)
+        self.local_search = None
+        self.search_debounce = QTimer(self)
+        self.search_debounce.setSingleShot(True)
+        self.search_debounce.setInterval(150)
+        self.search_debounce.timeout.connect(self.run_incremental_search)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
 
         self.music_button = MusicButton(self)
         self.music_button.setFixedSize(30, 30)
@@ -196,9 +248,88 @@ class AcrylicWidget(QWidget):
             border-radius: 10px;
         """)
         self.extension_panel.setFixedWidth(self.width() - 20)
-        self.extension_panel.setFixedHeight(300)
+        monitor_enabled = self.settings.get("system_monitor", {}).get("enable", True)
+        self.extension_panel.setFixedHeight(550 if monitor_enabled else 440)
         self.extension_panel.move(10, self.height())
+        self.panel_animation = QPropertyAnimation(self.extension_panel, b"geometry")
+        self.panel_animation.setDuration(300)
+        self.panel_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+        self.panel_expanded = False
+        self.last_time_text = None
+        self.last_date = None
+        self.info_timer = QTimer(self)
+        self.info_timer.setSingleShot(True)
+        self.info_timer.timeout.connect(self.update_info)
+        self.update_info()
+        self.battery_label.setText("Battery: N/A")
+
+    def run_next_startup_step(self):
+        if not self.startup_steps:
+            return
+        step = self.startup_steps.pop(0)
+        with startup.phase(step.__name__):
+            step()
+        if self.startup_steps:
+            QTimer.singleShot(0, self.run_next_startup_step)
+
+    def start_reminder_manager(self):
+        from core.reminder import ReminderManager
+        self.reminder_manager = ReminderManager(self)
+
+    def start_audio_visualizer(self):
+        from core.music import AUDIO_AVAILABLE
+        if not AUDIO_AVAILABLE:
+            return
+        from core.music import AudioVisualizer
+        self.audio_visualizer = AudioVisualizer(self)
+        self.audio_visualizer.apply_profile(self.profile["visualizer_fps"], self.profile["band_count"], self.profile["spectrum_enabled"])
 
+    def start_system_samplers(self):
+        from core.sysinfo import BatterySampler
+        from PyQt6.QtWidgets import QApplication
+        self.battery_sampler = BatterySampler(parent=self)
+        self.battery_sampler.set_interval(self.profile["battery_interval"], max(self.profile["battery_interval"], 30.0))
+        self.battery_sampler.battery_changed.connect(self.update_battery)
+        self.battery_sampler.start()
+        QApplication.instance().aboutToQuit.connect(self.battery_sampler.stop)
+        if self.resource_monitor:
+            self.resource_monitor.set_interval(self.monitor_interval())
+            self.resource_monitor.start()
+            QApplication.instance().aboutToQuit.connect(self.resource_monitor.stop)
+
+    def start_file_indexer(self):
+        index_settings = self.settings.get("file_index", {})
+        if not index_settings.get("enable", True):
+            return
+        from core.file_index import FileIndexer, DEFAULT_EXCLUDES, default_roots
+        from core.settings import SETTINGS_FILE
+        from PyQt6.QtCore import QThread
+        from PyQt6.QtWidgets import QApplication
+        self.file_indexer = FileIndexer(
+            index_settings.get("roots") or default_roots(),
+            index_settings.get("excludes", DEFAULT_EXCLUDES),
+            os.path.join(os.path.dirname(os.path.abspath(SETTINGS_FILE)), "file_index.cache"),
+            rescan_interval=index_settings.get("rescan_minutes", 10) * 60,
+            parent=self
+        )
+        self.file_indexer.index_ready.connect(self.on_file_index_ready)
+        if self.local_search:
+            self.local_search.file_indexer = self.file_indexer
+        self.file_indexer.start(QThread.Priority.LowestPriority)
+        QApplication.instance().aboutToQuit.connect(self.file_indexer.stop)
+
+    def monitor_interval(self):
+        interval = self.profile.get("monitor_interval")
+        if interval is None:
+            interval = self.settings.get("system_monitor", {}).get("interval", 1.0)
+        return interval
+
+    def init_extension_panel(self):
+        if self.extension_panel_built:
+            return
+        self.extension_panel_built = True
+        monitor_settings = self.settings.get("system_monitor", {})
+        monitor_enabled = monitor_settings.get("enable", True)
         extension_layout = QVBoxLayout(self.extension_panel)
         extension_layout.setContentsMargins(10, 10, 10, 10)
         extension_layout.setSpacing(10)
@@ -208,36 +339,33 @@ class AcrylicWidget(QWidget):
         tools_title.setStyleSheet("color: rgba(200, 220, 255, 220);")
         extension_layout.addWidget(tools_title)
 
-        self.tools_container = QWidget(self.extension_panel)
-        tools_layout = QHBoxLayout(self.tools_container)
-        tools_layout.setContentsMargins(0, 0, 0, 0)
-        tools_layout.setSpacing(10)
         self.quick_tools = self.settings.get("quick_tools", [])
-        for tool in self.quick_tools:
-            tool_button = self.create_tool_button(tool)
-            tools_layout.addWidget(tool_button)
-        edit_tools_button = QPushButton("⚙️", self.tools_container)
-        edit_tools_button.setToolTip("编辑常用工具")
-        edit_tools_button.setFixedSize(40, 40)
-        edit_tools_button.setStyleSheet("""
-            QPushButton {
-                color: rgba(180, 180, 180, 200);
-                background-color: rgba(60, 60, 70, 150);
-                border-radius: 5px;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background-color: rgba(80, 80, 90, 180);
-            }
-        """)
-        edit_tools_button.clicked.connect(self.edit_quick_tools)
-        tools_layout.addWidget(edit_tools_button)
-        tools_layout.addStretch()
+        if ensure_tool_ids(self.quick_tools):
+            self.settings_writer.request_save(self.settings)
+        self.tools_container = QuickToolBar(self.apply_tool_icon, self.extension_panel)
+        self.tools_container.tool_activated.connect(self.open_tool)
+        self.tools_container.edit_requested.connect(self.edit_quick_tools)
+        self.refresh_tool_bar()
         extension_layout.addWidget(self.tools_container)
         separator = QFrame(self.extension_panel)
         separator.setFrameShape(QFrame.Shape.HLine)
         separator.setStyleSheet("background-color: rgba(100, 100, 120, 100);")
         extension_layout.addWidget(separator)
+        self.resource_monitor = None
+        if monitor_enabled:
+            monitor_title = QLabel("系统资源", self.extension_panel)
+            monitor_title.setFont(QFont("Caveat", 14, QFont.Weight.Bold))
+            monitor_title.setStyleSheet("color: rgba(200, 220, 255, 220);")
+            extension_layout.addWidget(monitor_title)
+            from core.sysinfo import ResourceMonitor
+            from ui.custom_widgets import ResourceMonitorPanel
+            self.resource_monitor = ResourceMonitor(
+                interval=self.monitor_interval(),
+                history_length=monitor_settings.get("history_length", 60),
+                parent=self
+            )
+            self.monitor_panel = ResourceMonitorPanel(self.resource_monitor, self.extension_panel)
+            extension_layout.addWidget(self.monitor_panel)
         memo_layout = QHBoxLayout()
         memo_title = QLabel("备忘录", self.extension_panel)
         memo_title.setFont(QFont("Caveat", 14, QFont.Weight.Bold))
@@ -261,6 +389,18 @@ class AcrylicWidget(QWidget):
         memo_layout.addWidget(memo_button)
         memo_layout.addStretch()
         extension_layout.addLayout(memo_layout)
+        from ui.custom_widgets import AgendaPanel
+        from core.agenda import ReminderIndex
+        self.reminder_index = ReminderIndex()
+        self.reminder_index.build(self.memo_store)
+        self.agenda_panel = AgendaPanel(self.settings.get("agenda_days", 7), self.extension_panel)
+        self.agenda_panel.memo_activated.connect(self.manage_memos)
+        self.agenda_panel.range_changed.connect(self.set_agenda_days)
+        extension_layout.addWidget(self.agenda_panel)
+        self.agenda_timer = QTimer(self)
+        self.agenda_timer.setSingleShot(True)
+        self.agenda_timer.timeout.connect(self.refresh_agenda)
+        self.refresh_agenda()
         notes_title = QLabel("快速笔记", self.extension_panel)
         notes_title.setFont(QFont("Caveat", 14, QFont.Weight.Bold))
         notes_title.setStyleSheet("color: rgba(200, 220, 255, 220);")
@@ -279,15 +419,19 @@ class AcrylicWidget(QWidget):
         self.notes_edit.setPlaceholderText("在这里记录临时想法、代码片段或待办事项...")
         self.notes_edit.setText(self.settings.get("notes", ""))
         self.notes_edit.textChanged.connect(self.save_notes)
+        # 笔记的撤销/重做使用可跨重启保留的编辑历史，不用 QTextEdit 自带的撤销栈
+        self.notes_edit.setUndoRedoEnabled(False)
+        self.applying_notes_history = False
+        self.notes_key_filter = HistoryKeyFilter(self.notes_edit)
+        self.notes_key_filter.undo_requested.connect(self.undo_notes)
+        self.notes_key_filter.redo_requested.connect(self.redo_notes)
+        self.notes_edit.installEventFilter(self.notes_key_filter)
+        self.notes_history_timer = QTimer(self)
+        self.notes_history_timer.setSingleShot(True)
+        self.notes_history_timer.setInterval(5000)
+        self.notes_history_timer.timeout.connect(lambda: self.get_edit_history("notes").commit())
         extension_layout.addWidget(self.notes_edit)
-        self.panel_animation = QPropertyAnimation(self.extension_panel, b"geometry")
-        self.panel_animation.setDuration(300)
-        self.panel_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        self.panel_expanded = False
-        timer = QTimer(self)
-        timer.timeout.connect(self.update_info)
-        timer.start(1000)
-        self.update_info()
+        self.extension_panel.show()
 
     def init_tray_icon(self):
         self.tray_icon = QSystemTrayIcon(self)
@@ -297,6 +441,10 @@ class AcrylicWidget(QWidget):
             from PyQt6.QtWidgets import QStyle, QApplication
             self.tray_icon.setIcon(QApplication.style().standardIcon(QStyle.StandardPixmap.SP_ComputerIcon))
         tray_menu = QMenu()
+        self.profile_action = QAction("", self)
+        self.profile_action.setEnabled(False)
+        tray_menu.addAction(self.profile_action)
+        tray_menu.addSeparator()
         show_action = QAction("显示", self)
         show_action.triggered.connect(self.show)
         hide_action = QAction("隐藏", self)
@@ -315,6 +463,7 @@ class AcrylicWidget(QWidget):
         self.tray_icon.setToolTip("eve desktop")
         self.tray_icon.activated.connect(self.tray_icon_activated)
         self.tray_icon.show()
+        self.update_profile_indicator()
 
     def tray_icon_activated(self, reason):
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
@@ -325,7 +474,7 @@ class AcrylicWidget(QWidget):
                 self.activateWindow()
 
     def closeEvent(self, event):
-        if self.tray_icon.isVisible():
+        if self.tray_icon and self.tray_icon.isVisible():
             self.hide()
             if hasattr(self, 'sidebar_expanded') and self.sidebar_expanded:
                 self.sidebar.hide()
@@ -336,20 +485,76 @@ class AcrylicWidget(QWidget):
     def close_app(self):
         if hasattr(self, 'audio_visualizer') and self.audio_visualizer:
             self.audio_visualizer.stop()
+        if self.battery_sampler:
+            self.battery_sampler.stop()
+        self.settings_writer.flush()
+        if self.resource_monitor:
+            self.resource_monitor.stop()
+        if self.file_indexer:
+            self.file_indexer.stop()
         if hasattr(self, 'sidebar'):
             self.sidebar.close()
-        self.tray_icon.hide()
+        if self.tray_icon:
+            self.tray_icon.hide()
         from PyQt6.QtWidgets import QApplication
         QApplication.quit()
 
+    def handle_command(self, command):
+        """处理命令行参数或其他实例转发来的命令"""
+        if command.get("show") or command.get("search"):
+            self.show()
+            self.raise_()
+            self.activateWindow()
+        if command.get("search"):
+            self.search_input.setText(command["search"])
+            self.perform_search()
+        memo_args = command.get("add_memo")
+        if memo_args and memo_args.get("title"):
+            memo = Memo(title=memo_args["title"], content=memo_args.get("content", ""), created_time=datetime.now())
+            memo_id = self.memo_store.add(memo)
+            self.save_memos([memo_id])
+            print(f"已添加备忘录: {memo['title']}")
+        if command.get("import_memos"):
+            from core.memo_io import dedupe_key
+            self.get_memo_transfer().start_import(command["import_memos"], {dedupe_key(memo) for memo in self.memo_store})
+        if command.get("export_memos"):
+            self.get_memo_transfer().start_export(self.memo_store, command["export_memos"])
+
+    def get_memo_transfer(self):
+        if self.memo_transfer is None:
+            from core.memo_io import MemoTransfer
+            from PyQt6.QtWidgets import QApplication
+            self.memo_transfer = MemoTransfer(self)
+            self.memo_transfer.batch_ready.connect(self.add_imported_memos)
+            self.memo_transfer.progress.connect(lambda done, total: print(f"导入备忘录 {done * 100 // max(total, 1)}%"))
+            self.memo_transfer.finished.connect(self.on_memo_transfer_finished)
+            QApplication.instance().aboutToQuit.connect(self.memo_transfer.shutdown)
+        return self.memo_transfer
+
+    def add_imported_memos(self, memos):
+        """一批导入的备忘录作为一次提交写入存储，全部导入完成后再保存设置文件"""
+        self.imported_memo_ids.extend(self.memo_store.add(memo) for memo in memos)
+
+    def on_memo_transfer_finished(self, action, count, skipped, error):
+        if action == "import":
+            if self.imported_memo_ids:
+                self.save_memos(self.imported_memo_ids)
+                self.imported_memo_ids = []
+            message = f"已导入 {count} 条备忘录，跳过 {skipped} 条重复或无效记录"
+        else:
+            message = f"已导出 {count} 条备忘录"
+        if error:
+            message = f"{'导入' if action == 'import' else '导出'}备忘录失败: {error}"
+        print(message)
+        if self.tray_icon:
+            self.tray_icon.showMessage("备忘录", message, QSystemTrayIcon.MessageIcon.Information, 3000)
+
     def change_search_engine(self, index):
         engine_key = list(self.search_engines.keys())[index]
-        self.current_search_engine = engine_key
-        self.search_icon_button.setText(self.search_engines[engine_key]["icon"])
-        self.search_icon_button.setToolTip(f"当前搜索引擎: {self.search_engines[engine_key]['name']}")
-        self.search_input.setPlaceholderText(f"Search with {self.search_engines[engine_key]['name']}...")
+        self.set_current_search_engine(engine_key)
+        self.default_search_engine = engine_key
         self.settings["default_search_engine"] = engine_key
-        save_settings(self.settings)
+        self.settings_writer.request_save(self.settings)
 
     def show_search_engine_menu(self):
         pos = self.search_icon_button.mapToGlobal(QPoint(0, self.search_icon_button.height()))
@@ -358,57 +563,184 @@ class AcrylicWidget(QWidget):
     def change_search_engine_from_menu(self, action):
         engine_key = action.data()
         if engine_key in self.search_engines:
-            self.current_search_engine = engine_key
-            engine = self.search_engines[engine_key]
-            self.search_icon_button.setText(engine["icon"])
-            self.search_icon_button.setToolTip(f"当前搜索引擎: {engine['name']}")
-            self.search_input.setPlaceholderText(f"Search with {engine['name']}...")
+            self.set_current_search_engine(engine_key)
+            self.default_search_engine = engine_key
             self.settings["default_search_engine"] = engine_key
-            save_settings(self.settings)
+            self.settings_writer.request_save(self.settings)
 
     def perform_search(self):
-        search_action = self.search_engines[self.current_search_engine]["action"]
-        search_action()
-
-    def search_everything(self):
-        query = self.search_input.text().strip()
-        if query and os.path.exists(self.everything_path):
-            try:
-                subprocess.Popen([self.everything_path, "-search", query])
-                self.search_input.clear()
-            except Exception as e:
-                print(f"启动Everything失败: {e}")
-
-    def search_bing(self):
-        query = self.search_input.text().strip()
+        self.search_debounce.stop()
+        self.search_popup.hide()
+        text = self.search_input.text().strip()
+        # "!b 查询" 只对本次搜索生效，不修改默认引擎
+        engine_key, query = self.search_engines.resolve(text)
+        engine_key = engine_key or self.current_search_engine
         if query:
-            url = f"https://www.bing.com/search?q={query}"
-            self.open_browser(url)
-            self.search_input.clear()
+            self.record_search(query, engine_key)
+            self.run_search_engine(engine_key, query)
 
-    def search_bilibili(self):
-        query = self.search_input.text().strip()
-        if query:
-            url = f"https://search.bilibili.com/all?keyword={query}"
-            self.open_browser(url)
+    def run_search_engine(self, engine_key, query):
+        engine = self.search_engines[engine_key]
+        if engine.kind == "everything":
+            self.search_everything(query)
+        else:
+            self.open_browser(engine.url(query))
             self.search_input.clear()
 
-    def search_chatgpt(self):
-        query = self.search_input.text().strip()
-        if query:
-            url = f"https://chat.openai.com/?q={query}"
-            self.open_browser(url)
+    def search_everything(self, query):
+        if query and self.get_path_cache().exists(self.everything_path):
+            self.get_launcher().launch([self.everything_path, "-search", query], "Everything")
             self.search_input.clear()
+        elif query:
+            self.search_local_files(query)
+
+    def search_local_files(self, query):
+        """没有 Everything 时使用内置文件名索引，结果显示在搜索框下方"""
+        if not self.file_indexer:
+            print("文件索引尚未启动")
+            return
+        # 查询短于三个字符或通配符没有足够长的字面量时要扫描全部文件名，放到工作线程中
+        self.get_local_search().find_files(query)
+
+    def show_file_results(self, query, paths):
+        results = [(os.path.basename(path) or path, path, {"kind": "file", "path": path}) for path in paths]
+        if not results:
+            results = [("没有找到匹配的文件", query, None)]
+        self.search_popup.show_results(results)
+
+    def on_file_index_ready(self, count):
+        print(f"文件索引就绪，共 {count} 项")
+        self.invalidate_local_search()
+
+    def start_memo_index(self):
+        """后台加载备忘录和快速笔记的全文索引，只重新索引缓存之后变化的内容"""
+        from core.text_index import MemoSearchIndex
+        from core.settings import SETTINGS_FILE
+        from PyQt6.QtWidgets import QApplication
+        self.memo_index = MemoSearchIndex(
+            os.path.join(os.path.dirname(os.path.abspath(SETTINGS_FILE)), "memo_index.cache"),
+            parent=self
+        )
+        self.memo_index.ready.connect(self.on_memo_index_ready)
+        if self.local_search:
+            self.local_search.text_index = self.memo_index
+        self.memo_index.start(self.memo_store, self.settings.get("notes", ""))
+        QApplication.instance().aboutToQuit.connect(self.memo_index.shutdown)
+
+    def on_memo_index_ready(self, count):
+        print(f"全文索引就绪，共 {count} 项")
+        self.invalidate_local_search()
+
+    def invalidate_local_search(self):
+        if self.local_search:
+            self.local_search.invalidate()
+
+    def get_search_history(self):
+        if self.search_history is None:
+            from core.search_history import SearchHistory
+            self.search_history = SearchHistory.from_list(self.settings.get("search_history", []))
+        return self.search_history
+
+    def record_search(self, query, engine_key):
+        history = self.get_search_history()
+        history.record(query, engine_key)
+        self.settings["search_history"] = history.to_list()
+        self.settings_writer.request_save(self.settings)
+
+    def on_search_text_changed(self, text):
+        history = self.get_search_history()
+        completions = history.complete(text, 1) if text else []
+        self.search_input.set_completion(completions[0] if completions else "")
+        # !前缀 指定的引擎优先，其次是同一查询上次使用的引擎，输入清空后恢复默认引擎
+        bang_engine, query = self.search_engines.resolve(text)
+        engine_key = bang_engine or (history.engine_for(text) if text.strip() else None) or self.default_search_engine
+        if engine_key in self.search_engines and engine_key != self.current_search_engine:
+            self.set_current_search_engine(engine_key)
+        if bang_engine and self.search_engines[bang_engine].kind != "everything":
+            self.search_debounce.stop()
+            self.search_popup.hide()
+        elif text.strip():
+            self.search_debounce.start()
+        else:
+            self.search_debounce.stop()
+            self.search_popup.hide()
+
+    def set_current_search_engine(self, engine_key):
+        self.current_search_engine = engine_key
+        engine = self.search_engines[engine_key]
+        self.search_icon_button.setText(engine.icon)
+        self.search_icon_button.setToolTip(f"当前搜索引擎: {engine.name}")
+        self.search_input.setPlaceholderText(f"Search with {engine.name}...")
+
+    def get_local_search(self):
+        if self.local_search is None:
+            from core.local_search import LocalSearchService
+            from PyQt6.QtWidgets import QApplication
+            self.local_search = LocalSearchService(self.file_indexer, parent=self)
+            self.local_search.text_index = self.memo_index
+            self.local_search.results_ready.connect(self.show_incremental_results)
+            self.local_search.files_ready.connect(self.show_file_results)
+            QApplication.instance().aboutToQuit.connect(self.local_search.shutdown)
+        return self.local_search
+
+    def run_incremental_search(self):
+        self.get_local_search().search(
+            self.search_input.text(),
+            self.quick_tools if self.extension_panel_built else self.settings.get("quick_tools", []),
+            self.memo_store,
+            self.settings.get("notes", "")
+        )
+
+    def show_incremental_results(self, query, results):
+        if query != self.search_input.text():
+            return
+        self.search_popup.show_results(results)
+
+    def open_search_result(self, payload):
+        if not payload:
+            return
+        kind = payload.get("kind")
+        if kind == "file":
+            self.get_launcher().open_path(payload["path"])
+        elif kind == "tool":
+            self.open_tool(payload.get("tool") or {"path": payload["path"]})
+        elif kind == "memo":
+            self.manage_memos(payload.get("id"))
+        elif kind == "notes":
+            if not self.panel_expanded:
+                self.expand_panel()
+            self.notes_edit.setFocus()
+        self.search_input.clear()
+
+    def get_path_cache(self):
+        if self.path_cache is None:
+            from core.path_cache import PathCache
+            from PyQt6.QtWidgets import QApplication
+            self.path_cache = PathCache(parent=self)
+            self.path_cache.changed.connect(self.on_cached_path_changed)
+            QApplication.instance().aboutToQuit.connect(self.path_cache.shutdown)
+        return self.path_cache
+
+    def get_launcher(self):
+        if self.launcher is None:
+            from core.launcher import ProcessLauncher
+            from PyQt6.QtWidgets import QApplication
+            self.launcher = ProcessLauncher(self.get_path_cache(), self)
+            self.launcher.launch_failed.connect(self.on_launch_failed)
+            self.launcher.first_window.connect(lambda key, ms: self.get_tool_usage().record_latency(key, ms))
+            QApplication.instance().aboutToQuit.connect(self.launcher.shutdown)
+        return self.launcher
+
+    def on_launch_failed(self, name, error):
+        print(f"启动 {name} 失败: {error}")
+        if self.tray_icon:
+            self.tray_icon.showMessage("启动失败", f"{name}: {error}", QSystemTrayIcon.MessageIcon.Warning, 3000)
 
     def open_browser(self, url):
-        try:
-            if os.path.exists(self.browser_path):
-                subprocess.Popen([self.browser_path, url])
-            else:
-                import webbrowser
-                webbrowser.open(url)
-        except Exception as e:
-            print(f"打开浏览器失败: {e}")
+        if self.get_path_cache().exists(self.browser_path):
+            self.get_launcher().launch([self.browser_path, url], "浏览器")
+        else:
+            self.get_launcher().open_path(url, "浏览器")
 
     def moveEvent(self, event):
         super().moveEvent(event)
@@ -424,6 +756,7 @@ class AcrylicWidget(QWidget):
             self.expand_panel()
 
     def expand_panel(self):
+        self.init_extension_panel()
         new_height = self.height() + self.extension_panel.height() + 10
         self.setFixedSize(self.width(), new_height)
         start_rect = self.extension_panel.geometry()
@@ -448,90 +781,290 @@ class AcrylicWidget(QWidget):
         self.panel_animation.finished.disconnect(self.resize_after_collapse)
         self.setFixedSize(self.width(), 200)
 
-    def create_tool_button(self, tool):
-        button = QPushButton(self.tools_container)
-        button.setToolTip(tool["name"])
-        button.setFixedSize(40, 40)
-        icon_path = tool.get("icon", "")
-        if icon_path and (icon_path.endswith(('.ico', '.png', '.jpg', '.jpeg')) or os.path.exists(icon_path)):
-            try:
-                if os.path.exists(icon_path):
-                    icon = QIcon(icon_path)
-                    button.setIcon(icon)
-                    button.setIconSize(QSize(24, 24))
-                    button.setText("")
-                else:
-                    button.setText("🔧")
-            except Exception as e:
-                print(f"加载图标失败 {icon_path}: {e}")
-                button.setText("🔧")
+    def get_icon_cache(self):
+        if self.icon_cache is None:
+            from core.icon_cache import IconCache
+            from core.settings import SETTINGS_FILE
+            from PyQt6.QtWidgets import QApplication
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(SETTINGS_FILE)), "icon_cache")
+            self.icon_cache = IconCache(cache_dir, self.get_path_cache(), parent=self)
+            self.icon_cache.icon_ready.connect(self.on_icon_ready)
+            self.icon_cache.prune()
+            QApplication.instance().aboutToQuit.connect(self.icon_cache.shutdown)
+        return self.icon_cache
+
+    def apply_tool_icon(self, button, icon_text, tool_path):
+        """图标文件存在时使用它；未设置图标（或为默认 🔧）时从程序本身提取；否则把图标文字（emoji）显示在按钮上"""
+        button.setProperty("tool_icon", icon_text)
+        is_path = bool(icon_text) and (icon_text.lower().endswith(('.ico', '.png', '.jpg', '.jpeg', '.svg')) or self.get_path_cache().exists(icon_text))
+        if is_path and self.get_path_cache().exists(icon_text):
+            source = icon_text
+        elif not icon_text or icon_text == "🔧" or is_path:
+            source = tool_path
         else:
-            button.setText(icon_path if icon_path else "🔧")
-        button.setStyleSheet("""
-            QPushButton {
-                color: rgba(220, 220, 220, 220);
-                background-color: rgba(50, 50, 60, 150);
-                border-radius: 5px;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background-color: rgba(70, 70, 80, 180);
-            }
-            QPushButton:pressed {
-                background-color: rgba(40, 40, 50, 150);
-            }
-        """)
-        button.setProperty("tool_path", tool["path"])
-        button.clicked.connect(lambda: self.open_tool(tool["path"]))
-        return button
+            source = None
+        button.setProperty("icon_source", source)
+        pixmap = self.get_icon_cache().request(source, self.tool_icon_size()) if source else None
+        if pixmap is not None:
+            button.setIcon(QIcon(pixmap))
+            button.setIconSize(QSize(24, 24))
+            button.setText("")
+        else:
+            button.setIcon(QIcon())
+            button.setText("🔧" if not icon_text or is_path else icon_text)
 
-    def open_tool(self, path):
-        try:
-            subprocess.Popen(path)
-        except Exception as e:
-            print(f"打开工具失败: {e}")
+    def tool_icon_size(self):
+        return 48 if self.devicePixelRatioF() > 1 else 24
+
+    def on_icon_ready(self, source, size):
+        if not self.extension_panel_built or size != self.tool_icon_size():
+            return
+        for button in self.tools_container.tool_buttons():
+            if button.property("icon_source") == source:
+                button.setIcon(QIcon(self.icon_cache.request(source, size)))
+                button.setIconSize(QSize(24, 24))
+                button.setText("")
+
+    def on_cached_path_changed(self, raw):
+        """图标文件或程序出现、消失或被修改后，只更新使用它的工具按钮"""
+        if self.icon_cache is not None:
+            self.icon_cache.forget(raw)
+        if not self.extension_panel_built:
+            return
+        for button in self.tools_container.tool_buttons():
+            if raw in (button.property("tool_icon"), button.property("icon_source")):
+                self.apply_tool_icon(button, button.property("tool_icon"), button.property("tool_path"))
+
+    def get_tool_usage(self):
+        if self.tool_usage is None:
+            from core.tool_usage import ToolUsage
+            from core.settings import SETTINGS_FILE
+            from PyQt6.QtWidgets import QApplication
+            self.tool_usage = ToolUsage(os.path.join(os.path.dirname(os.path.abspath(SETTINGS_FILE)), "tool_usage.jsonl"), parent=self)
+            self.tool_usage.flushed.connect(self.refresh_tool_bar)
+            QApplication.instance().aboutToQuit.connect(self.tool_usage.flush)
+        return self.tool_usage
+
+    def refresh_tool_bar(self):
+        """按当前排序方式更新工具栏；自动排序只影响显示顺序，不改变设置中的手动顺序。
+        使用统计在批量写入后才重新排序，避免刚点击的按钮立刻移动"""
+        if not self.extension_panel_built:
+            return
+        usage = self.get_tool_usage()
+        if self.settings.get("quick_tools_sort") == "usage":
+            self.tools_container.set_tools(usage.ranked(self.quick_tools))
+        else:
+            self.tools_container.set_tools(self.quick_tools)
+        for tool, button in zip(self.tools_container.tools, self.tools_container.tool_buttons()):
+            summary = usage.describe(tool["id"])
+            button.setToolTip(f"{tool['name']}\n{summary}" if summary else tool["name"])
+
+    def open_tool(self, tool):
+        if not tool:
+            return
+        key = tool.get("id")
+        if key:
+            self.get_tool_usage().record_launch(key)
+        if tool.get("args"):
+            self.get_launcher().launch([tool["path"]] + list(tool["args"]), tool.get("name"), key)
+        else:
+            self.get_launcher().open_path(tool["path"], tool.get("name"), key)
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls() or event.mimeData().text().startswith(("http://", "https://")):
+            event.acceptProposedAction()
+        else:
+            super().dragEnterEvent(event)
+
+    def dropEvent(self, event):
+        """拖入的文件、目录、.desktop 文件和网址在后台解析后，一次性加入常用工具"""
+        mime = event.mimeData()
+        targets = []
+        for url in mime.urls():
+            targets.append(url.toLocalFile() if url.isLocalFile() else url.toString())
+        if not targets and mime.text().startswith(("http://", "https://")):
+            targets = [line.strip() for line in mime.text().splitlines() if line.strip()]
+        if not targets:
+            return
+        event.acceptProposedAction()
+        if self.drop_resolver is None:
+            from core.quick_tools import DropResolver
+            from PyQt6.QtWidgets import QApplication
+            self.drop_resolver = DropResolver(self.get_path_cache(), self)
+            self.drop_resolver.resolved.connect(self.add_dropped_tools)
+            QApplication.instance().aboutToQuit.connect(self.drop_resolver.shutdown)
+        self.drop_resolver.resolve(targets)
+
+    def add_dropped_tools(self, tools):
+        self.init_extension_panel()
+        existing = {tool["path"] for tool in self.quick_tools}
+        added = []
+        for tool in tools:
+            if tool["path"] not in existing:
+                existing.add(tool["path"])
+                added.append(tool)
+        if not added:
+            return
+        self.quick_tools = self.quick_tools + added
+        self.settings["quick_tools"] = self.quick_tools
+        self.refresh_tool_bar()
+        self.invalidate_local_search()
+        self.settings_writer.request_save(self.settings)
+        if self.tray_icon:
+            self.tray_icon.showMessage("常用工具", f"已添加 {len(added)} 个工具", QSystemTrayIcon.MessageIcon.Information, 2000)
 
     def edit_quick_tools(self):
-        dialog = QuickToolsDialog(self.quick_tools, self)
+        from ui.dialogs import QuickToolsDialog
+        dialog = QuickToolsDialog(self.quick_tools, self, self.settings.get("quick_tools_sort") == "usage")
         if dialog.exec():
+            remaining = {tool["id"] for tool in dialog.tools}
+            self.get_tool_usage().forget([tool["id"] for tool in self.quick_tools if tool["id"] not in remaining])
             self.quick_tools = dialog.tools
             self.settings["quick_tools"] = self.quick_tools
+            self.settings["quick_tools_sort"] = "usage" if dialog.auto_sort_checkbox.isChecked() else "manual"
+            self.invalidate_local_search()
             save_settings(self.settings)
-            for i in reversed(range(self.tools_container.layout().count())):
-                item = self.tools_container.layout().itemAt(i)
-                if item.widget():
-                    item.widget().deleteLater()
-            for tool in self.quick_tools:
-                tool_button = self.create_tool_button(tool)
-                self.tools_container.layout().addWidget(tool_button)
-            edit_tools_button = QPushButton("⚙️", self.tools_container)
-            edit_tools_button.setToolTip("编辑常用工具")
-            edit_tools_button.setFixedSize(40, 40)
-            edit_tools_button.setStyleSheet("""
-                QPushButton {
-                    color: rgba(180, 180, 180, 200);
-                    background-color: rgba(60, 60, 70, 150);
-                    border-radius: 5px;
-                    font-size: 16px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(80, 80, 90, 180);
-                }
-            """)
-            edit_tools_button.clicked.connect(self.edit_quick_tools)
-            self.tools_container.layout().addWidget(edit_tools_button)
-            self.tools_container.layout().addStretch()
+            self.refresh_tool_bar()
 
     def save_notes(self):
-        self.settings["notes"] = self.notes_edit.toPlainText()
-        save_settings(self.settings)
+        text = self.notes_edit.toPlainText()
+        if not self.applying_notes_history:
+            from core.edit_history import text_entry, merge_text_entries
+            self.get_edit_history("notes").push(text_entry(self.settings.get("notes", ""), text), merge=merge_text_entries)
+            self.notes_history_timer.start()
+        self.settings["notes"] = text
+        self.invalidate_local_search()
+        if self.memo_index:
+            self.memo_index.update_notes(self.settings["notes"])
+        self.settings_writer.request_save(self.settings)
+
+    def get_edit_history(self, kind):
+        """kind 为 "memos" 或 "notes"，两者各有独立的撤销栈和日志文件"""
+        history = self.edit_histories.get(kind)
+        if history is None:
+            from core.edit_history import EditHistory
+            from core.settings import SETTINGS_FILE
+            from PyQt6.QtWidgets import QApplication
+            undo_settings = self.settings.get("undo", {})
+            history = self.edit_histories[kind] = EditHistory(
+                os.path.join(os.path.dirname(os.path.abspath(SETTINGS_FILE)), f"undo_{kind}.jsonl"),
+                memory_budget=undo_settings.get("memory_kb", 1024) * 1024,
+                max_log_entries=undo_settings.get("log_entries", 500)
+            )
+            QApplication.instance().aboutToQuit.connect(history.commit)
+        return history
+
+    def undo_notes(self):
+        self.apply_notes_history(self.get_edit_history("notes").undo(), reverse=True)
+
+    def redo_notes(self):
+        self.apply_notes_history(self.get_edit_history("notes").redo(), reverse=False)
+
+    def apply_notes_history(self, entry, reverse):
+        if entry is None:
+            return
+        from core.edit_history import apply_text
+        from PyQt6.QtGui import QTextCursor
+        text = self.notes_edit.toPlainText()
+        change = apply_text(text, entry, reverse)
+        if change is None:
+            print("笔记内容与撤销记录不一致，跳过该记录")
+            return
+        pos, length, replacement = change
+        # QTextCursor 的位置按 UTF-16 编码单元计算
+        start = len(text[:pos].encode('utf-16-le')) // 2
+        end = start + len(text[pos:pos + length].encode('utf-16-le')) // 2
+        cursor = self.notes_edit.textCursor()
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        self.applying_notes_history = True
+        try:
+            cursor.insertText(replacement)
+        finally:
+            self.applying_notes_history = False
+        self.notes_edit.setTextCursor(cursor)
+        self.notes_history_timer.start()
 
-    def manage_memos(self):
-        memos = self.settings.get("memos", [])
-        dialog = MemoDialog(memos, self)
+    def manage_memos(self, select_id=None):
+        from ui.dialogs import MemoDialog
+        dialog = MemoDialog(self.memo_store, self, select_id)
         if dialog.exec():
-            self.settings["memos"] = dialog.memos
-            save_settings(self.settings)
+            for memo_id in dialog.changed_ids:
+                memo = dialog.memos.get(memo_id)
+                if memo is None:
+                    self.memo_store.delete(memo_id)
+                else:
+                    self.memo_store.put(memo)
+            if dialog.changed_ids:
+                self.save_memos(dialog.changed_ids)
+
+    def refresh_agenda(self):
+        """按当前范围从提醒索引中取出提醒并显示，并在下一个零点自动刷新"""
+        if not self.extension_panel_built:
+            return
+        from core.agenda import day_start, next_midnight
+        now = datetime.now()
+        today = day_start(now)
+        entries = self.reminder_index.between(today, today + timedelta(days=self.agenda_panel.days()))
+        self.agenda_panel.set_entries(entries, self.memo_store.get, today)
+        self.agenda_timer.start(int((next_midnight(now) - now).total_seconds() * 1000) + 1000)
+
+    def set_agenda_days(self, days):
+        self.settings["agenda_days"] = days
+        self.settings_writer.request_save(self.settings)
+        self.refresh_agenda()
+
+    def get_memo_archive(self):
+        if self.memo_archive is None:
+            from core.memo_archive import MemoArchive
+            from core.settings import SETTINGS_FILE
+            self.memo_archive = MemoArchive(os.path.join(os.path.dirname(os.path.abspath(SETTINGS_FILE)), "memo_archive.jsonl"))
+        return self.memo_archive
+
+    def archive_old_memos(self):
+        """把提醒过且超过设定天数的备忘录移入归档文件，提醒检查和备忘录列表只处理活动备忘录；每天检查一次"""
+        archive_settings = self.settings.get("memo_archive", {})
+        if not archive_settings.get("enable", True):
+            return
+        QTimer.singleShot(24 * 3600 * 1000, self.archive_old_memos)
+        from core.memo_archive import select_archivable
+        memos = select_archivable(self.memo_store, archive_settings.get("after_days", 30))
+        if not memos:
+            return
+        try:
+            self.get_memo_archive().add(memos)
+        except OSError as e:
+            print(f"归档备忘录失败: {e}")
+            return
+        for memo in memos:
+            self.memo_store.delete(memo['id'])
+        self.save_memos([memo['id'] for memo in memos])
+        print(f"已归档 {len(memos)} 条已完成的备忘录")
+
+    def restore_archived_memos(self, memos):
+        for memo in memos:
+            # 手动恢复的备忘录不再被自动归档，直到再次编辑
+            memo['keep_active'] = True
+        self.save_memos([self.memo_store.add(memo) for memo in memos])
+
+    def save_memos(self, changed_ids=()):
+        """备忘录存储变化后写回设置文件；changed_ids 为标题或内容可能变化的备忘录，增量更新全文索引"""
+        self.settings["memos"] = self.memo_store.to_list()
+        self.invalidate_local_search()
+        if self.extension_panel_built:
+            # 提醒状态变化也要刷新日程，只有 changed_ids 中的备忘录需要重新放入索引
+            for memo_id in changed_ids:
+                memo = self.memo_store.get(memo_id)
+                if memo is None:
+                    self.reminder_index.remove(memo_id)
+                else:
+                    self.reminder_index.update(memo)
+            self.refresh_agenda()
+        if self.memo_index and changed_ids:
+            memos = [self.memo_store.get(memo_id) for memo_id in changed_ids]
+            self.memo_index.update_memos([memo for memo in memos if memo is not None])
+            self.memo_index.remove_memos([memo_id for memo_id in changed_ids if memo_id not in self.memo_store])
+        save_settings(self.settings)
 
     def contextMenuEvent(self, event):
         menu = QMenu(self)
@@ -571,21 +1104,24 @@ class AcrylicWidget(QWidget):
         QApplication.beep()
 
     def open_settings(self):
+        from ui.dialogs import SettingsDialog
         dialog = SettingsDialog(self)
         dialog.autostart_checkbox.setChecked(self.settings.get("autostart", False))
         dialog.color_button.setStyleSheet(f"background-color: {self.bg_color.name()}")
         current_alpha = self.bg_color.alpha()
         dialog.transparency_slider.setValue(current_alpha)
         dialog.transparency_value_label.setText(str(current_alpha))
-        import os
-        if os.path.exists(self.netease_music_path):
+        path_cache = self.get_path_cache()
+        if path_cache.exists(self.netease_music_path):
             dialog.music_path_button.setText(os.path.basename(self.netease_music_path))
-        if os.path.exists(self.everything_path):
+        if path_cache.exists(self.everything_path):
             dialog.everything_path_button.setText(os.path.basename(self.everything_path))
-        if os.path.exists(self.browser_path):
+        if path_cache.exists(self.browser_path):
             dialog.browser_path_button.setText(os.path.basename(self.browser_path))
+        dialog.search_engine_combo.clear()
+        dialog.search_engine_combo.addItems([engine.name for engine in self.search_engines.engines.values()])
         for i in range(dialog.search_engine_combo.count()):
-            if dialog.search_engine_combo.itemText(i).lower() == self.search_engines[self.current_search_engine]["name"].lower():
+            if dialog.search_engine_combo.itemText(i).lower() == self.search_engines[self.current_search_engine].name.lower():
                 dialog.search_engine_combo.setCurrentIndex(i)
                 break
         reminder_settings = self.settings.get("reminder_settings", {})
@@ -616,12 +1152,10 @@ class AcrylicWidget(QWidget):
                 self.settings["browser_path"] = dialog.browser_path
             selected_engine = dialog.search_engine_combo.currentText().lower()
             for key, engine in self.search_engines.items():
-                if engine["name"].lower() == selected_engine:
-                    self.current_search_engine = key
+                if engine.name.lower() == selected_engine:
+                    self.set_current_search_engine(key)
+                    self.default_search_engine = key
                     self.settings["default_search_engine"] = key
-                    self.search_icon_button.setText(engine["icon"])
-                    self.search_icon_button.setToolTip(f"当前搜索引擎: {engine['name']}")
-                    self.search_input.setPlaceholderText(f"Search with {engine['name']}...")
                     break
             self.settings["reminder_settings"] = {
                 "advance_minutes": dialog.advance_slider.value(),
@@ -631,6 +1165,10 @@ class AcrylicWidget(QWidget):
             save_settings(self.settings)
 
     def paintEvent(self, event):
+        if not self.first_frame_shown:
+            self.first_frame_shown = True
+            startup.mark("first_paintEvent")
+            QTimer.singleShot(0, self.run_next_startup_step)
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setBrush(self.bg_color)
@@ -649,6 +1187,8 @@ class AcrylicWidget(QWidget):
     def draw_audio_waveform(self, painter):
         if not hasattr(self, 'settings') or not self.settings.get('audio_waveform', {}).get('enable_waveform', True):
             return
+        if not self.spectrum_enabled:
+            return
         waveform_settings = self.settings.get('audio_waveform', {})
         color_settings = waveform_settings.get('waveform_color', {'r': 0, 'g': 191, 'b': 255, 'a': 180})
         sensitivity = waveform_settings.get('waveform_sensitivity', 1.0)
@@ -679,26 +1219,64 @@ class AcrylicWidget(QWidget):
 
     def update_info(self):
         now = datetime.now()
-        self.time_label.setText(now.strftime("%H:%M:%S"))
-        self.date_label.setText(now.strftime("%Y-%m-%d %A"))
-        battery = psutil.sensors_battery()
-        if battery:
-            level = battery.percent
-            charging = battery.power_plugged
+        time_text = now.strftime("%H:%M:%S" if self.clock_seconds else "%H:%M")
+        if time_text != self.last_time_text:
+            self.last_time_text = time_text
+            self.time_label.setText(time_text)
+        today = now.date()
+        if today != self.last_date:
+            self.last_date = today
+            self.date_label.setText(now.strftime("%Y-%m-%d %A"))
+        # 对齐到下一个整秒/整分钟，避免定时器漂移导致多余的刷新
+        delay = 1000 - now.microsecond // 1000
+        if not self.clock_seconds:
+            delay += (59 - now.second) * 1000
+        self.info_timer.start(delay)
+
+    def apply_power_profile(self, name):
+        """一次性把性能配置应用到可视化、时钟、资源采样和设置写入"""
+        if name == self.power_profile:
+            return
+        profile = get_profile(self.settings, name)
+        self.power_profile = name
+        self.profile = profile
+        self.clock_seconds = profile["clock_seconds"]
+        self.spectrum_enabled = profile["spectrum_enabled"]
+        if self.audio_visualizer:
+            self.audio_visualizer.apply_profile(profile["visualizer_fps"], profile["band_count"], profile["spectrum_enabled"])
+        else:
+            self.frequency_data = [0.0] * profile["band_count"]
+        if self.resource_monitor:
+            self.resource_monitor.set_interval(self.monitor_interval())
+        if self.battery_sampler:
+            self.battery_sampler.set_interval(profile["battery_interval"], max(profile["battery_interval"], 30.0))
+        self.settings_writer.set_delay(profile["settings_write_delay_ms"])
+        self.last_time_text = None
+        self.update_info()
+        self.update_profile_indicator()
+        self.update()
+
+    def update_profile_indicator(self):
+        if not self.tray_icon or self.power_profile is None:
+            return
+        self.profile_action.setText(f"性能模式: {PROFILE_NAMES[self.power_profile]}")
+        self.tray_icon.setToolTip(f"eve desktop - {PROFILE_NAMES[self.power_profile]}")
+
+    def update_battery(self, state):
+        if state:
+            level, charging = state
             status = "⚡" if charging else "  "
             self.battery_label.setText(f"{status} Battery: {level}%")
         else:
             self.battery_label.setText("Battery: N/A")
+        self.battery_label.adjustSize()
+        self.apply_power_profile(select_profile(self.settings, state))
 
     def open_netease_music(self):
-        try:
-            subprocess.Popen(f'start "" "{self.netease_music_path}"', shell=True)
-        except Exception as e:
-            print(f"启动网易云音乐失败: {e}")
-            try:
-                subprocess.Popen('start "" "D:\\Program Files\\Netease\\CloudMusic\\cloudmusic.exe"', shell=True)
-            except Exception as e2:
-                print(f"备用路径启动网易云音乐失败: {e2}")
+        path = self.netease_music_path
+        if not self.get_path_cache().exists(path):
+            path = "D:\\Program Files\\Netease\\CloudMusic\\cloudmusic.exe"
+        self.get_launcher().launch([path], "网易云音乐")
 
     def play_pause_music(self):
         user32.keybd_event(VK_MEDIA_PLAY_PAUSE, 0, 0, 0)
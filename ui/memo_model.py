@@ -0,0 +1,176 @@
+import bisect
+from datetime import datetime
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+# 没有提醒时间的备忘录在按提醒时间排序时排在最后
+NO_REMINDER_KEY = datetime.max
+
+def format_memo(memo):
+    title = memo.get('title', '无标题')
+    reminder_time = memo.get('reminder_time')
+    if reminder_time:
+        state = "已提醒" if memo.get('reminder_shown', False) else "待提醒"
+        return f"📝 {title} (提醒: {reminder_time:%Y-%m-%d %H:%M} - {state})"
+    return f"📝 {title}"
+
+def reminder_key(memo):
+    return memo.get('reminder_time') or NO_REMINDER_KEY
+
+def created_key(memo):
+    return memo.get('created_time') or datetime.min
+
+class MemoListModel(QAbstractListModel):
+    """备忘录列表模型：包装 id 到备忘录的有序字典，显示文字在视图需要时才生成，增删改只通知受影响的行。
+
+    排序在模型内部维护：order 是按显示顺序排列的备忘录 id，sort_keys 是对应的 (排序键, id)，互不相同且有序；
+    row_keys 记录每条显示中的备忘录放入 sort_keys 时的排序键，按 id 查行号只需一次二分查找。
+    整体排序用一次 Python sorted 完成；之后的增改按二分查找插入或移动单行，不再整体重排。
+    （QSortFilterProxyModel 排序时每次比较都要回调 Python 的 data()，10 万条需要十几秒。）
+    筛选同样在模型内部完成：filter_ids 不为 None 时 order 只包含其中的备忘录。
+    """
+    SORT_MODES = [("添加顺序", None), ("提醒时间", reminder_key), ("创建时间", created_key)]
+
+    def __init__(self, memos, parent=None):
+        super().__init__(parent)
+        self.memos = memos
+        self.sort_key = None
+        self.filter_ids = None
+        self.order = list(memos)
+        self.sort_keys = [(position, memo_id) for position, memo_id in enumerate(self.order)]
+        self.row_keys = {memo_id: position for position, memo_id in enumerate(self.order)}
+        self.next_position = len(self.order)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        memo = self.memos[self.order[index.row()]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_memo(memo)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return memo.get('content', '')[:200]
+        return None
+
+    def key_for(self, memo_id, position=None):
+        if self.sort_key is None:
+            # 添加顺序：沿用该行原来的位置键，新行排在最后
+            return self.next_position if position is None else position
+        return self.sort_key(self.memos[memo_id])
+
+    def set_sort_key(self, sort_key):
+        self.sort_key = sort_key
+        self.rebuild()
+
+    def set_filter(self, memo_ids):
+        """只显示 memo_ids 中的备忘录，传入 None 时显示全部"""
+        self.filter_ids = None if memo_ids is None else set(memo_ids)
+        self.rebuild()
+
+    def rebuild(self):
+        """按当前排序和筛选重新生成显示顺序，选中行等持久索引跟随备忘录移动"""
+        self.layoutAboutToBeChanged.emit()
+        old_order = self.order
+        visible = self.filter_ids
+        if self.sort_key is None:
+            keyed = [(position, memo_id) for position, memo_id in enumerate(self.memos)
+                     if visible is None or memo_id in visible]
+            self.next_position = len(self.memos)
+        else:
+            keyed = sorted((self.sort_key(memo), memo_id) for memo_id, memo in self.memos.items()
+                           if visible is None or memo_id in visible)
+        self.order = [memo_id for _, memo_id in keyed]
+        self.sort_keys = keyed
+        self.row_keys = {memo_id: key for key, memo_id in keyed}
+        old_indexes = self.persistentIndexList()
+        new_indexes = []
+        for index in old_indexes:
+            memo_id = old_order[index.row()]
+            new_indexes.append(self.index(self.row_of(memo_id)) if memo_id in self.row_keys else QModelIndex())
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def memo_id(self, row):
+        """显示行对应的备忘录 id"""
+        return self.order[row]
+
+    def row_of(self, memo_id):
+        return bisect.bisect_left(self.sort_keys, (self.row_keys[memo_id], memo_id))
+
+    def append_memo(self, memo):
+        self.memos[memo['id']] = memo
+        key = self.key_for(memo['id'])
+        self.next_position += 1
+        if self.filter_ids is not None:
+            # 新添加的备忘录在筛选状态下也保持可见
+            self.filter_ids.add(memo['id'])
+        row = bisect.bisect_left(self.sort_keys, (key, memo['id']))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.order.insert(row, memo['id'])
+        self.sort_keys.insert(row, (key, memo['id']))
+        self.row_keys[memo['id']] = key
+        self.endInsertRows()
+        return row
+
+    def append_memos(self, memos):
+        """批量添加备忘录：按添加顺序显示时一次插入到末尾，否则整体重排一次"""
+        if not memos:
+            return
+        for memo in memos:
+            self.memos[memo['id']] = memo
+        if self.filter_ids is not None:
+            self.filter_ids.update(memo['id'] for memo in memos)
+        if self.sort_key is not None:
+            self.rebuild()
+            return
+        first = len(self.order)
+        self.beginInsertRows(QModelIndex(), first, first + len(memos) - 1)
+        self.order.extend(memo['id'] for memo in memos)
+        for position, memo in enumerate(memos, self.next_position):
+            self.sort_keys.append((position, memo['id']))
+            self.row_keys[memo['id']] = position
+        self.next_position += len(memos)
+        self.endInsertRows()
+
+    def replace_memo(self, memo):
+        self.memos[memo['id']] = memo
+        self.memo_changed(memo['id'])
+
+    def memo_changed(self, memo_id):
+        """备忘录内容变化后刷新对应行，排序键变化时把这一行移动到新位置；被筛选隐藏的备忘录不需要刷新"""
+        if self.filter_ids is not None and memo_id not in self.filter_ids:
+            return
+        row = self.row_of(memo_id)
+        key = self.key_for(memo_id, self.row_keys[memo_id])
+        if key != self.row_keys[memo_id]:
+            # 新位置按去掉这一行之后的列表计算
+            new_row = bisect.bisect_left(self.sort_keys, (key, memo_id))
+            if new_row > row:
+                new_row -= 1
+            moved = new_row != row
+            if moved:
+                # beginMoveRows 的目标行按移动前的行号计算
+                self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), new_row + 1 if new_row > row else new_row)
+            del self.sort_keys[row]
+            del self.order[row]
+            self.sort_keys.insert(new_row, (key, memo_id))
+            self.order.insert(new_row, memo_id)
+            self.row_keys[memo_id] = key
+            if moved:
+                self.endMoveRows()
+            row = new_row
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove_memo(self, memo_id):
+        if self.filter_ids is not None and memo_id not in self.filter_ids:
+            del self.memos[memo_id]
+            return
+        row = self.row_of(memo_id)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.memos[memo_id]
+        del self.order[row]
+        del self.sort_keys[row]
+        del self.row_keys[memo_id]
+        self.endRemoveRows()